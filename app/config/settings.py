@@ -38,6 +38,158 @@ class Settings(BaseSettings):
     page_size: int = Field(
         default=10, json_schema_extra={"env": "PAGE_SIZE"}
     )  # Кількість елементів на сторінці в усіх розділах
+    user_stats_ttl: float = Field(
+        default=60.0, json_schema_extra={"env": "USER_STATS_TTL"}
+    )  # Скільки секунд статистика списку користувачів віддається з пам'яті без звернення до БД
+
+    # Catalog Configuration
+    catalog_facets_ttl: float = Field(
+        default=60.0, json_schema_extra={"env": "CATALOG_FACETS_TTL"}
+    )  # Скільки секунд лічильники каталогу віддаються з пам'яті без звернення до БД
+    vehicle_cache_size: int = Field(
+        default=2000, json_schema_extra={"env": "VEHICLE_CACHE_SIZE"}
+    )  # Скільки авто тримати в кеші get_vehicle_by_id (0 - вимкнути кеш)
+
+    # Export Configuration
+    export_page_size: int = Field(
+        default=500, json_schema_extra={"env": "EXPORT_PAGE_SIZE"}
+    )  # Скільки рядків читається з БД за раз при експорті в CSV/JSONL
+    export_delta_overlap_hours: float = Field(
+        default=4.0, json_schema_extra={"env": "EXPORT_DELTA_OVERLAP_HOURS"}
+    )  # Перекриття (год) інкрементального експорту: час у БД пишеться і в UTC, і в локальному
+
+    # Notification Configuration
+    notify_max_concurrency: int = Field(
+        default=5, json_schema_extra={"env": "NOTIFY_MAX_CONCURRENCY"}
+    )  # Скільки службових повідомлень відправляється одночасно
+    notify_per_chat_interval: float = Field(
+        default=1.0, json_schema_extra={"env": "NOTIFY_PER_CHAT_INTERVAL"}
+    )  # Мінімальний інтервал (сек) між повідомленнями в один чат
+
+    # Subscription Notifications Configuration
+    subscription_instant_delay: float = Field(
+        default=60.0, json_schema_extra={"env": "SUBSCRIPTION_INSTANT_DELAY"}
+    )  # Скільки секунд збирати збіги підписок "одразу" в одне повідомлення (масове додавання авто)
+    subscription_digest_hour: int = Field(
+        default=9, json_schema_extra={"env": "SUBSCRIPTION_DIGEST_HOUR"}
+    )  # О котрій годині надсилати щоденні дайджести підписок
+    subscription_digest_max_items: int = Field(
+        default=10, json_schema_extra={"env": "SUBSCRIPTION_DIGEST_MAX_ITEMS"}
+    )  # Скільки авто перелічувати в одному повідомленні дайджесту (решта - "та ще N")
+    subscription_digest_poll_interval: float = Field(
+        default=60.0, json_schema_extra={"env": "SUBSCRIPTION_DIGEST_POLL_INTERVAL"}
+    )  # Як часто (сек) перевіряти чергу сповіщень підписок без нових збігів
+    subscription_preview_size: int = Field(
+        default=3, json_schema_extra={"env": "SUBSCRIPTION_PREVIEW_SIZE"}
+    )  # Скільки наявних авто показувати після створення підписки
+    subscription_preview_count_cap: int = Field(
+        default=500, json_schema_extra={"env": "SUBSCRIPTION_PREVIEW_COUNT_CAP"}
+    )  # До скількох рахувати наявні авто за підпискою (далі - "понад N")
+
+    # Publication Queue Configuration
+    publication_max_attempts: int = Field(
+        default=5, json_schema_extra={"env": "PUBLICATION_MAX_ATTEMPTS"}
+    )  # Скільки разів повторювати задачу публікації в групу
+    publication_backoff_base: float = Field(
+        default=5.0, json_schema_extra={"env": "PUBLICATION_BACKOFF_BASE"}
+    )  # Базова затримка (сек) повтору, подвоюється з кожною спробою
+    publication_send_interval: float = Field(
+        default=3.0, json_schema_extra={"env": "PUBLICATION_SEND_INTERVAL"}
+    )  # Пауза (сек) між публікаціями, щоб не впиратися в ліміти групи
+
+    # Metrics Configuration
+    metrics_enabled: bool = Field(
+        default=False, json_schema_extra={"env": "METRICS_ENABLED"}
+    )  # Запускати HTTP-ендпоінт /metrics
+    metrics_host: str = Field(
+        default="127.0.0.1", json_schema_extra={"env": "METRICS_HOST"}
+    )
+    metrics_port: int = Field(
+        default=9100, json_schema_extra={"env": "METRICS_PORT"}
+    )
+
+    # Query Profiler Configuration
+    query_profiler_enabled: bool = Field(
+        default=False, json_schema_extra={"env": "QUERY_PROFILER_ENABLED"}
+    )  # Збирати статистику SQL-запитів та плани виконання
+    query_slow_threshold_ms: float = Field(
+        default=50.0, json_schema_extra={"env": "QUERY_SLOW_THRESHOLD_MS"}
+    )  # Поріг (мс), з якого запит потрапляє в журнал повільних
+
+    # Background Data Fixes Configuration
+    data_fix_batch_size: int = Field(
+        default=500, json_schema_extra={"env": "DATA_FIX_BATCH_SIZE"}
+    )  # Скільки рядків обробляє один пакет фонового виправлення даних
+    data_fix_batch_pause: float = Field(
+        default=0.2, json_schema_extra={"env": "DATA_FIX_BATCH_PAUSE"}
+    )  # Пауза (сек) між пакетами, щоб не тримати блокування БД
+
+    # Sold Vehicles Archive Configuration
+    archive_sold_after_days: int = Field(
+        default=90, json_schema_extra={"env": "ARCHIVE_SOLD_AFTER_DAYS"}
+    )  # Через скільки днів після продажу авто переноситься в архів (0 - не архівувати)
+    archive_batch_size: int = Field(
+        default=100, json_schema_extra={"env": "ARCHIVE_BATCH_SIZE"}
+    )  # Скільки авто переноситься в архів за одну транзакцію
+    archive_batch_pause: float = Field(
+        default=0.5, json_schema_extra={"env": "ARCHIVE_BATCH_PAUSE"}
+    )  # Пауза (сек) між пакетами архівування
+    archive_interval: float = Field(
+        default=3600.0, json_schema_extra={"env": "ARCHIVE_INTERVAL"}
+    )  # Як часто (сек) шукати нових кандидатів на архівування
+
+    # Backup Configuration
+    backup_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "BACKUP_ENABLED"}
+    )  # Робити резервні копії БД за розкладом
+    backup_dir: str = Field(
+        default="data/backups", json_schema_extra={"env": "BACKUP_DIR"}
+    )  # Каталог для стиснутих копій БД
+    backup_interval: float = Field(
+        default=86400.0, json_schema_extra={"env": "BACKUP_INTERVAL"}
+    )  # Як часто (сек) робити резервну копію
+    backup_keep: int = Field(
+        default=14, json_schema_extra={"env": "BACKUP_KEEP"}
+    )  # Скільки останніх копій зберігати
+    backup_pages_per_step: int = Field(
+        default=256, json_schema_extra={"env": "BACKUP_PAGES_PER_STEP"}
+    )  # Скільки сторінок БД копіюється за один крок
+    backup_step_pause: float = Field(
+        default=0.05, json_schema_extra={"env": "BACKUP_STEP_PAUSE"}
+    )  # Пауза (сек) між кроками, щоб не заважати записам бота
+
+    # Background Tasks Configuration
+    background_max_concurrency: int = Field(
+        default=20, json_schema_extra={"env": "BACKGROUND_MAX_CONCURRENCY"}
+    )  # Скільки фонових задач однієї групи виконується одночасно
+    shutdown_drain_timeout: float = Field(
+        default=15.0, json_schema_extra={"env": "SHUTDOWN_DRAIN_TIMEOUT"}
+    )  # Скільки секунд чекати на завершення фонових задач при зупинці
+
+    # Event Loop Watchdog Configuration
+    loop_watchdog_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "LOOP_WATCHDOG_ENABLED"}
+    )  # Вимірювати затримку event loop та логувати стек при блокуванні
+    loop_lag_interval: float = Field(
+        default=0.5, json_schema_extra={"env": "LOOP_LAG_INTERVAL"}
+    )  # Як часто (сек) вимірювати затримку event loop
+    loop_stall_threshold_ms: float = Field(
+        default=500.0, json_schema_extra={"env": "LOOP_STALL_THRESHOLD_MS"}
+    )  # Блокування (мс), після якого в лог пишеться стек коду
+    loop_debug: bool = Field(
+        default=False, json_schema_extra={"env": "LOOP_DEBUG"}
+    )  # asyncio debug: логувати синхронні кроки обробників довші за поріг
+    loop_debug_threshold_ms: float = Field(
+        default=100.0, json_schema_extra={"env": "LOOP_DEBUG_THRESHOLD_MS"}
+    )  # Поріг (мс) повільного кроку в режимі LOOP_DEBUG
+
+    # Throttling Configuration
+    throttling_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "THROTTLING_ENABLED"}
+    )  # Обмежувати частоту натискань кнопок для кожного користувача
+    throttling_max_buckets: int = Field(
+        default=10000, json_schema_extra={"env": "THROTTLING_MAX_BUCKETS"}
+    )  # Скільки відер (користувач + клас обробника) тримати в пам'яті
 
     # FSM Storage Configuration
     fsm_storage_type: str = Field(
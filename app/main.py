@@ -4,8 +4,20 @@
 
 import asyncio
 import logging
+import os
+import signal
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
+# Завантаження змінних середовища; профіль імпортів (STARTUP_PROFILE=1)
+# має стартувати до імпорту aiogram та модулів бота
+load_dotenv()
+if os.getenv("STARTUP_PROFILE", "").lower() in ("1", "true", "yes", "on"):
+    from .monitoring.import_profiler import import_profiler
+
+    import_profiler.install()
+
 from aiogram import Bot, Dispatcher
 
 from .config.settings import settings
@@ -22,18 +34,59 @@ logger = logging.getLogger(__name__)
 
 async def create_bot() -> Bot:
     """Створити екземпляр бота"""
-    return Bot(token=settings.bot_token)
+    from .monitoring.bot_api import BotApiMetricsMiddleware
+
+    bot = Bot(token=settings.bot_token)
+    bot.session.middleware(BotApiMetricsMiddleware())
+    return bot
+
+
+def load_routers() -> list:
+    """Імпортувати пакети обробників у порядку підключення.
+
+    Це найдовша частина холодного старту, тому main() виконує її в окремому
+    потоці паралельно з ініціалізацією БД та перевіркою підключення до Telegram.
+    Поки потік працює, головний потік не імпортує модулі бота: паралельний імпорт
+    модулів з циклічними залежностями може зупинитись на блокуванні імпорту
+    (_DeadlockError) або віддати частково ініціалізований модуль.
+    """
+    from .handlers.global_handlers import router as global_router
+    from .modules.admin import router as admin_router
+    # Новий клієнтський модуль
+    from .modules.client import router as client_router
+
+    # Старі клієнтські модулі (відключено)
+    # from .modules.auth.handlers import router as auth_router
+    # from .modules.profile.handlers import router as profile_router
+    # from .modules.search.handlers import router as search_router
+    # from .modules.info.handlers import router as info_router
+    # from .modules.messages.handlers import router as messages_router
 
+    # Порядок роутерів - адмінський роутер має вищий пріоритет,
+    # спочатку адмін панель, потім клієнтські модулі
+    return [global_router, admin_router, client_router]
 
-async def create_dispatcher() -> Dispatcher:
-    """Створити диспетчер з обробниками"""
+
+async def create_dispatcher(routers: list = None) -> Dispatcher:
+    """Створити диспетчер з обробниками (routers - заздалегідь імпортовані роутери)"""
     storage = create_storage()
     dp = Dispatcher(storage=storage)
 
     # Підключення middleware
+    from .middleware.metrics import UpdateMetricsMiddleware, HandlerLabelMiddleware
     from .middleware.state_guard import StateGuardMiddleware
     from .middleware.active_user_guard import ActiveUserGuardMiddleware
     from .middleware.role_change_guard import RoleChangeGuardMiddleware
+    from .middleware.throttling import ThrottlingMiddleware
+
+    # Метрики: зовнішній middleware міряє все оновлення, внутрішній підписує обробник
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    dp.message.middleware(HandlerLabelMiddleware())
+    dp.callback_query.middleware(HandlerLabelMiddleware())
+
+    # Обмеження частоти: надлишкові натискання відкидаються ще до фільтрів та запитів до БД
+    if settings.throttling_enabled:
+        dp.callback_query.outer_middleware(ThrottlingMiddleware(settings.throttling_max_buckets))
 
     dp.message.middleware(StateGuardMiddleware())
     dp.message.middleware(ActiveUserGuardMiddleware())
@@ -42,56 +95,90 @@ async def create_dispatcher() -> Dispatcher:
     dp.callback_query.middleware(RoleChangeGuardMiddleware())
 
     # Підключення роутерів
-    from .handlers.global_handlers import router as global_router
-    from .modules.admin import router as admin_router
-    # Новий клієнтський модуль
-    from .modules.client import router as client_router
-    
-    # Старі клієнтські модулі (відключено)
-    # from .modules.auth.handlers import router as auth_router
-    # from .modules.profile.handlers import router as profile_router
-    # from .modules.search.handlers import router as search_router
-    # from .modules.info.handlers import router as info_router
-    # from .modules.messages.handlers import router as messages_router
-
-    # Порядок роутерів - адмінський роутер має вищий пріоритет
-    dp.include_router(global_router)
-    # Спочатку адмін панель, потім клієнтські модулі
-    dp.include_router(admin_router)
-    dp.include_router(client_router)
-    # dp.include_router(auth_router)
-    # dp.include_router(profile_router)
-    # dp.include_router(search_router)
-    # dp.include_router(info_router)
-    # dp.include_router(messages_router)
+    for router in routers if routers is not None else load_routers():
+        dp.include_router(router)
 
     return dp
 
 
+@contextmanager
+def startup_phase(name: str):
+    """Залогувати тривалість етапу запуску"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.info(f"⏱️ {name}: {(time.perf_counter() - start) * 1000:.0f} мс")
+
+
 async def main():
     """Головна функція запуску бота"""
-    # Завантаження змінних середовища
-    load_dotenv()
-
     logger.info("Запуск M-Truck Bot...")
+    startup_started = time.perf_counter()
+
+    metrics_server = None
+    bot = None
+
+    from .services.tasks import task_supervisor
+    from .services.notifications import notification_service
+    from .modules.database.data_fixes import data_fix_runner
+    from .modules.database.archiver import vehicle_archiver
+    from .modules.admin.services.vehicle_management.publication.job_worker import (
+        publication_worker,
+    )
+    from .modules.database.manager import db_manager
 
+    # Модулі, які головний потік імпортує до await routers_task (у т.ч. ліниві
+    # імпорти create_bot), - до запуску потоку з обробниками
+    from .monitoring import bot_api
+
+    if settings.metrics_enabled:
+        from .monitoring.server import MetricsServer
+    if settings.loop_watchdog_enabled:
+        from .monitoring.loop_watchdog import LoopWatchdog
+
+    # Порядок зупинки: спершу фонові задачі обробників (можуть ставити задачі в черги),
+    # потім черга публікацій, службові сповіщення, виправлення даних та архівування
+    task_supervisor.add_shutdown_hook("publication_worker", publication_worker.stop)
+    task_supervisor.add_shutdown_hook(
+        "notifications", lambda: notification_service.drain(timeout=settings.shutdown_drain_timeout)
+    )
+    task_supervisor.add_shutdown_hook("data_fixes", data_fix_runner.stop)
+    task_supervisor.add_shutdown_hook("vehicle_archiver", vehicle_archiver.stop)
+
+    routers_task = None
     try:
-        # Ініціалізація бази даних
-        from .modules.database.manager import db_manager
+        # Імпорт обробників у фоновому потоці, поки чекаємо на БД та Telegram.
+        # Усе, що потрібно головному потоку до await routers_task, імпортовано вище
+        routers_task = asyncio.ensure_future(asyncio.to_thread(load_routers))
 
-        await db_manager.init_database()
-        logger.info("База даних ініціалізована")
+        # HTTP-ендпоінт з метриками
+        if settings.metrics_enabled:
+            with startup_phase("Сервер метрик"):
+                metrics_server = MetricsServer(settings.metrics_host, settings.metrics_port)
+                await metrics_server.start()
+
+        # Затримка event loop та стек коду, що його блокує
+        if settings.loop_watchdog_enabled:
+            loop_watchdog = LoopWatchdog(
+                settings.loop_lag_interval, settings.loop_stall_threshold_ms / 1000
+            )
+            await loop_watchdog.start(
+                debug=settings.loop_debug, debug_threshold=settings.loop_debug_threshold_ms / 1000
+            )
+            task_supervisor.add_shutdown_hook("loop_watchdog", loop_watchdog.stop)
 
-        # Додаткова очистка спадкових даних
-        await db_manager.cleanup_invalid_vehicle_data()
+        # Ініціалізація бази даних: міграції лише при зміні версії схеми
+        with startup_phase("Ініціалізація БД"):
+            await db_manager.init_database()
+        logger.info("База даних ініціалізована")
 
         # Інформація про FSM storage (без створення нового)
         storage_type = getattr(settings, "fsm_storage_type", "memory")
         logger.info(f"FSM Storage type configured: {storage_type}")
 
-        # Створення бота та диспетчера
+        # Створення бота
         bot = await create_bot()
-        dp = await create_dispatcher()
 
         # Ініціалізація GroupPublisher (ВИМКНЕНО - модуль видалено)
         # from .modules.group.publisher import init_group_publisher
@@ -102,7 +189,8 @@ async def main():
 
         # Перевірка підключення з таймаутом
         try:
-            bot_info = await asyncio.wait_for(bot.get_me(), timeout=10.0)
+            with startup_phase("Перевірка підключення до Telegram"):
+                bot_info = await asyncio.wait_for(bot.get_me(), timeout=10.0)
             logger.info(f"Бот {bot_info.username} успішно запущений!")
         except asyncio.TimeoutError:
             logger.error("Таймаут при підключенні до Telegram API (10 секунд)")
@@ -114,12 +202,72 @@ async def main():
             logger.error(f"Помилка при отриманні інформації про бота: {e}")
             raise
 
-        # Запуск polling
-        await dp.start_polling(bot)
+        # Диспетчер з роутерами, імпортованими у фоні
+        with startup_phase("Очікування імпорту обробників"):
+            routers = await routers_task
+        with startup_phase("Створення диспетчера"):
+            dp = await create_dispatcher(routers)
+
+        # Звіт профайлера запитів за сигналом: kill -USR1 <pid>
+        from .modules.database.profiler import query_profiler
+
+        if query_profiler.enabled and hasattr(signal, "SIGUSR1"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, query_profiler.dump)
+            logger.info("Профайлер запитів увімкнено, звіт: SIGUSR1 або /db_profile")
+
+        with startup_phase("Запуск фонових задач"):
+            # Фонова черга публікацій в групу
+            await publication_worker.start(bot)
+
+            # Разові виправлення даних пакетами у фоні, не блокуючи запуск
+            await data_fix_runner.start()
+
+            # Перенесення давно проданих авто в архів
+            await vehicle_archiver.start()
+
+            # Сповіщення підписок: черга pending_notifications, дайджести по користувачах
+            from .modules.client.services.vehicle_search.subscriptions.digests import (
+                subscription_digest_sender,
+            )
+
+            task_supervisor.add_shutdown_hook("subscription_digests", subscription_digest_sender.stop)
+            await subscription_digest_sender.start(bot)
+
+            # Резервні копії БД за розкладом (online backup API, без зупинки бота)
+            if settings.backup_enabled:
+                from .modules.database.backup import database_backup
+
+                task_supervisor.add_shutdown_hook("database_backup", database_backup.stop)
+                await database_backup.start()
+
+        logger.info(f"🚀 Запуск завершено за {(time.perf_counter() - startup_started) * 1000:.0f} мс")
+
+        # Звіт профілю імпортів (STARTUP_PROFILE=1)
+        from .monitoring.import_profiler import import_profiler
+
+        if import_profiler.installed:
+            import_profiler.uninstall()
+            import_profiler.dump()
+
+        # Запуск polling (SIGTERM/SIGINT зупиняє polling, далі - впорядкована зупинка нижче).
+        # Сесію бота закриваємо самі: фоновим задачам вона потрібна до кінця зупинки
+        await dp.start_polling(bot, close_bot_session=False)
 
     except Exception as e:
         logger.error(f"Помилка при запуску бота: {e}")
     finally:
+        # Запуск перервано до await routers_task: потік не зупинити, але результат
+        # (і можливу помилку імпорту) не лишаємо неотриманим
+        if routers_task is not None:
+            if not routers_task.done():
+                routers_task.cancel()
+            elif not routers_task.cancelled():
+                routers_task.exception()
+        await task_supervisor.shutdown()
+        if bot is not None:
+            await bot.session.close()
+        if metrics_server is not None:
+            await metrics_server.stop()
         logger.info("Бот зупинений")
 
 
@@ -0,0 +1,66 @@
+"""
+Middleware для заміру часу обробки оновлень
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from app.monitoring.metrics import update_duration, updates_total
+
+# Ключ у data, через який внутрішній middleware передає назву обробника
+METRICS_CONTEXT_KEY = "metrics_context"
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Зовнішній middleware на рівні Update: міряє повний час обробки оновлення.
+
+    Назви роутера та обробника заповнює HandlerLabelMiddleware; якщо жоден
+    обробник не спрацював, оновлення позначається як unhandled.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        context = {"router": "unhandled", "handler": "unhandled"}
+        data[METRICS_CONTEXT_KEY] = context
+        event_type = getattr(event, "event_type", "unknown")
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            update_duration.observe(
+                time.perf_counter() - start,
+                event_type=event_type,
+                router=context["router"],
+                handler=context["handler"],
+            )
+            updates_total.inc(event_type=event_type, status=status)
+
+
+class HandlerLabelMiddleware(BaseMiddleware):
+    """Внутрішній middleware: записує модуль і назву обробника, що спрацював"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        context = data.get(METRICS_CONTEXT_KEY)
+        handler_object = data.get("handler")
+        if context is not None and handler_object is not None:
+            callback = handler_object.callback
+            # Роутери в проєкті безіменні, тому групуємо за модулем обробника
+            module = getattr(callback, "__module__", "") or ""
+            context["router"] = module.replace("app.modules.", "")
+            context["handler"] = getattr(callback, "__name__", type(callback).__name__)
+        return await handler(event, data)
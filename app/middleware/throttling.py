@@ -0,0 +1,116 @@
+"""
+Middleware для обмеження частоти callback-запитів (token bucket)
+
+Кожен користувач має окреме «відро» токенів на кожен клас обробників.
+Натискання, для якого токена немає, не доходить до фільтрів та обробника:
+на нього лише відповідаємо callback.answer(), щоб у клієнта зник годинник.
+Так зловмисний або «залиплий» клієнт не витрачає з'єднання з БД та
+ліміти Telegram API (edit_media, перевірки групи).
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery
+
+from app.monitoring.metrics import throttled_updates_total
+
+logger = logging.getLogger(__name__)
+
+# Класи обробників: (префікси callback_data, токенів за секунду, розмір відра)
+THROTTLE_CLASSES: Dict[str, Tuple[Tuple[str, ...], float, int]] = {
+    # Гортання каталогу: кожне натискання - запити до БД та edit_media
+    "navigation": (
+        (
+            "next_vehicle_", "prev_vehicle_", "saved_next_", "saved_prev_",
+            "search_next_", "search_prev_",
+            "vehicles_page_", "users_page_", "broadcasts_page_",
+        ),
+        2.0,
+        5,
+    ),
+    # Перемикачі: запис у БД на кожне натискання
+    "toggle": (
+        ("favorite_vehicle_", "save_vehicle_", "unsave_vehicle_", "saved_remove_", "toggle_sub_"),
+        1.0,
+        3,
+    ),
+}
+DEFAULT_CLASS = "default"
+DEFAULT_RATE = 3.0
+DEFAULT_BURST = 10
+
+
+def classify_callback(data: str) -> str:
+    """Клас обробника за callback_data"""
+    for name, (prefixes, _, _) in THROTTLE_CLASSES.items():
+        if data.startswith(prefixes):
+            return name
+    return DEFAULT_CLASS
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Зовнішній middleware для callback_query: відкидає надлишкові натискання.
+
+    Відра зберігаються в OrderedDict з обмеженим розміром: при переповненні
+    видаляються ті, до яких найдовше не зверталися.
+    """
+
+    THROTTLED_TEXT = "⏳ Не так швидко, зачекайте секунду"
+
+    def __init__(self, max_buckets: int = 10000):
+        self.max_buckets = max_buckets
+        # (user_id, клас) -> [токени, час останнього поповнення]
+        self._buckets: "OrderedDict[Tuple[int, str], list]" = OrderedDict()
+
+    def _limits(self, throttle_class: str) -> Tuple[float, int]:
+        if throttle_class in THROTTLE_CLASSES:
+            _, rate, burst = THROTTLE_CLASSES[throttle_class]
+            return rate, burst
+        return DEFAULT_RATE, DEFAULT_BURST
+
+    def allow(self, user_id: int, throttle_class: str) -> bool:
+        """Забрати токен з відра; False - якщо відро порожнє"""
+        rate, burst = self._limits(throttle_class)
+        now = time.monotonic()
+        key = (user_id, throttle_class)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(burst), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] < 1.0:
+            return False
+        bucket[0] -= 1.0
+        return True
+
+    async def __call__(
+        self,
+        handler: Callable[[CallbackQuery, Dict[str, Any]], Awaitable[Any]],
+        event: CallbackQuery,
+        data: Dict[str, Any],
+    ) -> Any:
+        if event.from_user is None:
+            return await handler(event, data)
+
+        throttle_class = classify_callback(event.data or "")
+        if self.allow(event.from_user.id, throttle_class):
+            return await handler(event, data)
+
+        throttled_updates_total.inc(throttle_class=throttle_class)
+        logger.debug(f"⏳ Callback {event.data} від {event.from_user.id} відкинуто (ліміт {throttle_class})")
+        try:
+            await event.answer(self.THROTTLED_TEXT)
+        except TelegramAPIError:
+            # Запит міг застаріти - відповідь тут не критична
+            pass
+        return None
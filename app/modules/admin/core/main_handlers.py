@@ -79,6 +79,7 @@ async def admin_vehicles_callback(callback: CallbackQuery, state: FSMContext):
 • ➕ <b>Додати авто</b> - створити нове оголошення
 • 📋 <b>Всі авто</b> - переглянути всі авто
 • 🔍 <b>Швидкий пошук</b> - знайти авто за критеріями
+• 🧰 <b>Масові дії</b> - змінити статус, архівувати або перепублікувати авто за фільтром
 
 Оберіть дію:
 """
@@ -177,4 +178,25 @@ async def admin_command(message: Message):
     )
 
 
+@router.message(Command("db_profile"))
+async def db_profile_command(message: Message):
+    """Команда /db_profile [reset] - звіт профайлера SQL-запитів"""
+    from html import escape
+    from app.modules.database.profiler import query_profiler
+
+    args = (message.text or "").split()[1:]
+    if args and args[0] == "reset":
+        query_profiler.reset()
+        await message.answer("🧹 Статистику профайлера запитів очищено")
+        return
+
+    report = query_profiler.format_report(limit=10)
+    # Обмеження Telegram - 4096 символів на повідомлення
+    for start in range(0, len(report), 3500):
+        await message.answer(
+            f"<pre>{escape(report[start:start + 3500])}</pre>",
+            parse_mode="HTML"
+        )
+
+
 # Обробник для користувачів без доступу буде в окремому роутері
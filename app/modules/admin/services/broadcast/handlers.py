@@ -11,8 +11,10 @@ from aiogram.fsm.state import State, StatesGroup
 
 from app.modules.admin.core.access_control import AdminAccessFilter
 from app.utils.formatting import get_default_parse_mode
+from app.utils.message_editor import message_editor
 from app.config.settings import settings
 from app.modules.database.manager import db_manager
+from app.services.tasks import task_supervisor
 
 logger = logging.getLogger(__name__)
 router = Router(name="admin_broadcast_handlers")
@@ -65,15 +67,19 @@ def _start_cleanup_task():
     """Запуск задачі автоочищення"""
     global _cleanup_task
     if _cleanup_task is None or _cleanup_task.done():
-        _cleanup_task = asyncio.create_task(_cleanup_old_media_groups())
+        _cleanup_task = task_supervisor.spawn(
+            _cleanup_old_media_groups(),
+            name="broadcast_media_groups_cleanup",
+            group="maintenance",
+            drain=False,
+        )
         logger.info("✅ Запущено задачу автоочищення медіагруп")
 
 
 async def _safe_edit_text(callback: CallbackQuery, text: str, reply_markup: InlineKeyboardMarkup | None = None) -> None:
     """Edit text safely; if not possible, send a new message instead."""
-    try:
-        await callback.message.edit_text(text, reply_markup=reply_markup, parse_mode=get_default_parse_mode())
-    except TelegramBadRequest:
+    # Нове повідомлення - лише якщо Telegram відхилив редагування (BadRequest), як і раніше
+    if not await message_editor.edit_text(callback.message, text, reply_markup, propagate_api_errors=True):
         await callback.message.answer(text, reply_markup=reply_markup, parse_mode=get_default_parse_mode())
 
 
@@ -419,7 +425,11 @@ async def save_media(message: Message, state: FSMContext):
             }
             _broadcast_media_groups[group_id] = entry
             # Запускаємо відкладену обробку групи
-            asyncio.create_task(_finalize_broadcast_media_group(group_id, 2.0))
+            task_supervisor.spawn(
+                _finalize_broadcast_media_group(group_id, 2.0),
+                name=f"broadcast_media_group:{group_id}",
+                group="media_groups",
+            )
 
         if message.photo:
             file_id = message.photo[-1].file_id
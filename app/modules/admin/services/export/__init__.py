@@ -1,6 +1,6 @@
 """
 Модуль експорту даних (адмін)
-Експорт даних з БД в Excel
+Експорт даних з БД в Excel, CSV та JSONL
 """
 from aiogram import Router
 
@@ -0,0 +1,217 @@
+"""
+Колонки експорту, спільні для всіх форматів
+
+Excel та CSV показують header і display (з перекладами), JSONL - key і raw
+(значення з БД без перекладів, для машинної обробки).
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.modules.admin.services.vehicle_management.shared.translations import translate_field_value
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """Колонка експорту"""
+
+    key: str  # Ключ у JSONL
+    header: str  # Заголовок у Excel/CSV
+    display: Callable[[dict], Any]  # Значення для Excel/CSV
+    raw: Optional[Callable[[dict], Any]] = None  # Значення для JSONL; None - поле key з БД
+
+    def raw_value(self, row: dict) -> Any:
+        return self.raw(row) if self.raw is not None else row.get(self.key)
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """Набір даних експорту: аркуш Excel / файл CSV / тип запису JSONL"""
+
+    name: str  # users, vehicles, ...
+    title: str  # Назва аркуша Excel
+    tables: Tuple[str, ...]  # Таблиці БД для посторінкового читання (DatabaseManager.get_export_page)
+    columns: List[ExportColumn]
+
+    @property
+    def headers(self) -> List[str]:
+        return [column.header for column in self.columns]
+
+    def display_row(self, row: dict) -> List[Any]:
+        return [column.display(row) for column in self.columns]
+
+    def raw_row(self, row: dict) -> Dict[str, Any]:
+        return {column.key: column.raw_value(row) for column in self.columns}
+
+
+def safe_translate(field_key: str, value: Any) -> str:
+    """Безпечно перекласти значення поля"""
+    if not value or value == "":
+        return ""
+    return translate_field_value(field_key, str(value))
+
+
+def _field(key: str, header: str, default: Any = "") -> ExportColumn:
+    return ExportColumn(key, header, lambda row: row.get(key) or default)
+
+
+def _translated(key: str, header: str, translation_key: Optional[str] = None) -> ExportColumn:
+    return ExportColumn(key, header, lambda row: safe_translate(translation_key or key, row.get(key)))
+
+
+def _flag(key: str, header: str, yes: str = "Так", no: str = "Ні") -> ExportColumn:
+    return ExportColumn(key, header, lambda row: yes if row.get(key) else no, lambda row: bool(row.get(key)))
+
+
+def _media_list(row: dict) -> list:
+    """photos JSON (може містити фото та відео) -> список"""
+    photos = row.get("photos")
+    if not photos:
+        return []
+    try:
+        media = json.loads(photos) if isinstance(photos, str) else photos
+    except (TypeError, ValueError):
+        return []
+    return media or []
+
+
+def _media_count(row: dict) -> int:
+    return len(_media_list(row))
+
+
+def _main_media_kind(row: dict) -> Optional[str]:
+    """Тип головного медіа для JSONL: photo, video або None"""
+    main_photo = row.get("main_photo") or ""
+    if not main_photo:
+        return None
+    return "video" if isinstance(main_photo, str) and main_photo.startswith("video:") else "photo"
+
+
+def _main_media_type(row: dict) -> str:
+    return {"photo": "Фото", "video": "Відео"}.get(_main_media_kind(row), "")
+
+
+def _short_text(row: dict) -> str:
+    text = row.get("text") or ""
+    return (text[:50] + "...") if len(text) > 50 else text
+
+
+USERS = ExportDataset(
+    name="users",
+    title="Користувачі",
+    tables=("users",),
+    columns=[
+        _field("id", "ID"),
+        _field("telegram_id", "Telegram ID"),
+        _field("first_name", "Ім'я"),
+        _field("last_name", "Прізвище"),
+        _field("username", "Username"),
+        _field("phone", "Телефон"),
+        _translated("role", "Роль"),
+        _flag("is_active", "Активний"),
+        _flag("is_verified", "Верифікований"),
+        _field("created_at", "Дата реєстрації"),
+        _field("updated_at", "Дата оновлення"),
+    ],
+)
+
+VEHICLES = ExportDataset(
+    name="vehicles",
+    title="Авто",
+    # Гаряча таблиця та архів проданих - окремо, щоб кожна читалась за своїм індексом
+    tables=("vehicles", "vehicles_archive"),
+    columns=[
+        # Основна інформація
+        _field("id", "ID"),
+        _translated("vehicle_type", "Тип"),
+        _field("brand", "Марка"),
+        _field("model", "Модель"),
+        _field("vin_code", "VIN"),
+        _field("year", "Рік"),
+        _translated("condition", "Стан"),
+        # Ціна та валюта
+        _field("price", "Ціна"),
+        _field("currency", "Валюта", default="USD"),
+        _field("mileage", "Пробіг (км)"),
+        # Двигун
+        _field("engine_volume", "Об'єм двигуна (л)"),
+        _field("power_hp", "Потужність (к.с.)"),
+        _translated("fuel_type", "Тип палива"),
+        # Трансмісія та кузов
+        _translated("transmission", "Коробка передач"),
+        _field("body_type", "Тип кузова"),
+        _field("wheel_radius", "Радіус коліс"),
+        # Вантажні характеристики
+        _field("load_capacity", "Вантажопідйомність (кг)"),
+        _field("total_weight", "Загальна маса (кг)"),
+        _field("cargo_dimensions", "Габарити відсіку"),
+        # Локація та опис
+        _translated("location", "Локація"),
+        _field("description", "Опис"),
+        # Медіа
+        ExportColumn("media_count", "Кількість медіа", _media_count, _media_count),
+        _field("main_photo", "Головне медіа"),
+        ExportColumn("main_media_type", "Тип головного медіа", _main_media_type, _main_media_kind),
+        ExportColumn(
+            "photos",
+            "Всі медіа (JSON)",
+            lambda row: json.dumps(_media_list(row), ensure_ascii=False) if _media_list(row) else "",
+            _media_list,
+        ),
+        # Статус та активність
+        _translated("status", "Статус"),
+        _flag("is_active", "Активність", yes="Активне", no="Неактивне"),
+        # Публікація
+        _flag("published_in_group", "Опубліковано в групу"),
+        _flag("published_in_bot", "Опубліковано в бот"),
+        _field("published_at", "Дата публікації"),
+        _field("group_message_id", "ID повідомлення в групі"),
+        # Дати
+        _field("status_changed_at", "Дата зміни статусу"),
+        _field("sold_at", "Дата продажу"),
+        # Системні поля
+        _field("seller_id", "Продавець ID"),
+        _field("created_at", "Створено"),
+        _field("updated_at", "Оновлено"),
+    ],
+)
+
+REQUESTS = ExportDataset(
+    name="requests",
+    title="Заявки",
+    tables=("manager_requests",),
+    columns=[
+        _field("id", "ID"),
+        _field("user_id", "Користувач ID"),
+        _field("vehicle_id", "Авто ID"),
+        _translated("request_type", "Тип заявки"),
+        _field("details", "Деталі"),
+        _translated("status", "Статус", translation_key="request_status"),
+        _field("created_at", "Створено"),
+        _field("updated_at", "Оновлено"),
+    ],
+)
+
+BROADCASTS = ExportDataset(
+    name="broadcasts",
+    title="Розсилки",
+    tables=("broadcasts",),
+    columns=[
+        _field("id", "ID"),
+        ExportColumn("text", "Текст", _short_text),
+        _field("button_text", "Кнопка (текст)"),
+        _field("button_url", "Кнопка (URL)"),
+        _translated("media_type", "Тип медіа"),
+        _field("media_file_id", "Media File ID"),
+        _field("media_group_id", "Media Group ID"),
+        _translated("status", "Статус", translation_key="broadcast_status"),
+        _translated("schedule_period", "Період повтору"),
+        _field("scheduled_at", "Заплановано"),
+        _field("created_at", "Створено"),
+    ],
+)
+
+# Порядок - як в експорті "всі дані"
+EXPORT_DATASETS: Dict[str, ExportDataset] = {
+    dataset.name: dataset for dataset in (USERS, VEHICLES, REQUESTS, BROADCASTS)
+}
@@ -12,7 +12,6 @@ from aiogram.exceptions import TelegramBadRequest, TelegramNetworkError
 from app.modules.admin.core.access_control import AdminAccessFilter
 from app.utils.formatting import get_default_parse_mode
 from .keyboards import get_export_main_keyboard, get_export_back_keyboard
-from .excel_generator import generate_excel_export, ExcelExporter
 
 logger = logging.getLogger(__name__)
 router = Router(name="admin_export_handlers")
@@ -100,6 +99,9 @@ async def _export_data_base(
         filename = f"export_{export_method}_{timestamp}.xlsx"
         
         # Створюємо експортер та викликаємо потрібний метод
+        # (openpyxl імпортується лише при першому експорті, а не під час запуску бота)
+        from .excel_generator import ExcelExporter
+
         exporter = ExcelExporter()
         export_func = getattr(exporter, export_method)
         await export_func()
@@ -141,6 +143,80 @@ async def _export_data_base(
         await _cleanup_export_file(filename)
 
 
+# Тип експорту -> назва розділу в повідомленнях
+EXPORT_TYPE_NAMES = {
+    "users": "користувачів",
+    "vehicles": "авто",
+    "requests": "заявок",
+    "broadcasts": "розсилок",
+    "all": "всіх даних",
+}
+
+STREAM_FORMAT_NAMES = {
+    "csv": "CSV",
+    "jsonl": "JSONL (gzip)",
+    "delta": "змін (JSONL, gzip)",
+}
+
+
+async def _export_stream_base(callback: CallbackQuery, export_type: str, export_format: str) -> None:
+    """Потоковий експорт у CSV/JSONL або експорт змін: сторінками з БД у тимчасовий файл"""
+    await callback.answer()
+    data_type = EXPORT_TYPE_NAMES[export_type]
+    format_name = STREAM_FORMAT_NAMES[export_format]
+    path = None
+
+    try:
+        await callback.message.edit_text(
+            f"<b>Експорт {data_type}</b>\n\n⏳ Генерую файл {format_name}...",
+            parse_mode=get_default_parse_mode()
+        )
+
+        from .stream_exporters import generate_delta_export, generate_stream_export
+
+        if export_format == "delta":
+            path, filename, rows, deleted, watermarks = await generate_delta_export(export_type)
+            caption = (
+                f"📊 Експорт змін ({data_type}) завершено: {rows} змінених рядків, {deleted} видалених"
+            )
+        else:
+            path, filename, rows = await generate_stream_export(export_type, export_format)
+            caption = f"📊 Експорт {data_type} ({format_name}) завершено: {rows} рядків"
+
+        await callback.message.answer_document(
+            document=FSInputFile(path, filename=filename),
+            caption=caption,
+            reply_markup=get_export_back_keyboard()
+        )
+
+        # Водяний знак зсуваємо лише після доставки файлу, інакше зміни загубляться
+        if export_format == "delta":
+            from app.modules.database.manager import db_manager
+
+            await db_manager.save_export_watermarks(export_type, watermarks)
+
+        logger.info(f"✅ Користувач {callback.from_user.id} успішно експортував {data_type} у {export_format}")
+
+    except Exception as e:
+        logger.error(f"❌ Помилка експорту {data_type} ({export_format}): {type(e).__name__}: {e}", exc_info=True)
+        user_message = _get_user_friendly_error(e)
+        try:
+            await callback.message.edit_text(
+                f"<b>Експорт {data_type}</b>\n\n{user_message}",
+                reply_markup=get_export_back_keyboard(),
+                parse_mode=get_default_parse_mode()
+            )
+        except TelegramBadRequest:
+            await callback.message.answer(
+                f"<b>Експорт {data_type}</b>\n\n{user_message}",
+                reply_markup=get_export_back_keyboard(),
+                parse_mode=get_default_parse_mode()
+            )
+
+    finally:
+        await _cleanup_export_file(path)
+
+
 @router.callback_query(F.data == "admin_export")
 async def export_main_menu(callback: CallbackQuery, state: FSMContext):
     """Головне меню експорту"""
@@ -150,7 +226,7 @@ async def export_main_menu(callback: CallbackQuery, state: FSMContext):
     text = """
 📤 <b>Експорт даних</b>
 
-Оберіть які дані ви хочете експортувати в Excel:
+Оберіть які дані ви хочете експортувати:
 
 • 👥 <b>Користувачі</b> - всі користувачі бота
 • 🚛 <b>Авто</b> - всі транспортні засоби
@@ -158,7 +234,10 @@ async def export_main_menu(callback: CallbackQuery, state: FSMContext):
 • 📢 <b>Розсилки</b> - історія розсилок
 • 📦 <b>Всі дані</b> - повний експорт (всі таблиці)
 
-Дані будуть експортовані в Excel файл (.xlsx)
+Кнопка з назвою розділу - Excel файл (.xlsx).
+<b>CSV</b> - для великих таблиць (відкривається в Excel, «всі дані» - zip-архів).
+<b>JSONL</b> - стиснутий файл для автоматичної обробки (значення без перекладів).
+<b>Δ</b> - лише зміни з попереднього такого ж експорту (JSONL) разом з ID видалених записів.
 """
     
     # Перевіряємо чи можемо відредагувати повідомлення (чи є в ньому текст)
@@ -206,3 +285,9 @@ async def export_all(callback: CallbackQuery, state: FSMContext):
     """Експорт усіх даних"""
     await _export_data_base(callback, "всіх даних", "Повний експорт завершено. Файл містить: користувачів, авто, заявки та розсилки", "export_all")
 
+
+@router.callback_query(F.data.regexp(r"^export_(csv|jsonl|delta)_(users|vehicles|requests|broadcasts|all)$"))
+async def export_stream(callback: CallbackQuery, state: FSMContext):
+    """Експорт у CSV, JSONL або експорт змін"""
+    _, export_format, export_type = callback.data.split("_", 2)
+    await _export_stream_base(callback, export_type, export_format)
@@ -4,39 +4,24 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 
+def _export_row(text: str, export_type: str) -> list:
+    """Рядок розділу: Excel (основна кнопка), потокові формати та експорт змін"""
+    return [
+        InlineKeyboardButton(text=text, callback_data=f"export_{export_type}"),
+        InlineKeyboardButton(text="CSV", callback_data=f"export_csv_{export_type}"),
+        InlineKeyboardButton(text="JSONL", callback_data=f"export_jsonl_{export_type}"),
+        InlineKeyboardButton(text="Δ", callback_data=f"export_delta_{export_type}"),
+    ]
+
+
 def get_export_main_keyboard() -> InlineKeyboardMarkup:
     """Головна клавіатура експорту"""
     keyboard = [
-        [
-            InlineKeyboardButton(
-                text="👥 Експорт користувачів",
-                callback_data="export_users"
-            ),
-        ],
-        [
-            InlineKeyboardButton(
-                text="🚛 Експорт авто",
-                callback_data="export_vehicles"
-            ),
-        ],
-        [
-            InlineKeyboardButton(
-                text="📨 Експорт заявок",
-                callback_data="export_requests"
-            ),
-        ],
-        [
-            InlineKeyboardButton(
-                text="📢 Експорт розсилок",
-                callback_data="export_broadcasts"
-            ),
-        ],
-        [
-            InlineKeyboardButton(
-                text="📦 Експорт всіх даних",
-                callback_data="export_all"
-            ),
-        ],
+        _export_row("👥 Користувачі", "users"),
+        _export_row("🚛 Авто", "vehicles"),
+        _export_row("📨 Заявки", "requests"),
+        _export_row("📢 Розсилки", "broadcasts"),
+        _export_row("📦 Всі дані", "all"),
         [
             InlineKeyboardButton(
                 text="🔙 Назад",
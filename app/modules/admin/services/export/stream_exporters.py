@@ -0,0 +1,223 @@
+"""
+Потоковий експорт у CSV та JSONL (gzip)
+
+На відміну від Excel, дані читаються з БД сторінками (EXPORT_PAGE_SIZE рядків,
+keyset по id) і одразу дописуються у тимчасовий файл, тож пам'ять не росте
+з розміром таблиці. Колонки та переклади - ті самі, що в ExcelExporter (columns.py).
+
+- csv: заголовки та значення як в Excel; "всі дані" - zip з CSV на кожен розділ
+- jsonl: один JSON-об'єкт на рядок, ключі та значення з БД без перекладів;
+  у "всіх даних" кожен запис має поле "_dataset"
+- delta (jsonl): лише рядки, змінені після попереднього інкрементального
+  експорту цього типу, та видалені ID ({"_deleted": true, "id": ...})
+"""
+import asyncio
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.modules.database.manager import db_manager
+from .columns import EXPORT_DATASETS, ExportDataset
+
+logger = logging.getLogger(__name__)
+
+# Формат -> розширення файлу (для одного розділу та для "всіх даних")
+STREAM_FORMATS = {
+    "csv": ("csv", "zip"),
+    "jsonl": ("jsonl.gz", "jsonl.gz"),
+}
+
+
+async def iter_dataset_pages(
+    dataset: ExportDataset, page_size: int, changed_since: Optional[str] = None, delta: bool = False
+) -> AsyncIterator[List[dict]]:
+    """Рядки розділу сторінками по page_size (delta - лише змінені з changed_since)"""
+    for table in dataset.tables:
+        after_id = 0
+        after_change = None
+        while True:
+            if delta:
+                rows = await db_manager.get_changed_rows_page(table, changed_since, after_change, page_size)
+            else:
+                rows = await db_manager.get_export_page(table, after_id, page_size)
+            if not rows:
+                break
+            yield rows
+            if len(rows) < page_size:
+                break
+            after_id = rows[-1]["id"]
+            after_change = (rows[-1]["_changed_at"], after_id) if delta else None
+
+
+def _write_csv_rows(stream, dataset: ExportDataset, rows: List[dict]) -> None:
+    csv.writer(stream).writerows(dataset.display_row(row) for row in rows)
+
+
+def _write_jsonl_rows(stream, dataset: ExportDataset, rows: List[dict], tag: bool) -> None:
+    lines = []
+    for row in rows:
+        record = dataset.raw_row(row)
+        if tag:
+            record = {"_dataset": dataset.name, **record}
+        lines.append(json.dumps(record, ensure_ascii=False, default=str))
+    stream.write("\n".join(lines) + "\n")
+
+
+async def _export_csv(stream, dataset: ExportDataset, page_size: int) -> int:
+    await asyncio.to_thread(csv.writer(stream).writerow, dataset.headers)
+    count = 0
+    async for rows in iter_dataset_pages(dataset, page_size):
+        await asyncio.to_thread(_write_csv_rows, stream, dataset, rows)
+        count += len(rows)
+    return count
+
+
+async def _export_jsonl(stream, dataset: ExportDataset, page_size: int, tag: bool) -> int:
+    count = 0
+    async for rows in iter_dataset_pages(dataset, page_size):
+        await asyncio.to_thread(_write_jsonl_rows, stream, dataset, rows, tag)
+        count += len(rows)
+    return count
+
+
+async def generate_stream_export(
+    export_type: str, export_format: str, page_size: Optional[int] = None
+) -> Tuple[str, str, int]:
+    """
+    Згенерувати CSV/JSONL експорт у тимчасовий файл
+
+    Args:
+        export_type: Тип експорту (users, vehicles, requests, broadcasts, all)
+        export_format: csv або jsonl
+
+    Returns:
+        (шлях до тимчасового файлу, ім'я файлу для користувача, кількість рядків)
+    """
+    if export_format not in STREAM_FORMATS:
+        raise ValueError(f"Невідомий формат експорту: {export_format}")
+    if export_type == "all":
+        datasets = list(EXPORT_DATASETS.values())
+    elif export_type in EXPORT_DATASETS:
+        datasets = [EXPORT_DATASETS[export_type]]
+    else:
+        raise ValueError(f"Невідомий тип експорту: {export_type}")
+
+    page_size = page_size or settings.export_page_size
+    extension = STREAM_FORMATS[export_format][export_type == "all"]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"export_{export_type}_{timestamp}.{extension}"
+    fd, path = tempfile.mkstemp(prefix="export_", suffix=f".{extension}")
+    os.close(fd)
+
+    total = 0
+    try:
+        if export_format == "jsonl":
+            with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as stream:
+                for dataset in datasets:
+                    total += await _export_jsonl(stream, dataset, page_size, tag=len(datasets) > 1)
+        elif len(datasets) == 1:
+            # utf-8-sig - щоб Excel правильно відкривав кирилицю
+            with open(path, "w", encoding="utf-8-sig", newline="") as stream:
+                total += await _export_csv(stream, datasets[0], page_size)
+        else:
+            with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for dataset in datasets:
+                    with archive.open(f"{dataset.name}.csv", "w") as member:
+                        stream = io.TextIOWrapper(member, encoding="utf-8-sig", newline="")
+                        total += await _export_csv(stream, dataset, page_size)
+                        stream.flush()
+                        stream.detach()
+    except BaseException:
+        os.remove(path)
+        raise
+
+    logger.info(f"✅ Експорт {export_type} ({export_format}): {total} рядків, {os.path.getsize(path) / 1024:.0f} КБ")
+    return path, filename, total
+
+
+def _overlap_start(changed_since: Optional[str], overlap_hours: float) -> Optional[str]:
+    """Межа вибірки з перекриттям: частина часу пишеться в UTC, частина - в локальному часі"""
+    if not changed_since:
+        return None
+    try:
+        moment = datetime.fromisoformat(changed_since)
+    except ValueError:
+        return None
+    return (moment - timedelta(hours=overlap_hours)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def generate_delta_export(
+    export_type: str, page_size: Optional[int] = None
+) -> Tuple[str, str, int, int, Dict[str, tuple]]:
+    """
+    Інкрементальний експорт (JSONL, gzip): зміни з попереднього експорту цього типу
+
+    Рядки з часом зміни в межах EXPORT_DELTA_OVERLAP_HOURS до водяного знака
+    потрапляють повторно - споживач має оновлювати записи за id.
+    Водяні знаки не зберігаються тут: після успішної доставки файлу викличте
+    db_manager.save_export_watermarks(export_type, watermarks).
+
+    Returns:
+        (шлях, ім'я файлу, змінених рядків, видалених ID, нові водяні знаки)
+    """
+    if export_type == "all":
+        datasets = list(EXPORT_DATASETS.values())
+    elif export_type in EXPORT_DATASETS:
+        datasets = [EXPORT_DATASETS[export_type]]
+    else:
+        raise ValueError(f"Невідомий тип експорту: {export_type}")
+
+    page_size = page_size or settings.export_page_size
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"export_{export_type}_delta_{timestamp}.jsonl.gz"
+    fd, path = tempfile.mkstemp(prefix="export_", suffix=".jsonl.gz")
+    os.close(fd)
+
+    changed = deleted = 0
+    watermarks: Dict[str, tuple] = {}
+    try:
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as stream:
+            for dataset in datasets:
+                state = await db_manager.get_export_watermark(export_type, dataset.name) or {}
+                changed_since = state.get("changed_since")
+                last_deletion_id = int(state.get("last_deletion_id") or 0)
+                since = _overlap_start(changed_since, settings.export_delta_overlap_hours)
+
+                async for rows in iter_dataset_pages(dataset, page_size, since, delta=True):
+                    await asyncio.to_thread(_write_jsonl_rows, stream, dataset, rows, True)
+                    changed += len(rows)
+                    newest = max(row["_changed_at"] or "" for row in rows)
+                    if newest and (not changed_since or newest > changed_since):
+                        changed_since = newest
+
+                # Видалення до першого експорту не потрібні: споживач отримує повний знімок
+                tombstones = await db_manager.get_deleted_rows(dataset.name, last_deletion_id)
+                if state:
+                    lines = [
+                        json.dumps(
+                            {"_dataset": dataset.name, "_deleted": True, "id": row["row_id"],
+                             "deleted_at": row["deleted_at"]},
+                            ensure_ascii=False,
+                        )
+                        for row in tombstones
+                    ]
+                    if lines:
+                        await asyncio.to_thread(stream.write, "\n".join(lines) + "\n")
+                    deleted += len(lines)
+                if tombstones:
+                    last_deletion_id = tombstones[-1]["id"]
+                watermarks[dataset.name] = (changed_since, last_deletion_id)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    logger.info(f"✅ Інкрементальний експорт {export_type}: {changed} змінених, {deleted} видалених")
+    return path, filename, changed, deleted, watermarks
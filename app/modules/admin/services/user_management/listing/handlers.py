@@ -31,14 +31,12 @@ async def show_all_users(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
     
     try:
-        # Отримуємо статистику
-        stats = await db_manager.get_users_statistics()
-        
-        # Отримуємо першу сторінку користувачів з сортуванням за датою
-        users = await db_manager.get_users(limit=settings.page_size, offset=0, sort_by="created_at_desc")
+        # Перша сторінка з сортуванням за датою та статистика за одне звернення до БД
+        users, total_users, stats = await db_manager.get_users_page(
+            limit=settings.page_size, offset=0, sort_by="created_at_desc"
+        )
         
         # Отримуємо загальну кількість сторінок
-        total_users = stats['total_users']
         total_pages = (total_users + settings.page_size - 1) // settings.page_size  # Округлення вгору
         
         # Форматуємо заголовок
@@ -95,12 +93,11 @@ async def navigate_users_page(callback: CallbackQuery, state: FSMContext):
             await callback.answer("❌ Недійсна сторінка", show_alert=True)
             return
         
-        # Отримуємо користувачів для поточної сторінки
+        # Отримуємо користувачів для поточної сторінки та статистику
         offset = (page - 1) * settings.page_size
-        users = await db_manager.get_users(limit=settings.page_size, offset=offset, sort_by=sort_by, status_filter=status_filter)
-        
-        # Отримуємо статистику
-        stats = await db_manager.get_users_statistics()
+        users, _, stats = await db_manager.get_users_page(
+            limit=settings.page_size, offset=offset, sort_by=sort_by, status_filter=status_filter
+        )
         
         # Форматуємо заголовок
         header_text = format_users_list_header(
@@ -211,20 +208,15 @@ async def sort_users(callback: CallbackQuery, state: FSMContext):
         state_data = await state.get_data()
         current_page = state_data.get('users_page', 1)
         
-        # Отримуємо користувачів з урахуванням статус фільтра та сортування
-        users = await db_manager.get_users(
+        # Отримуємо користувачів з урахуванням статус фільтра та сортування, кількість та статистику
+        users, total_count, stats = await db_manager.get_users_page(
             limit=settings.page_size, 
             offset=(current_page - 1) * settings.page_size, 
             sort_by=sort_type,
             status_filter=status_filter
         )
-        
-        total_count = await db_manager.get_users_count(status_filter)
         total_pages = (total_count + settings.page_size - 1) // settings.page_size
         
-        # Отримуємо статистику
-        stats = await db_manager.get_users_statistics()
-        
         # Форматуємо заголовок
         header_text = format_users_list_header(
             total_users=stats['total_users'],
@@ -279,20 +271,15 @@ async def filter_users_by_status(callback: CallbackQuery, state: FSMContext):
         state_data = await state.get_data()
         current_page = 1  # Повертаємося на першу сторінку при зміні фільтра
         
-        # Отримуємо користувачів з фільтрацією за статусом
-        users = await db_manager.get_users(
+        # Отримуємо користувачів з фільтрацією за статусом, кількість та статистику
+        users, total_count, stats = await db_manager.get_users_page(
             limit=settings.page_size, 
             offset=0, 
             sort_by=sort_by,
             status_filter=status_filter
         )
-        
-        total_count = await db_manager.get_users_count(status_filter)
         total_pages = (total_count + settings.page_size - 1) // settings.page_size
         
-        # Отримуємо статистику
-        stats = await db_manager.get_users_statistics()
-        
         # Форматуємо заголовок
         header_text = format_users_list_header(
             total_users=stats['total_users'],
@@ -628,20 +615,16 @@ async def back_to_users_list(callback: CallbackQuery, state: FSMContext):
         sort_by = state_data.get('users_sort', 'created_at_desc')
         status_filter = state_data.get('users_status_filter', 'all')
         
-        # Отримуємо користувачів
-        users = await db_manager.get_users(
+        # Отримуємо користувачів, кількість та статистику
+        users, total_count, stats = await db_manager.get_users_page(
             limit=settings.page_size, 
             offset=(current_page - 1) * settings.page_size, 
             sort_by=sort_by,
             status_filter=status_filter
         )
         
-        # Отримуємо статистику
-        stats = await db_manager.get_users_statistics()
-        
         # Отримуємо загальну кількість сторінок
-        total_count = await db_manager.get_users_count(status_filter)
-        total_pages = (total_count + 9) // 10
+        total_pages = (total_count + settings.page_size - 1) // settings.page_size
         
         # Форматуємо заголовок
         header_text = format_users_list_header(
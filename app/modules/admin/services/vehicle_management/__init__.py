@@ -12,6 +12,7 @@ from .listing import router as listing_router
 from .editing import router as editing_router
 from .deletion import router as deletion_router
 from .quick_search import router as quick_search_router
+from .bulk import router as bulk_router
 
 # Включаємо модулі
 router.include_router(creation_router)
@@ -19,4 +20,5 @@ router.include_router(listing_router)
 router.include_router(editing_router)
 router.include_router(deletion_router)
 router.include_router(quick_search_router)
+router.include_router(bulk_router)
 
@@ -0,0 +1,13 @@
+"""
+Модуль масових операцій з авто
+"""
+from aiogram import Router
+
+# Створюємо роутер для модуля масових операцій
+router = Router()
+
+# Імпортуємо обробники
+from .handlers import router as handlers_router
+
+# Включаємо обробники
+router.include_router(handlers_router)
@@ -0,0 +1,253 @@
+"""
+Обробники масових операцій з авто (статус, архівування, перепублікація)
+"""
+import html
+import logging
+from typing import Any, Dict, List
+
+from aiogram import Router, F
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup
+from aiogram.fsm.context import FSMContext
+
+from app.modules.admin.core.access_control import AdminAccessFilter
+from app.modules.admin.shared.utils.callback_utils import safe_callback_answer
+from app.modules.database.manager import db_manager
+from ..publication.job_worker import publication_worker
+from .keyboards import (
+    BULK_ACTION_LABELS,
+    BULK_AGE_OPTIONS,
+    BULK_STATUS_LABELS,
+    BULK_STATUS_OPTIONS,
+    BULK_TYPE_GROUPS,
+    format_age_label,
+    get_bulk_confirmation_keyboard,
+    get_bulk_menu_keyboard,
+    get_bulk_result_keyboard,
+    get_bulk_type_keyboard,
+)
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+# Застосовуємо фільтр доступу
+router.callback_query.filter(AdminAccessFilter())
+
+
+async def _get_filters(state: FSMContext) -> Dict[str, Any]:
+    data = await state.get_data()
+    return {
+        "type_key": data.get("bulk_type", "all"),
+        "status": data.get("bulk_status", "all"),
+        "age_days": data.get("bulk_age", 0),
+    }
+
+
+async def _select_targets(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    type_group = BULK_TYPE_GROUPS.get(filters["type_key"])
+    return await db_manager.get_vehicles_for_bulk_action(
+        vehicle_types=type_group[1] if type_group else None,
+        status=None if filters["status"] == "all" else filters["status"],
+        older_than_days=filters["age_days"] or None,
+    )
+
+
+def _split_targets(action: str, targets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Залишити тільки авто, до яких дія дійсно щось змінить"""
+    if action in ("sold", "republish"):
+        return [t for t in targets if t["status"] != "sold"]
+    return targets
+
+
+def _format_filters(filters: Dict[str, Any]) -> str:
+    type_group = BULK_TYPE_GROUPS.get(filters["type_key"])
+    return (
+        f"🚛 Тип: <b>{type_group[0] if type_group else 'Всі типи'}</b>\n"
+        f"📋 Статус: <b>{BULK_STATUS_LABELS.get(filters['status'], 'Всі')}</b>\n"
+        f"📅 Вік: <b>{format_age_label(filters['age_days'])}</b>"
+    )
+
+
+async def _show(callback: CallbackQuery, text: str, reply_markup: InlineKeyboardMarkup) -> None:
+    try:
+        await callback.message.edit_text(text, reply_markup=reply_markup, parse_mode="HTML")
+    except Exception:
+        # Якщо не можемо редагувати (наприклад, повідомлення з фото), відправляємо нове
+        await callback.message.answer(text, reply_markup=reply_markup, parse_mode="HTML")
+
+
+async def show_bulk_menu(callback: CallbackQuery, state: FSMContext) -> None:
+    """Показати фільтри та кількість авто, що під них підпадають"""
+    filters = await _get_filters(state)
+    targets = await _select_targets(filters)
+    published = sum(1 for t in targets if t["published_in_group"])
+    sold = sum(1 for t in targets if t["status"] == "sold")
+
+    text = f"""🧰 <b>Масові дії з авто</b>
+
+<b>Фільтр:</b>
+{_format_filters(filters)}
+
+<b>Під фільтр підпадає:</b> {len(targets)} авто
+• в групі: {published}
+• продано: {sold}
+
+Змініть фільтр або оберіть дію:"""
+
+    await _show(
+        callback,
+        text,
+        get_bulk_menu_keyboard(filters["type_key"], filters["status"], filters["age_days"]),
+    )
+
+
+@router.callback_query(F.data == "bulk_vehicles")
+async def bulk_vehicles_menu(callback: CallbackQuery, state: FSMContext):
+    """Меню масових операцій"""
+    await safe_callback_answer(callback)
+
+    try:
+        await show_bulk_menu(callback, state)
+    except Exception as e:
+        logger.error(f"❌ Помилка показу меню масових дій: {e}")
+        await callback.message.answer("❌ Помилка відображення меню")
+
+
+@router.callback_query(F.data == "bulk_choose_type")
+async def bulk_choose_type(callback: CallbackQuery, state: FSMContext):
+    """Вибір категорії авто"""
+    await safe_callback_answer(callback)
+    await _show(callback, "🚛 <b>Оберіть категорію авто:</b>", get_bulk_type_keyboard())
+
+
+@router.callback_query(F.data.startswith("bulk_set_type_"))
+async def bulk_set_type(callback: CallbackQuery, state: FSMContext):
+    """Зберегти категорію авто у фільтрі"""
+    await safe_callback_answer(callback)
+
+    type_key = callback.data.replace("bulk_set_type_", "")
+    await state.update_data(bulk_type=type_key if type_key in BULK_TYPE_GROUPS else "all")
+    await show_bulk_menu(callback, state)
+
+
+@router.callback_query(F.data == "bulk_cycle_status")
+async def bulk_cycle_status(callback: CallbackQuery, state: FSMContext):
+    """Перемкнути фільтр за статусом"""
+    await safe_callback_answer(callback)
+
+    filters = await _get_filters(state)
+    index = BULK_STATUS_OPTIONS.index(filters["status"]) if filters["status"] in BULK_STATUS_OPTIONS else 0
+    await state.update_data(bulk_status=BULK_STATUS_OPTIONS[(index + 1) % len(BULK_STATUS_OPTIONS)])
+    await show_bulk_menu(callback, state)
+
+
+@router.callback_query(F.data == "bulk_cycle_age")
+async def bulk_cycle_age(callback: CallbackQuery, state: FSMContext):
+    """Перемкнути фільтр за віком оголошення"""
+    await safe_callback_answer(callback)
+
+    filters = await _get_filters(state)
+    index = BULK_AGE_OPTIONS.index(filters["age_days"]) if filters["age_days"] in BULK_AGE_OPTIONS else 0
+    await state.update_data(bulk_age=BULK_AGE_OPTIONS[(index + 1) % len(BULK_AGE_OPTIONS)])
+    await show_bulk_menu(callback, state)
+
+
+@router.callback_query(F.data.startswith("bulk_action_"))
+async def bulk_action_confirmation(callback: CallbackQuery, state: FSMContext):
+    """Підтвердження масової дії"""
+    action = callback.data.replace("bulk_action_", "")
+    if action not in BULK_ACTION_LABELS:
+        await safe_callback_answer(callback)
+        return
+
+    try:
+        filters = await _get_filters(state)
+        targets = _split_targets(action, await _select_targets(filters))
+
+        if not targets:
+            await safe_callback_answer(callback, "ℹ️ Немає авто, до яких можна застосувати цю дію", show_alert=True)
+            return
+
+        await safe_callback_answer(callback)
+
+        details = {
+            "sold": "Статус усіх вибраних авто буде змінено на «Продане».",
+            "archive": "Оголошення буде приховано з бота, а пости в групі - видалено.",
+            "republish": "Старі пости буде видалено, а авто опубліковано в групу повторно. "
+                         "Продані авто пропускаються.",
+        }[action]
+
+        text = f"""⚠️ <b>ПІДТВЕРДЖЕННЯ МАСОВОЇ ДІЇ</b>
+
+<b>Дія:</b> {BULK_ACTION_LABELS[action]}
+<b>Кількість авто:</b> {len(targets)}
+
+<b>Фільтр:</b>
+{_format_filters(filters)}
+
+{details}
+
+<b>Підтвердити?</b>"""
+
+        await _show(callback, text, get_bulk_confirmation_keyboard(action))
+
+    except Exception as e:
+        logger.error(f"❌ Помилка підготовки масової дії {action}: {e}")
+        await callback.message.answer("❌ Помилка підготовки дії")
+
+
+@router.callback_query(F.data.startswith("bulk_confirm_"))
+async def bulk_action_execute(callback: CallbackQuery, state: FSMContext):
+    """Виконати масову дію: зміни в БД одразу, дії в Telegram - через чергу публікацій"""
+    await safe_callback_answer(callback)
+
+    action = callback.data.replace("bulk_confirm_", "")
+    if action not in BULK_ACTION_LABELS:
+        return
+
+    try:
+        # Вибірку повторюємо: між підтвердженням і виконанням дані могли змінитися
+        filters = await _get_filters(state)
+        targets = _split_targets(action, await _select_targets(filters))
+        vehicle_ids = [t["id"] for t in targets]
+        admin_id = callback.from_user.id
+        queued = 0
+
+        if action == "sold":
+            updated = await db_manager.bulk_update_vehicle_status(vehicle_ids, "sold")
+            summary = f"✅ Позначено проданими: <b>{updated}</b> авто"
+
+        elif action == "archive":
+            updated = await db_manager.bulk_archive_vehicles(vehicle_ids)
+            queued = await publication_worker.enqueue_many(
+                [(t["id"], "unpublish") for t in targets if t["published_in_group"]],
+                requested_by=admin_id,
+            )
+            summary = f"🗄 Архівовано: <b>{updated}</b> авто\n📤 Постів на видалення з групи: <b>{queued}</b>"
+
+        else:
+            queued = await publication_worker.enqueue_many(
+                [
+                    (t["id"], "republish" if t["published_in_group"] and t["group_message_id"] else "publish")
+                    for t in targets
+                ],
+                requested_by=admin_id,
+            )
+            summary = f"🔁 Поставлено в чергу публікацій: <b>{queued}</b> авто"
+
+        text = f"🧰 <b>МАСОВУ ДІЮ ВИКОНАНО</b>\n\n{summary}"
+        if queued:
+            text += "\n\n⏳ Дії в групі виконуються у фоні, прогрес буде надіслано окремими повідомленнями."
+
+        await _show(callback, text, get_bulk_result_keyboard())
+
+        logger.info(
+            f"🧰 Масова дія {action} для {len(vehicle_ids)} авто (в черзі: {queued}) користувачем {admin_id}"
+        )
+
+    except Exception as e:
+        logger.error(f"❌ Помилка виконання масової дії {action}: {e}")
+        await _show(
+            callback,
+            f"❌ <b>Помилка виконання масової дії</b>\n\n{html.escape(str(e))}",
+            get_bulk_result_keyboard(),
+        )
@@ -0,0 +1,135 @@
+"""
+Клавіатури для масових операцій з авто
+"""
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+
+# Категорії авто (як у каталозі) → внутрішні типи
+BULK_TYPE_GROUPS = {
+    "tractors_and_semi": ("🚛 Сідельні тягачі та напівпричепи", ["saddle_tractor", "semi_container_carrier", "bus"]),
+    "vans_and_refrigerators": ("🚍 Вантажні фургони та рефрижератори", ["van", "refrigerator"]),
+    "variable_body": ("🚞 Змінні кузови", ["variable_body"]),
+    "container_carriers": ("🚚 Контейнеровози (з причепами)", ["container_carrier", "trailer"]),
+}
+
+# Порядок перемикання фільтрів
+BULK_STATUS_OPTIONS = ["all", "available", "sold"]
+BULK_STATUS_LABELS = {"all": "Всі", "available": "Наявні", "sold": "Продані"}
+BULK_AGE_OPTIONS = [0, 30, 90, 180, 365]
+
+BULK_ACTION_LABELS = {
+    "sold": "✅ Позначити проданими",
+    "archive": "🗄 Архівувати",
+    "republish": "🔁 Перепублікувати в групу",
+}
+
+
+def format_age_label(days: int) -> str:
+    """Підпис фільтра за віком оголошення"""
+    return "Будь-який" if not days else f"Старші {days} дн."
+
+
+def get_bulk_menu_keyboard(type_key: str, status: str, age_days: int) -> InlineKeyboardMarkup:
+    """Клавіатура фільтрів та дій масових операцій"""
+    type_label = BULK_TYPE_GROUPS[type_key][0] if type_key in BULK_TYPE_GROUPS else "Всі типи"
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=f"🚛 Тип: {type_label}",
+                callback_data="bulk_choose_type"
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text=f"📋 Статус: {BULK_STATUS_LABELS.get(status, 'Всі')}",
+                callback_data="bulk_cycle_status"
+            ),
+            InlineKeyboardButton(
+                text=f"📅 Вік: {format_age_label(age_days)}",
+                callback_data="bulk_cycle_age"
+            ),
+        ],
+    ]
+
+    for action, label in BULK_ACTION_LABELS.items():
+        buttons.append([
+            InlineKeyboardButton(
+                text=label,
+                callback_data=f"bulk_action_{action}"
+            )
+        ])
+
+    buttons.append([
+        InlineKeyboardButton(
+            text="🔙 Назад",
+            callback_data="admin_vehicles"
+        ),
+    ])
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_bulk_type_keyboard() -> InlineKeyboardMarkup:
+    """Клавіатура вибору категорії авто"""
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=label,
+                callback_data=f"bulk_set_type_{type_key}"
+            )
+        ]
+        for type_key, (label, _) in BULK_TYPE_GROUPS.items()
+    ]
+    buttons.append([
+        InlineKeyboardButton(
+            text="📦 Всі типи",
+            callback_data="bulk_set_type_all"
+        )
+    ])
+    buttons.append([
+        InlineKeyboardButton(
+            text="🔙 Назад",
+            callback_data="bulk_vehicles"
+        )
+    ])
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_bulk_confirmation_keyboard(action: str) -> InlineKeyboardMarkup:
+    """Клавіатура підтвердження масової дії"""
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text="✅ ТАК, ВИКОНАТИ",
+                callback_data=f"bulk_confirm_{action}"
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text="❌ СКАСУВАТИ",
+                callback_data="bulk_vehicles"
+            ),
+        ],
+    ]
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_bulk_result_keyboard() -> InlineKeyboardMarkup:
+    """Клавіатура після виконання масової дії"""
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text="🧰 Масові дії",
+                callback_data="bulk_vehicles"
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text="🔙 Назад",
+                callback_data="admin_vehicles"
+            ),
+        ],
+    ]
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -10,6 +10,7 @@ from aiogram.fsm.context import FSMContext
 from .states import VehicleCreationStates
 from .keyboards import get_photos_input_keyboard, get_photos_summary_keyboard, get_additional_photos_keyboard
 from app.utils.formatting import get_default_parse_mode
+from app.services.tasks import task_supervisor
 
 logger = logging.getLogger(__name__)
 
@@ -65,8 +66,10 @@ async def process_media_group_photos(
             }
 
             # Запускаємо таймер для обробки групи (2.5 секунди)
-            asyncio.create_task(
-                process_group_after_delay(media_group_id, 2.5)
+            task_supervisor.spawn(
+                process_group_after_delay(media_group_id, 2.5),
+                name=f"creation_media_group:{media_group_id}",
+                group="media_groups",
             )
 
         # Додаємо фото до групи
@@ -309,7 +312,12 @@ async def process_group_after_delay(media_group_id: str, delay: float):
         del media_groups[media_group_id]
         
         # Видаляємо з оброблених через 5 хвилин (очищення пам'яті)
-        asyncio.create_task(cleanup_processed_group(media_group_id, 300))
+        task_supervisor.spawn(
+            cleanup_processed_group(media_group_id, 300),
+            name=f"cleanup_media_group:{media_group_id}",
+            group="maintenance",
+            drain=False,
+        )
 
     except Exception as e:
         logger.error(f"❌ process_group_after_delay: помилка обробки групи {media_group_id}: {e}", exc_info=True)
@@ -461,20 +461,31 @@ async def back_to_summary_card(callback: CallbackQuery, state: FSMContext):
                         update_data[field] = VehicleCondition(english_value)
                     else:
                         update_data[field] = None
-                elif field == 'photos':
-                    update_data[field] = processed_value
                 else:
                     update_data[field] = processed_value
             
+            # Медіа записуються у vehicle_media окремо: дописані фото додаються рядками,
+            # а не перезаписом усього списку
+            photos = update_data.pop('photos', None)
+            main_photo_changed = 'main_photo' in update_data
+            main_photo = update_data.pop('main_photo', None)
+            
             # Зберігаємо зміни в БД
             db_manager = DatabaseManager()
-            success = await db_manager.update_vehicle(vehicle_id, update_data)
+            success = True
+            if update_data:
+                success = await db_manager.update_vehicle(vehicle_id, update_data)
+            if success and 'photos' in changes:
+                success = await db_manager.replace_vehicle_photos(vehicle_id, photos or [])
+            if success and main_photo_changed:
+                success = await db_manager.set_main_photo(vehicle_id, main_photo)
             
             if success:
                 logger.info(f"✅ Зміни збережено в БД для авто ID {vehicle_id}")
                 # Перезавантажуємо актуальні дані з БД і оновлюємо FSM
                 vehicle = await db_manager.get_vehicle_by_id(vehicle_id)
                 if vehicle:
+                    photos, main_photo = await db_manager.get_vehicle_media_ids(vehicle_id)
                     # Оновлюємо FSM з актуальними даними з БД
                     await state.update_data(
                         vehicle_type=vehicle.vehicle_type.value,
@@ -496,8 +507,8 @@ async def back_to_summary_card(callback: CallbackQuery, state: FSMContext):
                         cargo_dimensions=vehicle.cargo_dimensions,
                         location=vehicle.location,
                         description=vehicle.description,
-                        photos=vehicle.photos or [],
-                        main_photo=vehicle.main_photo,
+                        photos=photos,
+                        main_photo=main_photo,
                     )
                     logger.info(f"✅ FSM оновлено актуальними даними з БД для авто ID {vehicle_id}")
             else:
@@ -8,6 +8,7 @@ from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 
 from app.utils.formatting import get_default_parse_mode
+from app.services.tasks import task_supervisor
 from app.modules.admin.core.access_control import AdminAccessFilter
 from .states import VehicleEditingStates
 from .keyboards import get_editing_menu_keyboard, get_vehicle_type_reply_keyboard
@@ -590,8 +591,11 @@ async def process_add_photos(message: Message, state: FSMContext):
             logger.info(f"📷 process_add_photos: додано перше фото до медіа-групи {media_group_id}, всього: {len(process_add_photos._media_groups[media_group_id]['photos'])}")
             
             # Запускаємо обробку через 2 секунди (щоб зібрати всі фото)
-            import asyncio
-            asyncio.create_task(process_add_photos_media_group_after_delay(media_group_id, state, message))
+            task_supervisor.spawn(
+                process_add_photos_media_group_after_delay(media_group_id, state, message),
+                name=f"edit_add_photos:{media_group_id}",
+                group="media_groups",
+            )
             return
         
         # Якщо не медіа-група, обробляємо як одиночне фото
@@ -681,8 +685,11 @@ async def process_replace_photos(message: Message, state: FSMContext):
             logger.info(f"🔄 process_replace_photos: додано перше фото до медіа-групи {media_group_id}, всього: {len(process_replace_photos._media_groups[media_group_id]['photos'])}")
             
             # Запускаємо обробку через 2 секунди (щоб зібрати всі фото)
-            import asyncio
-            asyncio.create_task(process_media_group_after_delay(media_group_id, state, message))
+            task_supervisor.spawn(
+                process_media_group_after_delay(media_group_id, state, message),
+                name=f"edit_replace_photos:{media_group_id}",
+                group="media_groups",
+            )
             return
         
         # Якщо не медіа-група, обробляємо як одиночне фото
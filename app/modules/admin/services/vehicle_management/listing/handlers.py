@@ -10,6 +10,8 @@ from aiogram.fsm.context import FSMContext
 from app.modules.admin.core.access_control import AdminAccessFilter
 from app.modules.database.manager import DatabaseManager
 from app.config.settings import settings
+from app.utils.message_editor import message_editor
+from app.utils.navigation import navigation_coalescer
 from .keyboards import get_vehicles_list_keyboard, get_vehicle_detail_keyboard
 from .formatters import format_admin_vehicle_card, format_vehicle_list_item
 from ..editing.handlers import show_editing_menu
@@ -124,32 +126,38 @@ async def show_all_vehicles(callback: CallbackQuery, state: FSMContext):
 async def navigate_vehicles_page(callback: CallbackQuery, state: FSMContext):
     """Навігація по сторінках авто"""
     await callback.answer()
+    nav = navigation_coalescer.begin(callback.message)
     
     try:
         # Отримуємо номер сторінки з callback_data
         page = int(callback.data.replace("vehicles_page_", ""))
         
-        # Отримуємо дані з стану (з fallback на альтернативні ключі для сумісності)
-        state_data = await state.get_data()
+        # При швидкому гортанні малюємо лише останню обрану сторінку
+        async with nav as is_latest:
+            if not is_latest:
+                return
+
+            # Отримуємо дані з стану (з fallback на альтернативні ключі для сумісності)
+            state_data = await state.get_data()
         
-        # Отримуємо сортування (спочатку пробуємо sort_by, потім vehicles_sort)
-        sort_by = state_data.get('sort_by') or state_data.get('vehicles_sort', 'created_at_desc')
+            # Отримуємо сортування (спочатку пробуємо sort_by, потім vehicles_sort)
+            sort_by = state_data.get('sort_by') or state_data.get('vehicles_sort', 'created_at_desc')
         
-        # Отримуємо статистику для актуальної кількості сторінок
-        stats = await get_vehicles_statistics()
-        total_pages = stats['total_pages']
+            # Отримуємо статистику для актуальної кількості сторінок
+            stats = await get_vehicles_statistics()
+            total_pages = stats['total_pages']
         
-        # Перевіряємо валідність сторінки
-        if page < 1 or page > total_pages:
-            await callback.answer("❌ Недійсна сторінка", show_alert=True)
-            return
+            # Перевіряємо валідність сторінки
+            if page < 1 or page > total_pages:
+                await callback.answer("❌ Недійсна сторінка", show_alert=True)
+                return
         
-        # Отримуємо авто для поточної сторінки
-        offset = (page - 1) * settings.page_size
-        vehicles = await db_manager.get_vehicles(limit=settings.page_size, offset=offset, sort_by=sort_by)
+            # Отримуємо авто для поточної сторінки
+            offset = (page - 1) * settings.page_size
+            vehicles = await db_manager.get_vehicles(limit=settings.page_size, offset=offset, sort_by=sort_by)
         
-        # Форматуємо текст
-        stats_text = f"""📋 <b>Всі авто</b>
+            # Форматуємо текст
+            stats_text = f"""📋 <b>Всі авто</b>
 
 📊 <b>Статистика:</b>
 • 🚛 <b>Всього авто:</b> {stats['total_vehicles']}
@@ -158,29 +166,35 @@ async def navigate_vehicles_page(callback: CallbackQuery, state: FSMContext):
 🏭 <b>Топ марки:</b>
 """
         
-        # Додаємо топ-5 марок
-        for i, (brand, count) in enumerate(stats['top_brands'][:5], 1):
-            stats_text += f"{i}. <b>{brand}</b> - {count} авто\n"
-        
-        stats_text += f"\n📄 <b>Сторінка {page} з {total_pages}</b>"
+            # Додаємо топ-5 марок
+            for i, (brand, count) in enumerate(stats['top_brands'][:5], 1):
+                stats_text += f"{i}. <b>{brand}</b> - {count} авто\n"
         
-        # Оновлюємо повідомлення
-        await callback.message.edit_text(
-            stats_text,
-            reply_markup=get_vehicles_list_keyboard(vehicles, current_page=page, total_pages=total_pages, sort_by=sort_by),
-            parse_mode="HTML"
-        )
+            stats_text += f"\n📄 <b>Сторінка {page} з {total_pages}</b>"
         
-        # Оновлюємо поточну сторінку та загальну кількість сторінок в стані
-        await state.update_data(
-            current_page=page,
-            vehicles_page=page,  # Для сумісності з іншими функціями
-            total_pages=total_pages,
-            sort_by=sort_by,
-            vehicles_sort=sort_by  # Для сумісності з іншими функціями
-        )
+            # Оновлюємо повідомлення
+            if nav.superseded:
+                return
+            edited = await message_editor.edit_text(
+                callback.message,
+                stats_text,
+                get_vehicles_list_keyboard(vehicles, current_page=page, total_pages=total_pages, sort_by=sort_by),
+                parse_mode="HTML"
+            )
+            if not edited:
+                await callback.answer("❌ Помилка навігації", show_alert=True)
+                return
+        
+            # Оновлюємо поточну сторінку та загальну кількість сторінок в стані
+            await state.update_data(
+                current_page=page,
+                vehicles_page=page,  # Для сумісності з іншими функціями
+                total_pages=total_pages,
+                sort_by=sort_by,
+                vehicles_sort=sort_by  # Для сумісності з іншими функціями
+            )
         
-        logger.info(f"📄 Перехід на сторінку {page} з {total_pages} для користувача {callback.from_user.id}")
+            logger.info(f"📄 Перехід на сторінку {page} з {total_pages} для користувача {callback.from_user.id}")
         
     except Exception as e:
         logger.error(f"❌ Помилка навігації по сторінках: {e}")
@@ -371,6 +385,9 @@ async def edit_existing_vehicle(callback: CallbackQuery, state: FSMContext):
         total_pages = current_state_data.get('total_pages', 1)
         sort_by = current_state_data.get('sort_by', 'created_at_asc')
         
+        # Медіа редактор читає з vehicle_media
+        photos, main_photo = await db_manager.get_vehicle_media_ids(vehicle_id)
+        
         # Конвертуємо VehicleModel в словник для FSM
         vehicle_data = {
             'vehicle_id': vehicle.id,
@@ -393,7 +410,8 @@ async def edit_existing_vehicle(callback: CallbackQuery, state: FSMContext):
             'cargo_dimensions': vehicle.cargo_dimensions,
             'location': vehicle.location,
             'description': vehicle.description,
-            'photos': vehicle.photos,
+            'photos': photos,
+            'main_photo': main_photo,
             'editing_changes': {},  # Ініціалізуємо зміни
             'editing_mode': 'existing',  # Позначаємо що це редагування існуючого авто
             # Зберігаємо дані пагінації
@@ -572,95 +590,36 @@ async def publish_vehicle_to_group(callback: CallbackQuery, state: FSMContext):
                 )
             return
         
-        # Імпортуємо GroupPublisher
-        from ..publication.group_publisher import create_group_publisher
-        
-        # Створюємо публікатор для групи
-        group_publisher = await create_group_publisher(callback.bot)
-        
-        # Конвертуємо VehicleModel в словник для публікації
-        from ..shared.translations import translate_field_value
+        # Публікація виконується фоновим обробником черги з повторами
+        from ..publication.job_worker import publication_worker
         
-        vehicle_data = {
-            'vehicle_id': vehicle_id,  # Додаємо ID авто
-            'vehicle_type': translate_field_value('vehicle_type', vehicle.vehicle_type.value) if vehicle.vehicle_type else None,
-            'brand': vehicle.brand,
-            'model': vehicle.model,
-            'vin_code': vehicle.vin_code,
-            'body_type': vehicle.body_type,
-            'year': vehicle.year,
-            'condition': translate_field_value('condition', vehicle.condition.value) if vehicle.condition else None,
-            'price': vehicle.price,
-            'mileage': vehicle.mileage,
-            'fuel_type': translate_field_value('fuel_type', vehicle.fuel_type) if vehicle.fuel_type else None,
-            'engine_volume': vehicle.engine_volume,
-            'power_hp': vehicle.power_hp,
-            'transmission': translate_field_value('transmission', vehicle.transmission) if vehicle.transmission else None,
-            'wheel_radius': vehicle.wheel_radius,
-            'load_capacity': vehicle.load_capacity,
-            'total_weight': vehicle.total_weight,
-            'cargo_dimensions': vehicle.cargo_dimensions,
-            'location': vehicle.location,
-            'description': vehicle.description,
-            'photos': vehicle.photos
-        }
+        # Якщо авто вже в групі - перепублікуємо замість дублювання поста
+        action = "republish" if vehicle.published_in_group and vehicle.group_message_id else "publish"
+        job_id = await publication_worker.enqueue(vehicle_id, action, requested_by=callback.from_user.id)
+        queued = await db_manager.count_active_publication_jobs(callback.from_user.id)
         
-        # Публікуємо авто в групу
-        logger.info(f"🚀 Починаємо публікацію авто ID {vehicle_id} в групу")
-        logger.info(f"📊 Дані авто: brand={vehicle.brand}, model={vehicle.model}, photos_count={len(vehicle.photos) if vehicle.photos else 0}")
+        queued_text = (
+            "⏳ <b>ПУБЛІКАЦІЮ ПОСТАВЛЕНО В ЧЕРГУ</b>\n\n"
+            f"Задача #{job_id}. Ваших задач у черзі: {queued}.\n"
+            "Про результат буде надіслано повідомлення."
+        )
         
-        success, error_message, group_message_id = await group_publisher.publish_vehicle_to_group(vehicle_data)
+        try:
+            await callback.message.edit_text(
+                queued_text,
+                parse_mode="HTML"
+            )
+        except Exception:
+            # Якщо не можемо редагувати (наприклад, повідомлення з фото), відправляємо нове
+            await callback.message.answer(
+                queued_text,
+                parse_mode="HTML"
+            )
         
-        logger.info(f"📤 Результат публікації: success={success}, message={error_message}")
+        # Відправляємо окреме повідомлення з карткою авто
+        await send_vehicle_card_message(callback, vehicle_id)
         
-        if success:
-            # Оновлюємо статус публікації в БД
-            await db_manager.update_vehicle(vehicle_id, {
-                'published_in_group': True,
-                'published_at': datetime.now(),
-                'group_message_id': group_message_id
-            })
-            
-            # Показуємо просте повідомлення про успіх
-            success_text = "✅ <b>АВТО УСПІШНО ОПУБЛІКОВАНО В ГРУПУ</b>\n\nОперація завершена успішно!"
-            
-            try:
-                await callback.message.edit_text(
-                    success_text,
-                    parse_mode="HTML"
-                )
-            except Exception:
-                # Якщо не можемо редагувати (наприклад, повідомлення з фото), відправляємо нове
-                await callback.message.answer(
-                    success_text,
-                    parse_mode="HTML"
-                )
-            
-            # Відправляємо окреме повідомлення з карткою авто
-            await send_vehicle_card_message(callback, vehicle_id)
-            
-            logger.info(f"✅ Авто ID {vehicle_id} успішно опубліковано в групу користувачем {callback.from_user.id}")
-            
-        else:
-            # Показуємо просте повідомлення про помилку
-            error_text = f"❌ <b>ПОМИЛКА ПУБЛІКАЦІЇ</b>\n\n{error_message}\n\nСпробуйте ще раз або зверніться до адміністратора."
-            
-            try:
-                await callback.message.edit_text(
-                    error_text,
-                    parse_mode="HTML"
-                )
-            except Exception:
-                # Якщо не можемо редагувати (наприклад, повідомлення з фото), відправляємо нове
-                await callback.message.answer(
-                    error_text,
-                    parse_mode="HTML"
-                )
-            
-            # Відправляємо окреме повідомлення з карткою авто
-            await send_vehicle_card_message(callback, vehicle_id)
-            
-            logger.error(f"❌ Помилка публікації авто ID {vehicle_id} в групу для користувача {callback.from_user.id}")
+        logger.info(f"📥 Авто ID {vehicle_id} додано в чергу публікацій ({action}) користувачем {callback.from_user.id}")
         
     except Exception as e:
         logger.error(f"❌ Помилка публікації авто в групу: {e}")
@@ -677,6 +636,32 @@ async def publish_vehicle_to_group(callback: CallbackQuery, state: FSMContext):
             )
 
 
+@router.callback_query(F.data.startswith("unpublish_vehicle_"))
+async def unpublish_vehicle_from_group(callback: CallbackQuery, state: FSMContext):
+    """Зняти авто з групи (через чергу публікацій)"""
+    await callback.answer()
+    
+    try:
+        vehicle_id = int(callback.data.replace("unpublish_vehicle_", ""))
+        
+        from ..publication.job_worker import publication_worker
+        
+        job_id = await publication_worker.enqueue(vehicle_id, "unpublish", requested_by=callback.from_user.id)
+        await callback.message.answer(
+            f"⏳ <b>ЗНЯТТЯ З ГРУПИ ПОСТАВЛЕНО В ЧЕРГУ</b>\n\nЗадача #{job_id}. Про результат буде надіслано повідомлення.",
+            parse_mode="HTML"
+        )
+        
+        logger.info(f"📥 Авто ID {vehicle_id} додано в чергу на зняття з групи користувачем {callback.from_user.id}")
+        
+    except Exception as e:
+        logger.error(f"❌ Помилка зняття авто з групи: {e}")
+        await callback.message.answer(
+            f"❌ <b>Помилка зняття авто з групи</b>\n\n{str(e)}",
+            parse_mode="HTML"
+        )
+
+
 @router.callback_query(F.data.startswith("toggle_status_"))
 async def toggle_vehicle_status(callback: CallbackQuery, state: FSMContext):
     """Зміна статусу авто (Наявне ↔ Продане)"""
@@ -144,7 +144,11 @@ def get_vehicle_detail_keyboard(vehicle_id: int, status: str = "available", grou
             InlineKeyboardButton(
                 text="👥 Перейти в групу",
                 url=group_link
-            )
+            ),
+            InlineKeyboardButton(
+                text="🙈 Зняти з групи",
+                callback_data=f"unpublish_vehicle_{vehicle_id}"
+            ),
         ])
     
     buttons.append([
@@ -2,7 +2,7 @@
 Модуль публікації авто в групу
 """
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from aiogram import Bot
 from aiogram.types import InputMediaPhoto, InputMediaVideo, InlineKeyboardMarkup, InlineKeyboardButton
 
@@ -35,77 +35,107 @@ class GroupPublisher:
         Returns:
             tuple[bool, str, int]: (успіх, повідомлення, message_id)
         """
+        album_message_ids: List[int] = []
         try:
-            # Логування налаштувань для діагностики
-            logger.info(f"🔍 Налаштування групи: chat_id={self.group_chat_id}, enabled={self.group_enabled}")
-            
-            # Перевірка налаштувань групи
-            if not self.group_enabled:
-                logger.error("❌ Публікація в групу вимкнена в налаштуваннях")
-                return False, "Публікація в групу вимкнена в налаштуваннях", 0
-            
-            if not self.group_chat_id:
-                logger.error("❌ Не налаштовано GROUP_CHAT_ID в .env файлі")
-                return False, "Не налаштовано GROUP_CHAT_ID в .env файлі", 0
-            
-            # Валідація даних
-            is_valid, errors = validate_vehicle_data_for_publication(vehicle_data)
-            if not is_valid:
-                return False, f"Помилка валідації: {'; '.join(errors)}", 0
-            
-            # Отримуємо фото
-            photos = vehicle_data.get('photos', [])
-            if not photos:
-                return False, "Немає фото для публікації", 0
-            
-            # Отримуємо ID топіку з налаштувань
-            vehicle_type = vehicle_data.get('vehicle_type')
-            
-            # Перекладаємо українську назву на англійську для отримання топіку
-            from ..shared.translations import reverse_translate_field_value
-            english_vehicle_type = reverse_translate_field_value('vehicle_type', vehicle_type)
-            topic_id = settings.get_topic_id_for_vehicle_type(english_vehicle_type)
-            
-            logger.info(f"🔍 Публікація: vehicle_type='{vehicle_type}' -> english='{english_vehicle_type}' -> topic_id={topic_id}")
-            
-            # Форматуємо картку
-            card_text = format_group_vehicle_card(vehicle_data)
-            
-            # Створюємо медіагрупу
-            media_group = self._create_media_group(photos, card_text)
+            error, topic_id, media_group = self.prepare_publication(vehicle_data)
+            if error:
+                return False, error, 0
             
             # Відправляємо медіагрупу
-            media_messages = await self.bot.send_media_group(
-                chat_id=self.group_chat_id,
-                media=media_group,
-                message_thread_id=topic_id
-            )
-            
-            if not media_messages:
+            album_message_ids = await self.send_album(media_group, topic_id)
+            if not album_message_ids:
                 return False, "Не вдалося відправити медіагрупу", 0
             
             # Отримуємо ID першого повідомлення з медіагрупи
-            first_message_id = media_messages[0].message_id
-            
-            # Створюємо кнопку "Написати нам"
-            keyboard = get_group_publication_keyboard()
+            first_message_id = album_message_ids[0]
             
             # Відправляємо текст з кнопкою як відповідь на перше повідомлення
-            await self.bot.send_message(
-                chat_id=self.group_chat_id,
-                text="💬 Є питання? Зв'яжіться з нами!",
-                reply_to_message_id=first_message_id,
-                reply_markup=keyboard,
-                message_thread_id=topic_id
-            )
+            await self.send_reply(first_message_id, topic_id)
             
             logger.info(f"✅ Авто опубліковано в групу {self.group_chat_id}, топік {topic_id}")
             return True, f"Авто успішно опубліковано в групу!", first_message_id
             
         except Exception as e:
             logger.error(f"❌ Помилка публікації в групу: {e}", exc_info=True)
+            # Не залишаємо в групі медіагрупу без кнопки зв'язку
+            if album_message_ids:
+                await self.delete_messages(album_message_ids)
             return False, f"Помилка публікації: {str(e)}", 0
     
+    def prepare_publication(self, vehicle_data: Dict[str, Any]) -> tuple[Optional[str], int, List]:
+        """
+        Перевірити налаштування та дані і підготувати медіагрупу
+        
+        Returns:
+            tuple[Optional[str], int, List]: (помилка або None, topic_id, медіагрупа)
+        """
+        # Логування налаштувань для діагностики
+        logger.info(f"🔍 Налаштування групи: chat_id={self.group_chat_id}, enabled={self.group_enabled}")
+        
+        # Перевірка налаштувань групи
+        if not self.group_enabled:
+            logger.error("❌ Публікація в групу вимкнена в налаштуваннях")
+            return "Публікація в групу вимкнена в налаштуваннях", 0, []
+        
+        if not self.group_chat_id:
+            logger.error("❌ Не налаштовано GROUP_CHAT_ID в .env файлі")
+            return "Не налаштовано GROUP_CHAT_ID в .env файлі", 0, []
+        
+        # Валідація даних
+        is_valid, errors = validate_vehicle_data_for_publication(vehicle_data)
+        if not is_valid:
+            return f"Помилка валідації: {'; '.join(errors)}", 0, []
+        
+        # Отримуємо фото
+        photos = vehicle_data.get('photos', [])
+        if not photos:
+            return "Немає фото для публікації", 0, []
+        
+        # Отримуємо ID топіку з налаштувань
+        vehicle_type = vehicle_data.get('vehicle_type')
+        
+        # Перекладаємо українську назву на англійську для отримання топіку
+        from ..shared.translations import reverse_translate_field_value
+        english_vehicle_type = reverse_translate_field_value('vehicle_type', vehicle_type)
+        topic_id = settings.get_topic_id_for_vehicle_type(english_vehicle_type)
+        
+        logger.info(f"🔍 Публікація: vehicle_type='{vehicle_type}' -> english='{english_vehicle_type}' -> topic_id={topic_id}")
+        
+        # Форматуємо картку та створюємо медіагрупу
+        card_text = format_group_vehicle_card(vehicle_data)
+        return None, topic_id, self._create_media_group(photos, card_text)
+    
+    async def send_album(self, media_group: List, topic_id: int) -> List[int]:
+        """Відправити медіагрупу та повернути ID її повідомлень"""
+        media_messages = await self.bot.send_media_group(
+            chat_id=self.group_chat_id,
+            media=media_group,
+            message_thread_id=topic_id
+        )
+        return [msg.message_id for msg in media_messages or []]
+    
+    async def send_reply(self, first_message_id: int, topic_id: int) -> int:
+        """Відправити повідомлення з кнопкою "Написати нам" у відповідь на медіагрупу"""
+        message = await self.bot.send_message(
+            chat_id=self.group_chat_id,
+            text="💬 Є питання? Зв'яжіться з нами!",
+            reply_to_message_id=first_message_id,
+            reply_markup=get_group_publication_keyboard(),
+            message_thread_id=topic_id
+        )
+        return message.message_id
+    
+    async def delete_messages(self, message_ids: List[int]) -> int:
+        """Видалити повідомлення публікації з групи, повертає кількість видалених"""
+        deleted = 0
+        for message_id in message_ids:
+            try:
+                await self.bot.delete_message(chat_id=self.group_chat_id, message_id=message_id)
+                deleted += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Не вдалося видалити повідомлення {message_id} з групи: {e}")
+        return deleted
+    
     def _create_media_group(self, photos: List[str], caption: str) -> List:
         """Створення медіагрупи з фото/відео із збереженим префіксом video:."""
         media_group: List = []
@@ -160,3 +190,32 @@ async def create_group_publisher(bot: Bot) -> GroupPublisher:
     """Створення екземпляру GroupPublisher"""
     return GroupPublisher(bot)
 
+
+def vehicle_to_publication_data(vehicle) -> Dict[str, Any]:
+    """Конвертувати VehicleModel у словник для публікації в групу"""
+    from ..shared.translations import translate_field_value
+    
+    return {
+        'vehicle_id': vehicle.id,
+        'vehicle_type': translate_field_value('vehicle_type', vehicle.vehicle_type.value) if vehicle.vehicle_type else None,
+        'brand': vehicle.brand,
+        'model': vehicle.model,
+        'vin_code': vehicle.vin_code,
+        'body_type': vehicle.body_type,
+        'year': vehicle.year,
+        'condition': translate_field_value('condition', vehicle.condition.value) if vehicle.condition else None,
+        'price': vehicle.price,
+        'mileage': vehicle.mileage,
+        'fuel_type': translate_field_value('fuel_type', vehicle.fuel_type) if vehicle.fuel_type else None,
+        'engine_volume': vehicle.engine_volume,
+        'power_hp': vehicle.power_hp,
+        'transmission': translate_field_value('transmission', vehicle.transmission) if vehicle.transmission else None,
+        'wheel_radius': vehicle.wheel_radius,
+        'load_capacity': vehicle.load_capacity,
+        'total_weight': vehicle.total_weight,
+        'cargo_dimensions': vehicle.cargo_dimensions,
+        'location': vehicle.location,
+        'description': vehicle.description,
+        'photos': vehicle.photos
+    }
+
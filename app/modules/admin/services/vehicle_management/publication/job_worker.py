@@ -0,0 +1,293 @@
+"""
+Фоновий обробник черги публікацій авто в групу
+
+Задачі зберігаються в таблиці publication_jobs, тому переживають перезапуск бота.
+Пара "медіагрупа + відповідь з кнопкою" відправляється ідемпотентно: ID вже
+відправлених повідомлень фіксуються в задачі, і повтор продовжує з місця збою.
+"""
+import asyncio
+import html
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.config.settings import settings
+from app.modules.database.manager import db_manager
+from app.services.notifications import notification_service
+from app.utils.formatting import get_default_parse_mode
+from .group_publisher import GroupPublisher, vehicle_to_publication_data
+
+logger = logging.getLogger(__name__)
+
+JOB_ACTIONS = ("publish", "republish", "unpublish")
+
+
+class PermanentPublicationError(Exception):
+    """Помилка, яку не має сенсу повторювати (валідація, налаштування)"""
+
+
+class PublicationWorker:
+    """Послідовно виконує задачі публікації з експоненційною затримкою повторів"""
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_base: float = 5.0,
+        backoff_max: float = 600.0,
+        send_interval: float = 3.0,
+        poll_interval: float = 30.0,
+        progress_every: int = 10,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.send_interval = send_interval
+        self.poll_interval = poll_interval
+        self.progress_every = progress_every
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._stopping = False
+        # Прогрес по адміністраторах: telegram_id -> лічильники
+        self._progress: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, bot: Bot) -> None:
+        """Запустити обробку черги"""
+        if self.is_running:
+            return
+        self._bot = bot
+        self._stopping = False
+        self._wake_event = asyncio.Event()
+        restored = await db_manager.reset_stale_publication_jobs()
+        if restored:
+            logger.info(f"🔄 Повернуто в чергу {restored} перерваних задач публікації")
+        self._task = asyncio.create_task(self._run_loop(), name="publication_worker")
+        logger.info("📤 Обробник черги публікацій запущено")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Зупинити обробку після завершення поточної задачі"""
+        if not self.is_running:
+            return
+        self._stopping = True
+        self.wake()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        logger.info("📤 Обробник черги публікацій зупинено")
+
+    def wake(self) -> None:
+        """Розбудити обробник після додавання нової задачі"""
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def enqueue(self, vehicle_id: int, action: str, requested_by: int = None) -> int:
+        """Додати задачу в чергу та повернути її ID"""
+        if action not in JOB_ACTIONS:
+            raise ValueError(f"Невідома дія публікації: {action}")
+        job_id = await db_manager.enqueue_publication_job(
+            vehicle_id, action, requested_by=requested_by, max_attempts=self.max_attempts
+        )
+        self.wake()
+        return job_id
+
+    async def enqueue_many(self, items: List[tuple], requested_by: int = None) -> int:
+        """Додати пакет задач [(vehicle_id, action), ...] та повернути кількість доданих"""
+        for _, action in items:
+            if action not in JOB_ACTIONS:
+                raise ValueError(f"Невідома дія публікації: {action}")
+        added = await db_manager.enqueue_publication_jobs(
+            items, requested_by=requested_by, max_attempts=self.max_attempts
+        )
+        self.wake()
+        return added
+
+    async def _run_loop(self) -> None:
+        while not self._stopping:
+            self._wake_event.clear()
+            try:
+                job = await db_manager.claim_next_publication_job()
+            except Exception as e:
+                logger.error(f"❌ Помилка читання черги публікацій: {e}")
+                job = None
+
+            if job is None:
+                await self._wait_for_work()
+                continue
+
+            await self._process(job)
+            await asyncio.sleep(self.send_interval)
+
+    async def _wait_for_work(self) -> None:
+        timeout = self.poll_interval
+        try:
+            next_run_at = await db_manager.get_next_publication_job_time()
+        except Exception:
+            next_run_at = None
+        if next_run_at:
+            delay = (next_run_at - datetime.now()).total_seconds()
+            timeout = min(max(delay, 0.1), self.poll_interval)
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _backoff_delay(self, attempts: int) -> float:
+        return min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        publisher = GroupPublisher(self._bot)
+        job_id = job["id"]
+        logger.info(f"📤 Задача #{job_id}: {job['action']} авто {job['vehicle_id']} (спроба {job['attempts']})")
+
+        try:
+            if job["action"] == "unpublish":
+                await self._unpublish(job, publisher)
+            else:
+                await self._publish(job, publisher)
+        except Exception as e:
+            await self._handle_failure(job, publisher, e)
+            return
+
+        logger.info(f"✅ Задача #{job_id} виконана")
+        await self._track_progress(job, success=True)
+
+    async def _publish(self, job: Dict[str, Any], publisher: GroupPublisher) -> None:
+        vehicle = await db_manager.get_vehicle_by_id(job["vehicle_id"])
+        if not vehicle:
+            raise PermanentPublicationError("Авто не знайдено в базі даних")
+
+        album_ids: List[int] = job["album_message_ids"]
+        reply_id: Optional[int] = job["reply_message_id"]
+
+        error, topic_id, media_group = publisher.prepare_publication(vehicle_to_publication_data(vehicle))
+        if error:
+            raise PermanentPublicationError(error)
+
+        if not album_ids:
+            album_ids = await publisher.send_album(media_group, topic_id)
+            if not album_ids:
+                raise RuntimeError("Не вдалося відправити медіагрупу")
+            await db_manager.save_publication_job_progress(job["id"], album_ids, None)
+            job["album_message_ids"] = album_ids
+
+        if not reply_id:
+            reply_id = await publisher.send_reply(album_ids[0], topic_id)
+            await db_manager.save_publication_job_progress(job["id"], album_ids, reply_id)
+            job["reply_message_id"] = reply_id
+
+        # Перепублікація: попередній пост прибираємо лише після відправки нового
+        if job["action"] == "republish":
+            old_ids = await db_manager.get_last_publication_messages(vehicle.id)
+            if not old_ids and vehicle.group_message_id and vehicle.group_message_id not in album_ids:
+                old_ids = [vehicle.group_message_id]
+            if old_ids:
+                await publisher.delete_messages(old_ids)
+
+        await db_manager.complete_publication_job(
+            job["id"],
+            vehicle.id,
+            {
+                "published_in_group": True,
+                "published_at": datetime.now(),
+                "group_message_id": album_ids[0],
+            },
+        )
+
+    async def _unpublish(self, job: Dict[str, Any], publisher: GroupPublisher) -> None:
+        vehicle = await db_manager.get_vehicle_by_id(job["vehicle_id"])
+        message_ids = await db_manager.get_last_publication_messages(job["vehicle_id"])
+        if not message_ids and vehicle and vehicle.group_message_id:
+            message_ids = [vehicle.group_message_id]
+        if message_ids:
+            await publisher.delete_messages(message_ids)
+
+        await db_manager.complete_publication_job(
+            job["id"],
+            job["vehicle_id"],
+            {"published_in_group": False, "group_message_id": None},
+        )
+
+    async def _handle_failure(self, job: Dict[str, Any], publisher: GroupPublisher, error: Exception) -> None:
+        job_id = job["id"]
+        permanent = isinstance(error, PermanentPublicationError)
+        max_attempts = job.get("max_attempts") or self.max_attempts
+
+        if not permanent and job["attempts"] < max_attempts:
+            if isinstance(error, TelegramRetryAfter):
+                delay = float(error.retry_after)
+            else:
+                delay = self._backoff_delay(job["attempts"])
+            retry_at = datetime.now() + timedelta(seconds=delay)
+            logger.warning(f"⚠️ Задача #{job_id} не вдалася ({error}), повтор через {delay:.0f} с")
+            await db_manager.fail_publication_job(job_id, str(error), retry_at)
+            return
+
+        # Остаточна помилка: не залишаємо в групі медіагрупу без кнопки
+        if job["action"] != "unpublish" and job.get("album_message_ids"):
+            orphan_ids = list(job["album_message_ids"])
+            if job.get("reply_message_id"):
+                orphan_ids.append(job["reply_message_id"])
+            await publisher.delete_messages(orphan_ids)
+            await db_manager.save_publication_job_progress(job_id, None, None)
+            # Попередній пост перепублікації видаляється одразу після відповіді з кнопкою,
+            # тож у групі не лишилось нічого - знімаємо позначку публікації
+            if job["action"] == "republish" and job.get("reply_message_id"):
+                await db_manager.update_vehicle(
+                    job["vehicle_id"], {"published_in_group": False, "group_message_id": None}
+                )
+
+        logger.error(f"❌ Задача #{job_id} остаточно не виконана: {error}")
+        await db_manager.fail_publication_job(job_id, str(error), None)
+        await self._track_progress(job, success=False, error=str(error))
+
+    async def _track_progress(self, job: Dict[str, Any], success: bool, error: str = None) -> None:
+        admin_id = job.get("requested_by")
+        if not admin_id or self._bot is None:
+            return
+
+        progress = self._progress.setdefault(admin_id, {"done": 0, "failed": 0, "errors": []})
+        if success:
+            progress["done"] += 1
+        else:
+            progress["failed"] += 1
+            progress["errors"].append(f"#{job['vehicle_id']}: {html.escape(str(error))}")
+
+        remaining = await db_manager.count_active_publication_jobs(admin_id)
+        processed = progress["done"] + progress["failed"]
+        if remaining and processed % self.progress_every:
+            return
+
+        text = (
+            f"📤 <b>Черга публікацій</b>\n\n"
+            f"✅ Виконано: {progress['done']}\n"
+            f"❌ Помилок: {progress['failed']}\n"
+            f"⏳ Залишилось: {remaining}"
+        )
+        if progress["errors"]:
+            text += "\n\n<b>Помилки:</b>\n" + "\n".join(progress["errors"][-5:])
+
+        notification_service.fan_out(
+            self._bot,
+            [admin_id],
+            text,
+            name="publication_progress",
+            parse_mode=get_default_parse_mode(),
+        )
+        if not remaining:
+            self._progress.pop(admin_id, None)
+
+
+# Глобальний обробник черги публікацій
+publication_worker = PublicationWorker(
+    max_attempts=settings.publication_max_attempts,
+    backoff_base=settings.publication_backoff_base,
+    send_interval=settings.publication_send_interval,
+)
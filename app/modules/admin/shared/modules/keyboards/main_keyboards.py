@@ -61,6 +61,10 @@ def get_admin_vehicles_keyboard() -> InlineKeyboardMarkup:
                 text="🔍 Швидкий пошук", 
                 callback_data="admin_quick_search"
             ),
+            InlineKeyboardButton(
+                text="🧰 Масові дії", 
+                callback_data="bulk_vehicles"
+            ),
         ],
         [
             InlineKeyboardButton(
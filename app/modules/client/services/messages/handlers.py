@@ -9,6 +9,7 @@ from aiogram.fsm.context import FSMContext
 
 from app.utils.formatting import get_default_parse_mode
 from app.modules.database.manager import db_manager
+from app.services.notifications import notification_service
 from .states import MessageStates
 
 logger = logging.getLogger(__name__)
@@ -152,44 +153,10 @@ async def process_request_details(message: Message, state: FSMContext):
         await state.clear()
         return
     
-    # Отримуємо всіх адміністраторів
-    admins = await db_manager.get_admins()
-    logger.info(f"📊 Знайдено {len(admins)} адміністраторів для сповіщення")
-    
-    # Відправляємо сповіщення адміністраторам
-    for admin in admins:
-        try:
-            admin_text = f"""
-🔔 <b>Нова заявка від клієнта</b>
-
-👤 <b>Клієнт:</b>
-• Ім'я: {user.first_name or '—'} {user.last_name or ''}
-• Телефон: {user.phone or '—'}
-• Telegram ID: <code>{user.telegram_id}</code>
-
-📝 <b>Опис потреби:</b>
-{request_text}
-
-<b>Тип:</b> Загальна заявка
-"""
-            
-            await message.bot.send_message(
-                admin.telegram_id,
-                admin_text.strip(),
-                reply_markup=InlineKeyboardMarkup(
-                    inline_keyboard=[
-                        [InlineKeyboardButton(text="📨 Перейти до заявок", callback_data="admin_requests")]
-                    ]
-                ),
-                parse_mode=get_default_parse_mode(),
-            )
-        except Exception as e:
-            logger.error(f"Не вдалося відправити сповіщення адміну {admin.telegram_id}: {e}")
-    
     await state.clear()
     logger.info(f"🧹 Стан FSM очищено для користувача {message.from_user.id}")
     
-    # Підтвердження для користувача
+    # Підтвердження для користувача (не чекаємо доставки адміністраторам)
     text = """
 ✅ <b>Заявку успішно відправлено!</b>
 
@@ -214,4 +181,35 @@ async def process_request_details(message: Message, state: FSMContext):
         parse_mode=get_default_parse_mode(),
     )
     
+    # Отримуємо всіх адміністраторів
+    admins = await db_manager.get_admins()
+    logger.info(f"📊 Знайдено {len(admins)} адміністраторів для сповіщення")
+    
+    # Сповіщення адміністраторам відправляються у фоні
+    admin_text = f"""
+🔔 <b>Нова заявка від клієнта</b>
+
+👤 <b>Клієнт:</b>
+• Ім'я: {user.first_name or '—'} {user.last_name or ''}
+• Телефон: {user.phone or '—'}
+• Telegram ID: <code>{user.telegram_id}</code>
+
+📝 <b>Опис потреби:</b>
+{request_text}
+
+<b>Тип:</b> Загальна заявка
+"""
+    notification_service.fan_out(
+        message.bot,
+        [admin.telegram_id for admin in admins],
+        admin_text.strip(),
+        name="manager_request",
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="📨 Перейти до заявок", callback_data="admin_requests")]
+            ]
+        ),
+        parse_mode=get_default_parse_mode(),
+    )
+    
     logger.info(f"✅ Обробка заявки завершена для користувача {message.from_user.id}")
@@ -8,7 +8,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from . import advanced_search_router as router
-from app.modules.database.manager import DatabaseManager
+from app.modules.database.manager import DatabaseManager, PRICE_BUCKETS
 from ..quick_search.handlers import show_vehicle_card_message
 
 logger = logging.getLogger(__name__)
@@ -178,6 +178,16 @@ async def client_price_start(callback: CallbackQuery, state: FSMContext):
 Введіть мінімальну вартість, $:
 
 <i>Наприклад: 10000</i>"""
+    # Розподіл доступних авто за ціною (зі знімка лічильників, без запиту до vehicles)
+    try:
+        price_counts = (await db_manager.get_vehicle_facets()).get("price_bucket", {})
+    except Exception:
+        price_counts = {}
+    distribution = [
+        f"• ${name}: {price_counts[name]}" for _, name in PRICE_BUCKETS if price_counts.get(name)
+    ]
+    if distribution:
+        text += "\n\n📊 <b>Зараз у каталозі:</b>\n" + "\n".join(distribution)
     keyboard = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="🔙 Назад", callback_data="client_search")]])
     await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
     await state.set_state(ClientSearchStates.waiting_for_price_from)
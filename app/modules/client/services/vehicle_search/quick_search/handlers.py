@@ -4,8 +4,11 @@ from aiogram.types import CallbackQuery, Message, InlineKeyboardMarkup, InlineKe
 from aiogram.fsm.context import FSMContext
 
 from app.utils.formatting import get_default_parse_mode
+from app.utils.message_editor import message_editor
+from app.utils.navigation import navigation_coalescer
 from app.modules.client.services.authentication.registration.keyboards import get_main_menu_inline_keyboard
 from app.modules.database.manager import db_manager
+from app.services.notifications import notification_service
 from .formatters import format_client_vehicle_card
 from .states import ClientSearchStates
 from . import quick_search_router as router
@@ -20,16 +23,38 @@ CATALOG_GROUPS = {
     "container_carriers": ["container_carrier", "trailer"],
 }
 
-def get_catalog_type_keyboard() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="🚍 Вантажні фургони та рефрижератори", callback_data="client_catalog_type_vans_and_refrigerators")],
-            [InlineKeyboardButton(text="🚚 Контейнеровози (з причепами)", callback_data="client_catalog_type_container_carriers")],
-            [InlineKeyboardButton(text="🚛 Сідельні тягачі та напівпричепи", callback_data="client_catalog_type_tractors_and_semi")],
-            [InlineKeyboardButton(text="🚞 Змінні кузови", callback_data="client_catalog_type_variable_body")],
-            [InlineKeyboardButton(text="🔙 Назад", callback_data="client_catalog_menu")],
-        ]
-    )
+# Порядок і підписи кнопок категорій
+CATALOG_GROUP_TITLES = {
+    "vans_and_refrigerators": "🚍 Вантажні фургони та рефрижератори",
+    "container_carriers": "🚚 Контейнеровози (з причепами)",
+    "tractors_and_semi": "🚛 Сідельні тягачі та напівпричепи",
+    "variable_body": "🚞 Змінні кузови",
+}
+
+CONDITION_TITLES = {"new": "нових", "used": "вживаних"}
+
+
+def get_catalog_group_counts(facets: dict) -> dict:
+    """Кількість доступних авто в кожній категорії CATALOG_GROUPS"""
+    type_counts = facets.get("vehicle_type", {})
+    return {
+        group_key: sum(type_counts.get(vehicle_type, 0) for vehicle_type in types)
+        for group_key, types in CATALOG_GROUPS.items()
+    }
+
+
+def get_catalog_type_keyboard(group_counts: dict = None) -> InlineKeyboardMarkup:
+    """Кнопки категорій; з лічильниками - порожні категорії приховуються"""
+    rows = []
+    for group_key, title in CATALOG_GROUP_TITLES.items():
+        if group_counts is not None:
+            count = group_counts.get(group_key, 0)
+            if not count:
+                continue
+            title = f"{title} ({count})"
+        rows.append([InlineKeyboardButton(text=title, callback_data=f"client_catalog_type_{group_key}")])
+    rows.append([InlineKeyboardButton(text="🔙 Назад", callback_data="client_catalog_menu")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 @router.callback_query(F.data == "client_catalog_menu")
 async def show_catalog_menu(callback: CallbackQuery, state: FSMContext):
@@ -37,13 +62,21 @@ async def show_catalog_menu(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
     await state.clear()
     try:
-        total = await db_manager.get_available_vehicles_count()
+        facets = await db_manager.get_vehicle_facets()
     except Exception:
-        total = 0
+        facets = {}
+    total = facets.get("total", {}).get("all", 0)
+    by_condition = ", ".join(
+        f"{title}: {facets['condition'][condition]}"
+        for condition, title in CONDITION_TITLES.items()
+        if facets.get("condition", {}).get(condition)
+    )
     
     text = (
         "🚛 <b>Каталог авто</b>\n\n"
-        f"Доступно авто: <b>{total}</b>\n\n"
+        f"Доступно авто: <b>{total}</b>"
+        + (f" ({by_condition})" if by_condition else "")
+        + "\n\n"
         "📖 <b>Як користуватися:</b>\n\n"
         "<b>Варіант 1 - Всі авто:</b>\n"
         "• Натисніть <b>\"📋 Всі авто\"</b> для перегляду всіх доступних авто\n"
@@ -78,14 +111,21 @@ async def client_catalog_select_type(callback: CallbackQuery, state: FSMContext)
     """Показати вибір категорії перед переглядом усіх авто"""
     await callback.answer()
     await state.clear()
-    text = (
-        "📋 <b>Всі авто</b>\n\n"
-        "Оберіть категорію, щоб переглядати лише відповідні авто."
-    )
+    try:
+        group_counts = get_catalog_group_counts(await db_manager.get_vehicle_facets())
+    except Exception:
+        group_counts = None
+    if group_counts is not None and not any(group_counts.values()):
+        text = "📋 <b>Всі авто</b>\n\n❌ Наразі немає доступних авто."
+    else:
+        text = (
+            "📋 <b>Всі авто</b>\n\n"
+            "Оберіть категорію, щоб переглядати лише відповідні авто."
+        )
     try:
         await callback.message.edit_text(
             text,
-            reply_markup=get_catalog_type_keyboard(),
+            reply_markup=get_catalog_type_keyboard(group_counts),
             parse_mode=get_default_parse_mode(),
         )
     except Exception:
@@ -95,7 +135,7 @@ async def client_catalog_select_type(callback: CallbackQuery, state: FSMContext)
             pass
         await callback.message.answer(
             text,
-            reply_markup=get_catalog_type_keyboard(),
+            reply_markup=get_catalog_type_keyboard(group_counts),
             parse_mode=get_default_parse_mode(),
         )
 
@@ -111,6 +151,8 @@ async def client_catalog_by_type(callback: CallbackQuery, state: FSMContext):
     group_key = callback.data.replace("client_catalog_type_", "")
     types = _group_key_to_types(group_key)
 
+    # Лічильники в меню - знімок з TTL; авто, додані іншим процесом, у ньому ще не видно,
+    # тому список завжди беремо з БД (запит за індексом, навіть для порожньої категорії)
     vehicles = await db_manager.get_available_vehicles_by_types(types, limit=50)
 
     if not vehicles:
@@ -264,33 +306,15 @@ async def show_vehicle_card(
     # Отримуємо клавіатуру з group_message_id
     keyboard = get_vehicle_card_keyboard(vehicle.id, is_first, is_last, is_saved, group_message_id)
 
-    # Відправляємо картку
+    # Відправляємо картку (без змін - без запиту; лише підпис - edit_caption)
     if photo_file_id:
-        try:
-            # Визначаємо тип: video:... чи звичайне фото
-            is_video = isinstance(photo_file_id, str) and photo_file_id.startswith("video:")
-            file_id = photo_file_id.split(":", 1)[1] if is_video else photo_file_id
-            if is_video:
-                from aiogram.types import InputMediaVideo
-                await callback.message.edit_media(
-                    media=InputMediaVideo(
-                        media=file_id,
-                        caption=text,
-                        parse_mode=get_default_parse_mode()
-                    ),
-                    reply_markup=keyboard
-                )
-            else:
-                from aiogram.types import InputMediaPhoto
-                await callback.message.edit_media(
-                    media=InputMediaPhoto(
-                        media=file_id,
-                        caption=text,
-                        parse_mode=get_default_parse_mode()
-                    ),
-                    reply_markup=keyboard
-                )
-        except Exception:
+        # Визначаємо тип: video:... чи звичайне фото
+        is_video = isinstance(photo_file_id, str) and photo_file_id.startswith("video:")
+        file_id = photo_file_id.split(":", 1)[1] if is_video else photo_file_id
+        edited = await message_editor.edit_media(
+            callback.message, "video" if is_video else "photo", file_id, text, keyboard
+        )
+        if not edited:
             # Якщо не вдалось - видаляємо і створюємо нове
             try:
                 await callback.message.delete()
@@ -312,13 +336,7 @@ async def show_vehicle_card(
                 )
     else:
         # Без фото - просто текст
-        try:
-            await callback.message.edit_text(
-                text,
-                reply_markup=keyboard,
-                parse_mode=get_default_parse_mode()
-            )
-        except Exception:
+        if not await message_editor.edit_text(callback.message, text, keyboard):
             # Якщо не вдалось редагувати - видаляємо і створюємо нове
             try:
                 await callback.message.delete()
@@ -474,6 +492,7 @@ async def quick_search(callback: CallbackQuery, state: FSMContext):
 async def prev_vehicle(callback: CallbackQuery, state: FSMContext):
     """Попереднє авто"""
     await callback.answer()
+    nav = navigation_coalescer.begin(callback.message)
     
     data = await state.get_data()
     vehicles = data.get("all_vehicles", [])
@@ -486,15 +505,22 @@ async def prev_vehicle(callback: CallbackQuery, state: FSMContext):
     new_index = current_index - 1
     await state.update_data(current_index=new_index)
 
-    user = await db_manager.get_user_by_telegram_id(callback.from_user.id)
-    user_id = user.id if user else None
-    await show_vehicle_card(callback, vehicles[new_index], new_index, len(vehicles), user_id)
+    # При швидких натисканнях малюємо лише останню картку
+    async with nav as is_latest:
+        if not is_latest:
+            return
+        user = await db_manager.get_user_by_telegram_id(callback.from_user.id)
+        user_id = user.id if user else None
+        if nav.superseded:
+            return
+        await show_vehicle_card(callback, vehicles[new_index], new_index, len(vehicles), user_id)
 
 
 @router.callback_query(F.data.startswith("next_vehicle_"))
 async def next_vehicle(callback: CallbackQuery, state: FSMContext):
     """Наступне авто"""
     await callback.answer()
+    nav = navigation_coalescer.begin(callback.message)
     
     data = await state.get_data()
     vehicles = data.get("all_vehicles", [])
@@ -507,9 +533,15 @@ async def next_vehicle(callback: CallbackQuery, state: FSMContext):
     new_index = current_index + 1
     await state.update_data(current_index=new_index)
 
-    user = await db_manager.get_user_by_telegram_id(callback.from_user.id)
-    user_id = user.id if user else None
-    await show_vehicle_card(callback, vehicles[new_index], new_index, len(vehicles), user_id)
+    # При швидких натисканнях малюємо лише останню картку
+    async with nav as is_latest:
+        if not is_latest:
+            return
+        user = await db_manager.get_user_by_telegram_id(callback.from_user.id)
+        user_id = user.id if user else None
+        if nav.superseded:
+            return
+        await show_vehicle_card(callback, vehicles[new_index], new_index, len(vehicles), user_id)
 
 
 @router.callback_query(F.data.startswith("favorite_vehicle_"))
@@ -754,15 +786,6 @@ async def process_application_details(message: Message, state: FSMContext):
         f"💬 <b>Повідомлення:</b>\n{message.text or ''}"
     )
     
-    # Надсилаємо повідомлення всім адміністраторам без порушення станів
-    for admin_id in settings.get_admin_ids():
-        try:
-            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-            kb = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="Перейти до заявок", callback_data="admin_requests")]])
-            await message.bot.send_message(admin_id, admin_message, reply_markup=kb, parse_mode=get_default_parse_mode())
-        except Exception:
-            pass
-    
     # Підтверджуємо користувачу
     await message.answer(
         "✅ <b>Заявку надіслано!</b>\n\n"
@@ -773,3 +796,15 @@ async def process_application_details(message: Message, state: FSMContext):
     )
     
     await state.clear()
+    
+    # Надсилаємо повідомлення всім адміністраторам у фоні без порушення станів
+    notification_service.fan_out(
+        message.bot,
+        settings.get_admin_ids(),
+        admin_message,
+        name="vehicle_application",
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[[InlineKeyboardButton(text="Перейти до заявок", callback_data="admin_requests")]]
+        ),
+        parse_mode=get_default_parse_mode(),
+    )
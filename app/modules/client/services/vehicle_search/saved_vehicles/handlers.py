@@ -11,6 +11,8 @@ from aiogram.fsm.context import FSMContext
 from app.modules.database.manager import db_manager
 from app.modules.database.models import VehicleModel
 from app.utils.formatting import get_default_parse_mode
+from app.utils.message_editor import message_editor
+from app.utils.navigation import navigation_coalescer
 from ..quick_search.formatters import format_client_vehicle_card
 from .keyboards import get_saved_vehicle_card_keyboard, get_empty_saved_keyboard
 
@@ -168,14 +170,9 @@ async def render_saved_vehicle_card(message: Message, vehicle, index: int, total
         file_id = photo_file_id.split(":", 1)[1] if is_video else photo_file_id
         media_type = "video" if is_video else "photo"
         
-        try:
-            await message.edit_media(
-                media={"type": media_type, "media": file_id, "caption": card_text, "parse_mode": get_default_parse_mode()},
-                reply_markup=keyboard
-            )
-        except Exception as e:
+        if not await message_editor.edit_media(message, media_type, file_id, card_text, keyboard):
             # Якщо не вдалося edit_media, видаляємо і створюємо нове
-            logger.warning(f"Не вдалося edit_media: {e}")
+            logger.warning(f"Не вдалося edit_media для збереженого авто {vehicle.id}")
             await message.delete()
             
             if is_video:
@@ -212,14 +209,8 @@ async def render_saved_vehicle_card(message: Message, vehicle, index: int, total
                     )
     else:
         # Без фото
-        try:
-            await message.edit_text(
-                card_text,
-                reply_markup=keyboard,
-                parse_mode=get_default_parse_mode(),
-            )
-        except Exception as e:
-            logger.warning(f"Не вдалося edit_text: {e}")
+        if not await message_editor.edit_text(message, card_text, keyboard):
+            logger.warning(f"Не вдалося edit_text для збереженого авто {vehicle.id}")
             await message.delete()
             await message.answer(
                 card_text,
@@ -232,6 +223,7 @@ async def render_saved_vehicle_card(message: Message, vehicle, index: int, total
 async def prev_saved_vehicle(callback: CallbackQuery, state: FSMContext):
     """Попереднє збережене авто"""
     await callback.answer()
+    nav = navigation_coalescer.begin(callback.message)
     
     data = await state.get_data()
     saved_ids = data.get("saved_vehicles", [])
@@ -241,9 +233,15 @@ async def prev_saved_vehicle(callback: CallbackQuery, state: FSMContext):
         new_index = current_index - 1
         await state.update_data(current_saved_index=new_index)
         
-        # Отримуємо авто з БД
-        vehicle = await db_manager.get_vehicle_by_id(saved_ids[new_index])
-        await render_saved_vehicle_card(callback.message, vehicle, new_index, len(saved_ids), state)
+        # При швидких натисканнях малюємо лише останню картку
+        async with nav as is_latest:
+            if not is_latest:
+                return
+            # Отримуємо авто з БД
+            vehicle = await db_manager.get_vehicle_by_id(saved_ids[new_index])
+            if nav.superseded:
+                return
+            await render_saved_vehicle_card(callback.message, vehicle, new_index, len(saved_ids), state)
     else:
         await callback.answer("⚠️ Це перший автомобіль у списку", show_alert=True)
 
@@ -252,6 +250,7 @@ async def prev_saved_vehicle(callback: CallbackQuery, state: FSMContext):
 async def next_saved_vehicle(callback: CallbackQuery, state: FSMContext):
     """Наступне збережене авто"""
     await callback.answer()
+    nav = navigation_coalescer.begin(callback.message)
     
     data = await state.get_data()
     saved_ids = data.get("saved_vehicles", [])
@@ -261,9 +260,15 @@ async def next_saved_vehicle(callback: CallbackQuery, state: FSMContext):
         new_index = current_index + 1
         await state.update_data(current_saved_index=new_index)
         
-        # Отримуємо авто з БД
-        vehicle = await db_manager.get_vehicle_by_id(saved_ids[new_index])
-        await render_saved_vehicle_card(callback.message, vehicle, new_index, len(saved_ids), state)
+        # При швидких натисканнях малюємо лише останню картку
+        async with nav as is_latest:
+            if not is_latest:
+                return
+            # Отримуємо авто з БД
+            vehicle = await db_manager.get_vehicle_by_id(saved_ids[new_index])
+            if nav.superseded:
+                return
+            await render_saved_vehicle_card(callback.message, vehicle, new_index, len(saved_ids), state)
     else:
         await callback.answer("⚠️ Це останній автомобіль у списку", show_alert=True)
 
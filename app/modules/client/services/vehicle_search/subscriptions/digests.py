@@ -0,0 +1,312 @@
+"""
+Доставка сповіщень підписок дайджестами
+
+Збіги нових авто з підписками не надсилаються одразу, а стають у чергу
+pending_notifications з часом доставки за режимом підписки (digest_mode):
+- instant - через SUBSCRIPTION_INSTANT_DELAY секунд, щоб масове додавання авто
+  прийшло одним повідомленням
+- hourly - на початку наступної години
+- daily - щодня о SUBSCRIPTION_DIGEST_HOUR
+
+SubscriptionDigestSender забирає сповіщення, час яких настав, і надсилає кожному
+користувачу одне повідомлення з усіма авто. Авто, що збіглося з кількома
+підписками, показується один раз; продані та видалені за цей час авто пропускаються.
+"""
+import asyncio
+import html
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from app.config.settings import settings
+from app.modules.database.manager import db_manager
+from app.modules.database.models import VehicleStatus
+from app.monitoring.metrics import subscription_messages_total
+from app.utils.formatting import get_default_parse_mode
+
+logger = logging.getLogger(__name__)
+
+# Режим доставки -> назва для користувача
+DIGEST_MODES = {
+    "instant": "Одразу",
+    "hourly": "Щогодини",
+    "daily": "Раз на день",
+}
+
+# Мапінг для читабельного відображення типу авто
+VEHICLE_TYPE_DISPLAY = {
+    "VehicleType.CONTAINER_CARRIER": "Контейнеровоз",
+    "VehicleType.SEMI_CONTAINER_CARRIER": "Напівпричіп контейнеровоз",
+    "VehicleType.VARIABLE_BODY": "Змінний кузов",
+    "VehicleType.SADDLE_TRACTOR": "Сідельний тягач",
+    "VehicleType.TRAILER": "Причіп",
+    "VehicleType.REFRIGERATOR": "Рефрижератор",
+    "VehicleType.VAN": "Фургон",
+    "VehicleType.BUS": "Бус",
+}
+
+# Мапінг для читабельного відображення стану
+CONDITION_DISPLAY = {
+    "VehicleCondition.NEW": "Новий",
+    "VehicleCondition.USED": "Вживане",
+}
+
+
+def digest_due_at(digest_mode: Optional[str], now: Optional[datetime] = None) -> datetime:
+    """Коли доставити збіг підписки з цим режимом"""
+    now = now or datetime.now()
+    if digest_mode == "hourly":
+        return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    if digest_mode == "daily":
+        due = now.replace(hour=settings.subscription_digest_hour % 24, minute=0, second=0, microsecond=0)
+        return due if due > now else due + timedelta(days=1)
+    return now + timedelta(seconds=settings.subscription_instant_delay)
+
+
+def _subscriptions_keyboard(vehicle_buttons: List[List[InlineKeyboardButton]]) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=vehicle_buttons
+        + [[InlineKeyboardButton(text="🔔 Мої підписки", callback_data="client_subscriptions")]]
+    )
+
+
+def format_vehicle_price(price) -> str:
+    """Ціна авто для тексту сповіщення (ціну можуть не вказати)"""
+    return f"${price:,.0f}" if price is not None else "Не вказана"
+
+
+def format_vehicle_notification(subscription_name: str, vehicle) -> tuple:
+    """Повідомлення про одне нове авто: (текст, клавіатура)"""
+    vehicle_type_str = VEHICLE_TYPE_DISPLAY.get(str(vehicle.vehicle_type), vehicle.vehicle_type)
+    condition_str = CONDITION_DISPLAY.get(str(vehicle.condition), vehicle.condition)
+    # Бренд і модель вводить адміністратор - без екранування "&" або "<" ламають HTML
+
+    text = f"""
+🔔 <b>Нове авто за вашою підпискою!</b>
+
+📝 <b>Підписка:</b> {html.escape(subscription_name or 'Без назви')}
+
+🚛 <b>Авто:</b>
+• <b>Бренд:</b> {html.escape(vehicle.brand or '')}
+• <b>Модель:</b> {html.escape(vehicle.model or '')}
+• <b>Рік:</b> {vehicle.year}
+• <b>Ціна:</b> {format_vehicle_price(vehicle.price)}
+• <b>Тип:</b> {vehicle_type_str}
+• <b>Стан:</b> {condition_str}
+"""
+
+    if vehicle.mileage:
+        text += f"• <b>Пробіг:</b> {vehicle.mileage:,} км\n"
+
+    text += "\n<i>Натисніть кнопку нижче, щоб переглянути це авто!</i>"
+
+    keyboard = _subscriptions_keyboard(
+        [[InlineKeyboardButton(text="🚛 Переглянути авто", callback_data=f"client_view_vehicle_{vehicle.id}")]]
+    )
+    return text.strip(), keyboard
+
+
+def format_digest(subscription_names: List[str], vehicles: list, max_items: int) -> tuple:
+    """Дайджест з кількох авто: (текст, клавіатура)"""
+    names = ", ".join(html.escape(name or "Без назви") for name in subscription_names)
+    label = "Підписка" if len(subscription_names) == 1 else "Підписки"
+
+    lines = [
+        f"🔔 <b>Нові авто за вашими підписками: {len(vehicles)}</b>",
+        "",
+        f"📝 <b>{label}:</b> {names}",
+        "",
+    ]
+    buttons = []
+    for index, vehicle in enumerate(vehicles[:max_items], 1):
+        title = html.escape(f"{vehicle.brand} {vehicle.model}")
+        lines.append(f"{index}. <b>{title}</b>, {vehicle.year} - {format_vehicle_price(vehicle.price)}")
+        buttons.append(
+            [
+                InlineKeyboardButton(
+                    text=f"🚛 {vehicle.brand} {vehicle.model} ({vehicle.year})",
+                    callback_data=f"client_view_vehicle_{vehicle.id}",
+                )
+            ]
+        )
+    if len(vehicles) > max_items:
+        lines.append(f"… та ще {len(vehicles) - max_items} авто")
+    lines += ["", "<i>Натисніть на авто нижче, щоб переглянути його!</i>"]
+    return "\n".join(lines), _subscriptions_keyboard(buttons)
+
+
+class SubscriptionDigestSender:
+    """Надсилає чергу сповіщень підписок: одне повідомлення на користувача за прохід"""
+
+    def __init__(
+        self,
+        max_items: int = 10,
+        poll_interval: float = 60.0,
+        send_interval: float = 0.05,
+        max_attempts: int = 3,
+        batch_users: int = 50,
+    ):
+        self.max_items = max_items
+        self.poll_interval = poll_interval
+        self.send_interval = send_interval
+        self.max_attempts = max_attempts
+        self.batch_users = batch_users
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, bot: Bot) -> None:
+        """Запустити доставку черги"""
+        if self.is_running:
+            return
+        self._bot = bot
+        self._stopping = False
+        self._wake_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run_loop(), name="subscription_digests")
+        logger.info("🔔 Доставку сповіщень підписок запущено")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Зупинити після поточного повідомлення; недоставлене лишається в черзі"""
+        if not self.is_running:
+            return
+        self._stopping = True
+        self.wake()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        logger.info("🔔 Доставку сповіщень підписок зупинено")
+
+    def wake(self) -> None:
+        """Розбудити після додавання сповіщень (перерахувати час найближчої доставки)"""
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def _run_loop(self) -> None:
+        while not self._stopping:
+            self._wake_event.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Помилка доставки сповіщень підписок: {e}")
+            await self._wait_for_work()
+
+    async def _wait_for_work(self) -> None:
+        timeout = self.poll_interval
+        try:
+            next_due = await db_manager.get_next_notification_time()
+        except Exception:
+            next_due = None
+        if next_due:
+            delay = (next_due - datetime.now()).total_seconds()
+            timeout = min(max(delay, 0.1), self.poll_interval)
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def flush(self) -> int:
+        """Надіслати все, час чого настав; повертає кількість повідомлень"""
+        sent = 0
+        while not self._stopping:
+            rows = await db_manager.get_due_notifications(datetime.now(), self.batch_users)
+            if not rows:
+                break
+            by_user: Dict[int, List[dict]] = {}
+            for row in rows:
+                by_user.setdefault(row["user_id"], []).append(row)
+            for items in by_user.values():
+                if self._stopping:
+                    break
+                try:
+                    delivered = await self._deliver(items)
+                except Exception as e:
+                    # Помилка до надсилання (форматування, БД) не повинна блокувати чергу:
+                    # сповіщення відкладаються і зрештою відкидаються, як після збою Telegram
+                    delivered = await self._postpone(items, e)
+                if delivered:
+                    sent += 1
+                    await asyncio.sleep(self.send_interval)
+        if sent:
+            logger.info(f"🔔 Надіслано {sent} повідомлень за підписками")
+        return sent
+
+    async def _deliver(self, items: List[dict]) -> bool:
+        """Одне повідомлення користувачу з усіма його сповіщеннями"""
+        ids = [item["id"] for item in items]
+        telegram_id = items[0]["telegram_id"]
+        live = [item for item in items if item["subscription_active"]]
+
+        vehicles: Dict[int, object] = {}
+        for vehicle_id in dict.fromkeys(item["vehicle_id"] for item in live):
+            vehicle = await db_manager.get_vehicle_by_id(vehicle_id)
+            if vehicle and vehicle.status == VehicleStatus.AVAILABLE and vehicle.is_active:
+                vehicles[vehicle_id] = vehicle
+        subscription_names = {
+            item["subscription_id"]: item["subscription_name"] for item in live if item["vehicle_id"] in vehicles
+        }
+        vehicles = list(vehicles.values())
+
+        if not telegram_id or not vehicles:
+            # Підписку видалено, користувача немає або всі авто вже продані
+            await db_manager.complete_notifications(ids)
+            subscription_messages_total.inc(status="dropped")
+            return False
+
+        if len(vehicles) == 1:
+            text, keyboard = format_vehicle_notification(next(iter(subscription_names.values())), vehicles[0])
+        else:
+            text, keyboard = format_digest(list(subscription_names.values()), vehicles, self.max_items)
+
+        for _ in range(self.max_attempts):
+            try:
+                await self._bot.send_message(
+                    chat_id=telegram_id, text=text, reply_markup=keyboard, parse_mode=get_default_parse_mode()
+                )
+                break
+            except TelegramRetryAfter as e:
+                logger.warning(f"⏳ Ліміт Telegram для чату {telegram_id}, чекаємо {e.retry_after} с")
+                await asyncio.sleep(e.retry_after)
+            except TelegramForbiddenError:
+                # Користувач заблокував бота - повтор не допоможе
+                await db_manager.complete_notifications(ids)
+                subscription_messages_total.inc(status="forbidden")
+                return False
+            except Exception as e:
+                return await self._postpone(items, e)
+        else:
+            return await self._postpone(items, "ліміт Telegram")
+
+        await db_manager.complete_notifications(ids, list(subscription_names))
+        subscription_messages_total.inc(status="sent")
+        logger.info(f"✅ Сповіщення надіслано користувачу {telegram_id}: {len(vehicles)} авто")
+        return True
+
+    async def _postpone(self, items: List[dict], error) -> bool:
+        ids = [item["id"] for item in items]
+        attempts = max(item["attempts"] for item in items) + 1
+        if attempts >= self.max_attempts:
+            logger.error(f"❌ Сповіщення користувачу {items[0]['telegram_id']} не доставлено: {error}")
+            await db_manager.complete_notifications(ids)
+            subscription_messages_total.inc(status="failed")
+        else:
+            logger.warning(f"⚠️ Помилка надсилання сповіщення {items[0]['telegram_id']}, повтор пізніше: {error}")
+            await db_manager.postpone_notifications(ids, datetime.now() + timedelta(seconds=self.poll_interval * attempts))
+            subscription_messages_total.inc(status="retry")
+        return False
+
+
+# Глобальний відправник сповіщень підписок
+subscription_digest_sender = SubscriptionDigestSender(
+    max_items=settings.subscription_digest_max_items,
+    poll_interval=settings.subscription_digest_poll_interval,
+)
@@ -1,17 +1,22 @@
 """
 Обробники для підписок на авто
 """
+import asyncio
+import html
 import logging
 from datetime import datetime
 from aiogram import F
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 
+from app.config.settings import settings
 from app.utils.formatting import get_default_parse_mode
 from app.modules.database.manager import db_manager
 from .states import SubscriptionStates
+from .digests import DIGEST_MODES, format_vehicle_price
 from .keyboards import (
     get_subscriptions_main_keyboard,
+    get_subscription_created_keyboard,
     get_vehicle_type_keyboard,
     get_condition_keyboard,
     get_skip_back_keyboard,
@@ -764,6 +769,28 @@ async def show_confirmation_callback(callback: CallbackQuery, state: FSMContext)
         )
 
 
+async def _preview_subscription_matches(params: dict) -> tuple:
+    """Наявні авто за критеріями нової підписки: (текст для повідомлення, найновіші авто)"""
+    try:
+        match_count, matches = await db_manager.preview_subscription_matches(
+            params,
+            limit=settings.subscription_preview_size,
+            count_cap=settings.subscription_preview_count_cap,
+        )
+        if not match_count:
+            return "", []
+        count_text = f"{match_count}+" if match_count >= settings.subscription_preview_count_cap else str(match_count)
+        text = f"\n📊 <b>Вже є авто за цими критеріями: {count_text}</b>\n"
+        for vehicle in matches:
+            title = html.escape(f"{vehicle.brand} {vehicle.model}")
+            text += f"• {title}, {vehicle.year} - {format_vehicle_price(vehicle.price)}\n"
+        return text, matches
+    except Exception as e:
+        # Без попереднього перегляду підписка все одно створюється
+        logger.warning(f"⚠️ Не вдалося підрахувати авто за підпискою: {e}")
+        return "", []
+
+
 @router.callback_query(F.data == "confirm_subscription")
 async def confirm_subscription(callback: CallbackQuery, state: FSMContext):
     """Підтвердити та створити підписку"""
@@ -782,30 +809,16 @@ async def confirm_subscription(callback: CallbackQuery, state: FSMContext):
         await state.clear()
         return
     
-    # Створюємо підписку
+    # Створюємо підписку і паралельно рахуємо авто, що вже відповідають її критеріям
     try:
-        subscription_id = await db_manager.create_subscription(
-            user_id=user.id,
-            subscription_name=params.get('subscription_name', 'Моя підписка'),
-            search_params=params
-        )
-        
-        await state.clear()
-        
-        text = """
-✅ <b>Підписку успішно створено!</b>
-
-🔔 Ви отримаєте сповіщення, коли з'явиться авто за вашими критеріями.
-
-Керувати підписками можна в меню "🔔 Підписки"
-"""
-        
-        await callback.message.edit_text(
-            text.strip(),
-            reply_markup=get_subscriptions_main_keyboard(),
-            parse_mode=get_default_parse_mode(),
+        subscription_id, (preview_text, matches) = await asyncio.gather(
+            db_manager.create_subscription(
+                user_id=user.id,
+                subscription_name=params.get('subscription_name', 'Моя підписка'),
+                search_params=params
+            ),
+            _preview_subscription_matches(params),
         )
-        
     except Exception as e:
         logger.error(f"Помилка створення підписки: {e}")
         await callback.message.edit_text(
@@ -814,6 +827,24 @@ async def confirm_subscription(callback: CallbackQuery, state: FSMContext):
             parse_mode=get_default_parse_mode(),
         )
         await state.clear()
+        return
+    
+    # Підписку вже збережено - далі лише повідомлення про це
+    await state.clear()
+    
+    text = """
+✅ <b>Підписку успішно створено!</b>
+
+🔔 Ви отримаєте сповіщення, коли з'явиться авто за вашими критеріями.
+"""
+    text += preview_text
+    text += '\nКерувати підписками можна в меню "🔔 Підписки"'
+    
+    await callback.message.edit_text(
+        text.strip(),
+        reply_markup=get_subscription_created_keyboard(matches),
+        parse_mode=get_default_parse_mode(),
+    )
 
 
 @router.callback_query(F.data == "cancel_subscription")
@@ -920,16 +951,23 @@ async def view_subscription_detail(callback: CallbackQuery):
     if subscription.get('condition'):
         text += f"✨ Стан: {CONDITION_NAMES.get(subscription['condition'], subscription['condition'])}\n"
     
+    digest_mode_name = DIGEST_MODES.get(subscription.get('digest_mode'), DIGEST_MODES["instant"])
+    text += f"\n⏱️ <b>Сповіщення:</b> {digest_mode_name}\n"
+    text += "<i>Кілька нових авто приходять одним повідомленням</i>\n"
+    keyboard = get_subscription_detail_keyboard(
+        subscription_id, subscription.get('is_active', True), digest_mode_name
+    )
+    
     try:
         await callback.message.edit_text(
             text.strip(),
-            reply_markup=get_subscription_detail_keyboard(subscription_id, subscription.get('is_active', True)),
+            reply_markup=keyboard,
             parse_mode=get_default_parse_mode(),
         )
     except Exception:
         await callback.message.answer(
             text.strip(),
-            reply_markup=get_subscription_detail_keyboard(subscription_id, subscription.get('is_active', True)),
+            reply_markup=keyboard,
             parse_mode=get_default_parse_mode(),
         )
 
@@ -1022,6 +1060,34 @@ async def toggle_subscription(callback: CallbackQuery):
     await view_subscription_detail(callback)
 
 
+@router.callback_query(F.data.startswith("digest_sub_"))
+async def change_digest_mode(callback: CallbackQuery):
+    """Перемкнути режим доставки сповіщень: одразу → щогодини → раз на день"""
+    subscription_id = int(callback.data.split("_")[2])
+    
+    user = await db_manager.get_user_by_telegram_id(callback.from_user.id)
+    if not user:
+        await callback.answer("❌ Користувач не знайдений", show_alert=True)
+        return
+    
+    subscriptions = await db_manager.get_user_subscriptions(user.id)
+    subscription = next((s for s in subscriptions if s['id'] == subscription_id), None)
+    
+    if not subscription:
+        await callback.answer("❌ Підписка не знайдена", show_alert=True)
+        return
+    
+    modes = list(DIGEST_MODES)
+    current = subscription.get('digest_mode') if subscription.get('digest_mode') in modes else "instant"
+    new_mode = modes[(modes.index(current) + 1) % len(modes)]
+    await db_manager.update_subscription_digest_mode(user.id, subscription_id, new_mode)
+    
+    await callback.answer(f"✅ Сповіщення: {DIGEST_MODES[new_mode]}")
+    
+    # Оновлюємо відображення
+    await view_subscription_detail(callback)
+
+
 @router.callback_query(F.data.startswith("delete_sub_"))
 async def ask_delete_confirmation(callback: CallbackQuery):
     """Запитати підтвердження видалення"""
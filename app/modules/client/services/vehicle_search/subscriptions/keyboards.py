@@ -15,6 +15,19 @@ def get_subscriptions_main_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+def get_subscription_created_keyboard(vehicles: List) -> InlineKeyboardMarkup:
+    """Меню підписок з кнопками авто, що вже відповідають новій підписці"""
+    keyboard = [
+        [InlineKeyboardButton(
+            text=f"🚛 {vehicle.brand} {vehicle.model} ({vehicle.year})",
+            callback_data=f"client_view_vehicle_{vehicle.id}"
+        )]
+        for vehicle in vehicles
+    ]
+    keyboard += get_subscriptions_main_keyboard().inline_keyboard
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
 def get_vehicle_type_keyboard() -> InlineKeyboardMarkup:
     """Клавіатура вибору типу авто"""
     keyboard = [
@@ -83,13 +96,16 @@ def get_subscriptions_list_keyboard(subscriptions: List[Dict]) -> InlineKeyboard
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
-def get_subscription_detail_keyboard(subscription_id: int, is_active: bool) -> InlineKeyboardMarkup:
+def get_subscription_detail_keyboard(
+    subscription_id: int, is_active: bool, digest_mode_name: str = "Одразу"
+) -> InlineKeyboardMarkup:
     """Клавіатура для деталей підписки"""
     toggle_text = "⏸️ Призупинити" if is_active else "▶️ Активувати"
     toggle_callback = f"toggle_sub_{subscription_id}"
     
     keyboard = [
         [InlineKeyboardButton(text=toggle_text, callback_data=toggle_callback)],
+        [InlineKeyboardButton(text=f"⏱️ Сповіщення: {digest_mode_name}", callback_data=f"digest_sub_{subscription_id}")],
         [InlineKeyboardButton(text="🗑️ Видалити", callback_data=f"delete_sub_{subscription_id}")],
         [InlineKeyboardButton(text="🔙 Назад", callback_data="view_subscriptions")],
     ]
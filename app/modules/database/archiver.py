@@ -0,0 +1,88 @@
+"""
+Фонове архівування проданих авто
+
+Авто, продані понад ARCHIVE_SOLD_AFTER_DAYS днів тому, періодично переносяться
+з гарячої таблиці vehicles у vehicles_archive невеликими пакетами. Клієнтські
+запити працюють лише з vehicles, адмінські - з view vehicles_all.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from app.config.settings import settings
+from .manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+
+class VehicleArchiver:
+    """Періодично переносить продані авто в архів"""
+
+    def __init__(
+        self,
+        older_than_days: int,
+        batch_size: int = 100,
+        batch_pause: float = 0.5,
+        interval: float = 3600.0,
+    ):
+        self.older_than_days = older_than_days
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Запустити фонову задачу (якщо архівування увімкнене)"""
+        if self.is_running:
+            return
+        if self.older_than_days <= 0:
+            logger.info("ℹ️ Архівування проданих авто вимкнене")
+            return
+        self._task = asyncio.create_task(self._run(), name="vehicle_archiver")
+        logger.info(f"🗄️ Архівування авто, проданих понад {self.older_than_days} дн. тому, запущено")
+
+    async def stop(self) -> None:
+        """Зупинити; кожен пакет - окрема транзакція, тож перерваний прохід нічого не втрачає"""
+        if not self.is_running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def archive_pass(self) -> int:
+        """Перенести всіх поточних кандидатів пакетами; повертає кількість авто"""
+        total = 0
+        while True:
+            moved = await db_manager.archive_sold_vehicles(self.older_than_days, self.batch_size)
+            total += moved
+            if moved < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_pause)
+        if total:
+            logger.info(f"🗄️ Перенесено в архів {total} проданих авто")
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.archive_pass()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Помилка архівування проданих авто: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# Глобальний архіватор проданих авто
+vehicle_archiver = VehicleArchiver(
+    settings.archive_sold_after_days,
+    batch_size=settings.archive_batch_size,
+    batch_pause=settings.archive_batch_pause,
+    interval=settings.archive_interval,
+)
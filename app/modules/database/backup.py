@@ -0,0 +1,254 @@
+"""
+Резервні копії БД без зупинки бота
+
+Копія знімається через SQLite online backup API невеликими кроками
+(BACKUP_PAGES_PER_STEP сторінок, пауза BACKUP_STEP_PAUSE між ними) в окремому
+потоці: event loop не блокується, а записи бота проходять між кроками.
+Якщо записи щоразу перезапускають копіювання, залишок копіюється одним кроком.
+
+Готова копія стискається gzip (truck_bot_YYYYMMDD_HHMMSS.db.gz), зберігаються
+останні BACKUP_KEEP файлів. verify_backup розпаковує копію в тимчасовий файл і
+перевіряє її цілісність - так перевіряється саме те, що буде відновлено.
+"""
+import asyncio
+import gzip
+import logging
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+from app.monitoring.metrics import backup_last_success, backups_total
+from .manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = "truck_bot_"
+BACKUP_SUFFIX = ".db.gz"
+
+# Скільки перезапусків покрокового копіювання терпіти, перш ніж копіювати одним кроком
+MAX_BACKUP_RESTARTS = 3
+
+
+class BackupCancelled(Exception):
+    """Копіювання перервано зупинкою бота"""
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def copy_database(
+    source_path: str,
+    target_path: str,
+    pages_per_step: int = 256,
+    step_pause: float = 0.05,
+    cancelled: Optional[threading.Event] = None,
+) -> None:
+    """Скопіювати БД через online backup API (блокуючий виклик для потоку)"""
+    source = sqlite3.connect(source_path, timeout=30)
+    target = sqlite3.connect(target_path)
+    restarts = 0
+    last_remaining = None
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        nonlocal restarts, last_remaining
+        if cancelled is not None and cancelled.is_set():
+            raise BackupCancelled()
+        # Запис з іншого з'єднання перезапускає копіювання з початку
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts >= MAX_BACKUP_RESTARTS:
+                raise _TooManyRestarts()
+        last_remaining = remaining
+
+    try:
+        try:
+            source.backup(target, pages=pages_per_step, progress=progress, sleep=step_pause)
+        except _TooManyRestarts:
+            logger.warning("⚠️ Копіювання БД перезапускалось через записи, копіюємо залишок одним кроком")
+            source.backup(target, pages=-1)
+    finally:
+        target.close()
+        source.close()
+
+
+def inspect_database(path: str) -> Dict[str, Any]:
+    """Перевірка цілісності та короткий опис БД"""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        integrity = [row[0] for row in connection.execute("PRAGMA integrity_check")]
+        tables = [
+            row[0]
+            for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")
+        ]
+        counts = {}
+        for table in ("users", "vehicles", "vehicles_archive"):
+            if table in tables:
+                counts[table] = connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return {
+            "ok": integrity == ["ok"],
+            "integrity": integrity[:10],
+            "schema_version": connection.execute("PRAGMA user_version").fetchone()[0],
+            "tables": len(tables),
+            "counts": counts,
+        }
+    finally:
+        connection.close()
+
+
+class DatabaseBackup:
+    """Резервні копії БД: за розкладом у фоні та вручну (scripts/backup_db.py)"""
+
+    def __init__(
+        self,
+        db_path: str,
+        backup_dir: str,
+        keep: int = 14,
+        interval: float = 86400.0,
+        pages_per_step: int = 256,
+        step_pause: float = 0.05,
+    ):
+        self.db_path = db_path
+        self.backup_dir = Path(backup_dir)
+        self.keep = keep
+        self.interval = interval
+        self.pages_per_step = pages_per_step
+        self.step_pause = step_pause
+        self._task: Optional[asyncio.Task] = None
+        self._cancelled = threading.Event()
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def list_backups(self) -> List[Path]:
+        """Наявні копії, від найновішої"""
+        if not self.backup_dir.exists():
+            return []
+        return sorted(self.backup_dir.glob(f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}"), reverse=True)
+
+    def _create_backup_sync(self) -> Path:
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target = self.backup_dir / f"{BACKUP_PREFIX}{stamp}{BACKUP_SUFFIX}"
+        raw = target.with_name(target.name[: -len(".gz")] + ".tmp")
+        try:
+            copy_database(self.db_path, str(raw), self.pages_per_step, self.step_pause, self._cancelled)
+            partial = target.with_name(target.name + ".tmp")
+            with open(raw, "rb") as source, gzip.open(partial, "wb", compresslevel=6) as compressed:
+                shutil.copyfileobj(source, compressed, 1024 * 1024)
+            # Файл з'являється під остаточним ім'ям лише повністю записаним
+            partial.replace(target)
+        finally:
+            raw.unlink(missing_ok=True)
+            target.with_name(target.name + ".tmp").unlink(missing_ok=True)
+        self._rotate()
+        return target
+
+    def _rotate(self) -> None:
+        for old in self.list_backups()[max(self.keep, 1):]:
+            old.unlink(missing_ok=True)
+            logger.info(f"🗑️ Видалено стару резервну копію {old.name}")
+
+    async def create_backup(self) -> Path:
+        """Зробити стиснуту копію БД, не зупиняючи бота"""
+        async with self._lock:
+            started = time.perf_counter()
+            try:
+                path = await asyncio.to_thread(self._create_backup_sync)
+            except BackupCancelled:
+                backups_total.inc(status="cancelled")
+                raise
+            except Exception:
+                backups_total.inc(status="error")
+                raise
+            backups_total.inc(status="ok")
+            backup_last_success.set(time.time())
+            logger.info(
+                f"💾 Резервна копія {path.name} ({path.stat().st_size / 1024 / 1024:.1f} МБ) "
+                f"за {time.perf_counter() - started:.1f} с"
+            )
+            return path
+
+    @staticmethod
+    def _unpack(path: Path, target: Path) -> None:
+        with gzip.open(path, "rb") as compressed, open(target, "wb") as raw:
+            shutil.copyfileobj(compressed, raw, 1024 * 1024)
+
+    def verify_backup(self, path: Path) -> Dict[str, Any]:
+        """Розпакувати копію в тимчасовий файл і перевірити її (блокуючий виклик)"""
+        with tempfile.TemporaryDirectory() as tmp:
+            restored = Path(tmp) / "restored.db"
+            self._unpack(path, restored)
+            return inspect_database(str(restored))
+
+    def restore_backup(self, path: Path, target_path: Optional[str] = None) -> Dict[str, Any]:
+        """Перевірити копію та відновити її в target_path (бот має бути зупинений)"""
+        target_path = target_path or self.db_path
+        with tempfile.TemporaryDirectory() as tmp:
+            restored = Path(tmp) / "restored.db"
+            self._unpack(path, restored)
+            report = inspect_database(str(restored))
+            if not report["ok"]:
+                raise ValueError(f"Копія {path.name} пошкоджена: {report['integrity']}")
+            Path(target_path).parent.mkdir(parents=True, exist_ok=True)
+            # Через backup API, а не копіюванням файлу: журнали цільової БД лишаються узгодженими
+            copy_database(str(restored), target_path, pages_per_step=-1, step_pause=0)
+        logger.info(f"♻️ БД {target_path} відновлено з {path.name}")
+        return report
+
+    async def start(self) -> None:
+        """Запустити копіювання за розкладом"""
+        if self.is_running:
+            return
+        self._cancelled.clear()
+        self._task = asyncio.create_task(self._run(), name="database_backup")
+        logger.info(f"💾 Резервні копії БД кожні {self.interval / 3600:g} год у {self.backup_dir}")
+
+    async def stop(self) -> None:
+        """Зупинити розклад; копіювання, що виконується, переривається на наступному кроці"""
+        if not self.is_running:
+            return
+        self._cancelled.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, BackupCancelled):
+            pass
+
+    def _seconds_until_next(self) -> float:
+        backups = self.list_backups()
+        if not backups:
+            return 0.0
+        age = time.time() - backups[0].stat().st_mtime
+        return max(0.0, self.interval - age)
+
+    async def _run(self) -> None:
+        while True:
+            # Після перезапуску бота не робимо зайвої копії, якщо остання ще свіжа
+            await asyncio.sleep(self._seconds_until_next())
+            try:
+                await self.create_backup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Помилка резервного копіювання БД: {e}")
+                await asyncio.sleep(min(self.interval, 600))
+
+
+# Глобальний сервіс резервних копій
+database_backup = DatabaseBackup(
+    db_manager.db_path,
+    settings.backup_dir,
+    keep=settings.backup_keep,
+    interval=settings.backup_interval,
+    pages_per_step=settings.backup_pages_per_step,
+    step_pause=settings.backup_step_pause,
+)
@@ -0,0 +1,120 @@
+"""
+Фонові виправлення даних
+
+Разові виправлення, які раніше виконувались повним проходом таблиці на кожному
+запуску, тепер виконуються один раз у фоні невеликими пакетами за діапазонами ID.
+Прогрес зберігається в таблиці data_fixes, тому перезапуск продовжує з місця зупинки.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+from app.config.settings import settings
+from .manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DataFix:
+    """Опис виправлення: пакетна функція (id_from, id_to] -> кількість змінених рядків"""
+
+    name: str
+    description: str
+    apply_batch: Callable[[int, int], Awaitable[int]]
+    max_id: Callable[[], Awaitable[int]]
+
+
+# Порядок важливий: виправлення виконуються послідовно
+DATA_FIXES: List[DataFix] = [
+    DataFix(
+        name="vehicle_numeric_tokens",
+        description="службові позначки '[Очищено]' у числових полях авто",
+        apply_batch=db_manager.cleanup_invalid_vehicle_data,
+        max_id=db_manager.get_max_vehicle_id,
+    ),
+]
+
+
+class DataFixRunner:
+    """Виконує незавершені виправлення даних у фоновій задачі"""
+
+    def __init__(self, fixes: List[DataFix], batch_size: int = 500, batch_pause: float = 0.2):
+        self.fixes = fixes
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def pending(self) -> List[DataFix]:
+        """Виправлення, які ще не завершені"""
+        result = []
+        for fix in self.fixes:
+            state = await db_manager.get_data_fix_state(fix.name)
+            if not state or not state.get("applied_at"):
+                result.append(fix)
+        return result
+
+    async def start(self) -> None:
+        """Запустити фонову задачу, якщо є незавершені виправлення"""
+        if self.is_running:
+            return
+        pending = await self.pending()
+        if not pending:
+            logger.info("ℹ️ Фонових виправлень даних немає")
+            return
+        self._task = asyncio.create_task(self._run(pending), name="data_fixes")
+        logger.info(f"🧹 Фонові виправлення даних: {', '.join(fix.name for fix in pending)}")
+
+    async def stop(self) -> None:
+        """Перервати виконання; прогрес останнього пакета вже збережено"""
+        if not self.is_running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self, fixes: List[DataFix]) -> None:
+        for fix in fixes:
+            try:
+                await self._run_fix(fix)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Помилка фонового виправлення {fix.name}: {e}")
+
+    async def _run_fix(self, fix: DataFix) -> None:
+        state = await db_manager.get_data_fix_state(fix.name) or {}
+        last_id = int(state.get("last_id") or 0)
+        rows_fixed = int(state.get("rows_fixed") or 0)
+        # Межа фіксується на старті: нові записи вже проходять нормалізацію при збереженні
+        max_id = await fix.max_id()
+        started = time.perf_counter()
+
+        while last_id < max_id:
+            batch_end = min(last_id + self.batch_size, max_id)
+            rows_fixed += await fix.apply_batch(last_id, batch_end)
+            last_id = batch_end
+            await db_manager.save_data_fix_progress(fix.name, last_id, rows_fixed)
+            await asyncio.sleep(self.batch_pause)
+
+        await db_manager.save_data_fix_progress(fix.name, last_id, rows_fixed, done=True)
+        logger.info(
+            f"✅ Виправлення {fix.name} ({fix.description}) завершено: "
+            f"змінено {rows_fixed} значень за {time.perf_counter() - started:.1f} с"
+        )
+
+
+# Глобальний виконавець фонових виправлень
+data_fix_runner = DataFixRunner(
+    DATA_FIXES,
+    batch_size=settings.data_fix_batch_size,
+    batch_pause=settings.data_fix_batch_pause,
+)
@@ -6,12 +6,21 @@ import aiosqlite
 import asyncio
 import json
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Версія схеми БД, що зберігається в PRAGMA user_version.
+# Нова міграція = новий крок у DatabaseManager.init_database та +1 тут.
+SCHEMA_VERSION = 9
+
 from app.config.settings import settings
+from app.monitoring.metrics import db_query_duration, instrument_async_methods
+from .profiler import ProfiledConnection, query_profiler
+from .vehicle_cache import MISSING, VehicleCache
+from .subscription_match import AVAILABLE_VEHICLE_SQL, fold_brand, subscription_match_sql
+from .user_search import fold_text, phone_digits, prefix_range, search_text, trigrams, user_search_fields
 from .models import (
     UserModel,
     VehicleModel,
@@ -25,6 +34,102 @@ from .models import (
     BroadcastModel,
 )
 
+# Цінові діапазони для лічильників каталогу: (верхня межа не включно, назва)
+PRICE_BUCKETS = (
+    (10000, "0-10k"),
+    (25000, "10k-25k"),
+    (50000, "25k-50k"),
+    (None, "50k+"),
+)
+
+# Умова "авто доступне клієнтам" - та сама, що в get_available_vehicles*
+_AVAILABLE_SQL = "{row}is_active = 1 AND ({row}status IS NULL OR {row}status != 'sold')"
+
+# Дата продажу для архівування (у старих записів sold_at може бути порожнім)
+_SOLD_AT_SQL = "COALESCE(sold_at, status_changed_at, updated_at)"
+
+
+def _price_bucket_sql(row: str = "") -> str:
+    """SQL-вираз назви цінового діапазону для PRICE_BUCKETS"""
+    cases = [f"WHEN {row}price IS NULL OR {row}price <= 0 THEN 'unknown'"]
+    for upper, name in PRICE_BUCKETS:
+        if upper is not None:
+            cases.append(f"WHEN {row}price < {upper} THEN '{name}'")
+        else:
+            cases.append(f"ELSE '{name}'")
+    return "CASE " + " ".join(cases) + " END"
+
+
+# Рядок медіа у форматі JSON-колонки vehicles.photos ("video:" - префікс відео)
+_MEDIA_RAW_SQL = "CASE WHEN kind = 'video' THEN 'video:' || file_id ELSE file_id END"
+
+
+def _vehicle_facet_sql(row: str = "") -> List[tuple]:
+    """Пари (facet, SQL-вираз значення) для таблиці vehicle_facets"""
+    return [
+        ("total", "'all'"),
+        ("vehicle_type", f"COALESCE({row}vehicle_type, '')"),
+        ("condition", f"COALESCE({row}condition, '')"),
+        ("price_bucket", _price_bucket_sql(row)),
+    ]
+
+
+# Сортування та фільтри списку користувачів (get_users, get_users_page)
+_USERS_ORDER_BY = {
+    "created_at_asc": "created_at ASC",
+    "created_at_desc": "created_at DESC",
+    "name_asc": "first_name ASC, last_name ASC",
+    "name_desc": "first_name DESC, last_name DESC",
+    "role_asc": "role ASC",
+    "role_desc": "role DESC",
+}
+_USERS_FILTER_WHERE = {"active": "WHERE is_active = 1", "blocked": "WHERE is_active = 0"}
+# Фільтр -> ключ статистики з кількістю користувачів за цим фільтром
+_USERS_FILTER_TOTALS = {"all": "total_users", "active": "active_users", "blocked": "blocked_users"}
+
+
+def _users_where(status_filter: str) -> str:
+    return _USERS_FILTER_WHERE.get(status_filter, "")
+
+
+# Поля users, від яких залежать пошукові колонки (див. user_search.py)
+_USER_SEARCH_SOURCES = {"first_name", "last_name", "username", "phone"}
+
+# Таблиці, які можна вивантажувати сторінками (get_export_page)
+EXPORT_TABLES = ("users", "vehicles", "vehicles_archive", "manager_requests", "broadcasts")
+
+# Час зміни рядка для інкрементального експорту: таблиця -> SQL-вираз.
+# Частина записів має формат з 'T' (isoformat), частина - з пробілом (CURRENT_TIMESTAMP),
+# тому вираз нормалізує їх до одного виду; по ньому ж побудовано індекси.
+EXPORT_CHANGED_AT_SQL = {
+    "users": "replace(COALESCE(updated_at, created_at, ''), 'T', ' ')",
+    "vehicles": "replace(COALESCE(updated_at, created_at, ''), 'T', ' ')",
+    "vehicles_archive": "replace(COALESCE(updated_at, created_at, ''), 'T', ' ')",
+    "manager_requests": "replace(COALESCE(updated_at, created_at, ''), 'T', ' ')",
+    # Розсилки після створення не змінюються
+    "broadcasts": "replace(COALESCE(created_at, ''), 'T', ' ')",
+}
+
+# Розділ експорту, до якого належить видалений рядок таблиці (журнал deleted_rows)
+EXPORT_DELETION_DATASETS = {
+    "users": "users",
+    "vehicles": "vehicles",
+    "vehicles_archive": "vehicles",
+    "manager_requests": "requests",
+    "broadcasts": "broadcasts",
+}
+
+# Знімки лічильників каталогу в пам'яті: db_path -> (час завантаження, дані).
+# Спільні для всіх екземплярів DatabaseManager, щоб зміна авто через будь-який
+# з них скидала знімок для всіх.
+_facets_snapshots: Dict[str, tuple] = {}
+
+# Знімки статистики користувачів: db_path -> (час завантаження, дані), скидаються при змінах users
+_user_stats_snapshots: Dict[str, tuple] = {}
+
+# Кеш get_vehicle_by_id: (db_path, id) -> VehicleModel, теж спільний для всіх екземплярів
+_vehicle_cache = VehicleCache(max_size=settings.vehicle_cache_size)
+
 
 class DatabaseManager:
     """Менеджер для роботи з базою даних"""
@@ -32,6 +137,29 @@ class DatabaseManager:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or settings.database_url.replace("sqlite:///", "")
 
+    def _vehicles_changed(self, vehicle_ids: Optional[List[int]] = None) -> None:
+        """Скинути дані в пам'яті, що залежать від таблиці vehicles.
+
+        vehicle_ids - які авто змінились; None - невідомо які, кеш авто скидається повністю.
+        """
+        _facets_snapshots.pop(self.db_path, None)
+        if vehicle_ids is None:
+            _vehicle_cache.clear()
+            return
+        for vehicle_id in vehicle_ids:
+            _vehicle_cache.invalidate((self.db_path, vehicle_id))
+
+    def _users_changed(self) -> None:
+        """Скинути дані в пам'яті, що залежать від таблиці users"""
+        _user_stats_snapshots.pop(self.db_path, None)
+
+    def _connect(self):
+        """Відкрити з'єднання з БД (з профайлером запитів, якщо він увімкнений)"""
+        connection = aiosqlite.connect(self.db_path)
+        if query_profiler.enabled:
+            return ProfiledConnection(connection, query_profiler)
+        return connection
+
     def _process_vehicle_data(self, vehicle_data: dict) -> dict:
         """Обробити дані авто для Pydantic моделі"""
         # Нормалізуємо службові значення, які могли зберегтися як текст
@@ -100,14 +228,25 @@ class DatabaseManager:
         
         return vehicle_data
 
-    async def cleanup_invalid_vehicle_data(self) -> None:
-        """Очистити старі текстові позначки на кшталт '[Очищено]' у числових полях."""
+    async def cleanup_invalid_vehicle_data(self, id_from: int = None, id_to: int = None) -> int:
+        """Очистити старі текстові позначки на кшталт '[Очищено]' у числових полях.
+
+        Діапазон id_from < id <= id_to дозволяє виконувати очистку невеликими пакетами.
+        """
         cleanup_tokens = ["", "[Очищено]", "Не вказано", "none", "None"]
         columns = ["power_hp", "mileage", "engine_volume", "load_capacity", "total_weight", "year"]
         placeholders = ", ".join("?" for _ in cleanup_tokens)
+        range_clause = ""
+        range_params: List[Any] = []
+        if id_from is not None:
+            range_clause += " AND id > ?"
+            range_params.append(id_from)
+        if id_to is not None:
+            range_clause += " AND id <= ?"
+            range_params.append(id_to)
         total_fixed = 0
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             for column in columns:
                 cursor = await db.execute(
                     f"""
@@ -115,21 +254,97 @@ class DatabaseManager:
                     SET {column} = NULL
                     WHERE {column} IS NOT NULL
                       AND typeof({column}) = 'text'
-                      AND TRIM({column}) IN ({placeholders})
+                      AND TRIM({column}) IN ({placeholders}){range_clause}
                     """,
-                    cleanup_tokens,
+                    cleanup_tokens + range_params,
                 )
                 total_fixed += cursor.rowcount or 0
             await db.commit()
+            self._vehicles_changed()
 
-        if total_fixed:
-            logger.info(f"🧹 Очищено {total_fixed} некоректних значень у таблиці vehicles")
-        else:
-            logger.info("🧹 Некоректних значень у таблиці vehicles не знайдено")
+        if id_from is None and id_to is None:
+            if total_fixed:
+                logger.info(f"🧹 Очищено {total_fixed} некоректних значень у таблиці vehicles")
+            else:
+                logger.info("🧹 Некоректних значень у таблиці vehicles не знайдено")
+        return total_fixed
+
+    # ===== Версія схеми та фонові виправлення даних =====
+
+    async def get_schema_version(self) -> int:
+        """Поточна версія схеми (PRAGMA user_version)"""
+        async with self._connect() as db:
+            async with db.execute("PRAGMA user_version") as cursor:
+                return int((await cursor.fetchone())[0])
+
+    async def init_database(self) -> bool:
+        """Ініціалізація бази даних.
+
+        Міграції виконуються лише якщо збережена версія схеми менша за SCHEMA_VERSION,
+        тому звичайний перезапуск обходиться одним PRAGMA. Повертає True, якщо схему оновлено.
+        """
+        version = await self.get_schema_version()
+        if version >= SCHEMA_VERSION:
+            logger.info(f"ℹ️ Схема БД актуальна (версія {version}), міграції пропущено")
+            return False
 
-    async def init_database(self):
-        """Ініціалізація бази даних та створення таблиць"""
-        async with aiosqlite.connect(self.db_path) as db:
+        migrations = [
+            (1, self._create_base_schema),
+            (2, self._create_vehicle_facets),
+            (3, self._create_vehicle_media),
+            (4, self._create_vehicles_archive),
+            (5, self._create_export_deltas),
+            (6, self._create_user_search),
+            (7, self._create_subscription_digests),
+            (8, self._create_subscription_match_indexes),
+            (9, self._create_vehicle_brand_search),
+        ]
+        for target, migration in migrations:
+            if version >= target:
+                continue
+            await migration()
+            async with self._connect() as db:
+                # PRAGMA не приймає параметрів, значення - внутрішня константа
+                await db.execute(f"PRAGMA user_version = {int(target)}")
+                await db.commit()
+            logger.info(f"✅ Схему БД оновлено до версії {target}")
+            version = target
+        return True
+
+    async def get_data_fix_state(self, name: str) -> Optional[Dict[str, Any]]:
+        """Стан фонового виправлення даних або None, якщо воно ще не починалось"""
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM data_fixes WHERE name = ?", (name,)) as cursor:
+                row = await cursor.fetchone()
+                return dict(row) if row else None
+
+    async def save_data_fix_progress(self, name: str, last_id: int, rows_fixed: int, done: bool = False) -> None:
+        """Зберегти прогрес виправлення, щоб після перезапуску продовжити з місця зупинки"""
+        async with self._connect() as db:
+            await db.execute(
+                """
+                INSERT INTO data_fixes (name, last_id, rows_fixed, applied_at, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET
+                    last_id = excluded.last_id,
+                    rows_fixed = excluded.rows_fixed,
+                    applied_at = excluded.applied_at,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (name, last_id, rows_fixed, datetime.now().isoformat() if done else None),
+            )
+            await db.commit()
+
+    async def get_max_vehicle_id(self) -> int:
+        """Найбільший ID у таблиці vehicles (межа для пакетної обробки)"""
+        async with self._connect() as db:
+            async with db.execute("SELECT COALESCE(MAX(id), 0) FROM vehicles") as cursor:
+                return int((await cursor.fetchone())[0])
+
+    async def _create_base_schema(self) -> None:
+        """Міграція до версії 1: створення таблиць та спадкові міграції колонок"""
+        async with self._connect() as db:
             # Створення таблиці користувачів
             await db.execute(
                 """
@@ -301,7 +516,8 @@ class DatabaseManager:
                     if needs_migration or needs_main_photo:
                         logger.info("🔄 Починаємо міграцію таблиці vehicles для необов'язкових полів та main_photo...")
                         
-                        # Створюємо нову таблицю з правильною схемою
+                        # Створюємо нову таблицю з правильною схемою (прибираємо залишок невдалої спроби)
+                        await db.execute("DROP TABLE IF EXISTS vehicles_new")
                         await db.execute("""
                             CREATE TABLE IF NOT EXISTS vehicles_new (
                                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -344,10 +560,16 @@ class DatabaseManager:
                             )
                         """)
                         
-                        # Копіюємо дані зі старої таблиці (додаємо main_photo як NULL)
-                        await db.execute("""
-                            INSERT INTO vehicles_new 
-                            SELECT *, NULL as main_photo FROM vehicles
+                        # Копіюємо дані зі старої таблиці по спільних колонках
+                        # (main_photo, status_changed_at, sold_at можуть бути відсутні - лишаються NULL)
+                        async with db.execute("PRAGMA table_info(vehicles_new)") as new_cursor:
+                            new_col_names = {col[1] for col in await new_cursor.fetchall()}
+                        common_columns = ", ".join(
+                            col[1] for col in cols if col[1] in new_col_names
+                        )
+                        await db.execute(f"""
+                            INSERT INTO vehicles_new ({common_columns})
+                            SELECT {common_columns} FROM vehicles
                         """)
                         
                         # Видаляємо стару таблицю
@@ -462,6 +684,48 @@ class DatabaseManager:
             """
             )
 
+            # Черга фонових задач публікації в групу
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS publication_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    vehicle_id INTEGER NOT NULL,
+                    action TEXT NOT NULL, -- publish | republish | unpublish
+                    status TEXT DEFAULT 'pending', -- pending | running | done | failed
+                    attempts INTEGER DEFAULT 0,
+                    max_attempts INTEGER DEFAULT 5,
+                    next_run_at TIMESTAMP,
+                    requested_by INTEGER,
+                    album_message_ids TEXT,
+                    reply_message_id INTEGER,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    FOREIGN KEY (vehicle_id) REFERENCES vehicles(id)
+                )
+            """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_publication_jobs_status ON publication_jobs(status, next_run_at)"
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_publication_jobs_vehicle ON publication_jobs(vehicle_id, status)"
+            )
+
+            # Стан фонових виправлень даних (див. app/modules/database/data_fixes.py)
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS data_fixes (
+                    name TEXT PRIMARY KEY,
+                    last_id INTEGER DEFAULT 0,
+                    rows_fixed INTEGER DEFAULT 0,
+                    applied_at TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+
             # Додаємо колонку photos якщо її немає
             try:
                 # Перевіряємо, чи існує колонка photos
@@ -582,10 +846,280 @@ class DatabaseManager:
             
             await db.commit()
 
+    async def _create_vehicle_facets(self) -> None:
+        """Міграція до версії 2: лічильники каталогу vehicle_facets, що ведуть тригери"""
+        async with self._connect() as db:
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vehicle_facets (
+                    facet TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (facet, value)
+                )
+            """
+            )
+
+            def change_counts(row: str, delta: str) -> str:
+                statements = []
+                for facet, expression in _vehicle_facet_sql(row):
+                    statements.append(
+                        f"INSERT OR IGNORE INTO vehicle_facets (facet, value, count) "
+                        f"VALUES ('{facet}', {expression}, 0);"
+                    )
+                    statements.append(
+                        f"UPDATE vehicle_facets SET count = count {delta} 1 "
+                        f"WHERE facet = '{facet}' AND value = {expression};"
+                    )
+                return "\n".join(statements)
+
+            watched_columns = "vehicle_type, condition, price, is_active, status"
+            triggers = {
+                "vehicle_facets_insert": (
+                    "AFTER INSERT ON vehicles", _AVAILABLE_SQL.format(row="NEW."), change_counts("NEW.", "+")
+                ),
+                "vehicle_facets_delete": (
+                    "AFTER DELETE ON vehicles", _AVAILABLE_SQL.format(row="OLD."), change_counts("OLD.", "-")
+                ),
+                "vehicle_facets_update_old": (
+                    f"AFTER UPDATE OF {watched_columns} ON vehicles",
+                    _AVAILABLE_SQL.format(row="OLD."),
+                    change_counts("OLD.", "-"),
+                ),
+                "vehicle_facets_update_new": (
+                    f"AFTER UPDATE OF {watched_columns} ON vehicles",
+                    _AVAILABLE_SQL.format(row="NEW."),
+                    change_counts("NEW.", "+"),
+                ),
+            }
+            for name, (event, condition, body) in triggers.items():
+                await db.execute(f"DROP TRIGGER IF EXISTS {name}")
+                await db.execute(f"CREATE TRIGGER {name} {event} WHEN {condition} BEGIN\n{body}\nEND")
+            await db.commit()
+
+        count = await self.rebuild_vehicle_facets()
+        logger.info(f"✅ Лічильники каталогу vehicle_facets створено ({count} значень)")
+
+    async def _create_vehicle_media(self) -> None:
+        """Міграція до версії 3: таблиця vehicle_media замість JSON-колонки photos.
+
+        Медіагрупа - рядки з position 0..n-1. Головне фото картки - рядок з is_main = 1:
+        або один з медіагрупи, або окремий рядок з position = NULL, якщо в групі його немає.
+        """
+        async with self._connect() as db:
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vehicle_media (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    vehicle_id INTEGER NOT NULL,
+                    position INTEGER,
+                    kind TEXT NOT NULL DEFAULT 'photo',
+                    file_id TEXT NOT NULL,
+                    file_unique_id TEXT,
+                    is_main BOOLEAN NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+            await db.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_vehicle_media_position ON vehicle_media(vehicle_id, position)"
+            )
+            await db.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_vehicle_media_main ON vehicle_media(vehicle_id) WHERE is_main = 1"
+            )
+            await db.commit()
+
+        count = await self.rebuild_vehicle_media()
+        logger.info(f"✅ Медіа авто перенесено в vehicle_media ({count} файлів)")
+
+    async def _create_vehicles_archive(self) -> None:
+        """Міграція до версії 4: архів проданих авто vehicles_archive та view vehicles_all.
+
+        Архів повторює колонки vehicles (плюс archived_at). Нова колонка у vehicles
+        потребує міграції, що додасть її і в архів, і перестворить vehicles_all.
+        """
+        async with self._connect() as db:
+            async with db.execute("PRAGMA table_info(vehicles)") as cursor:
+                columns = [(row[1], row[2]) for row in await cursor.fetchall()]
+            definitions = ",\n".join(
+                f"{name} {col_type or ''}".rstrip() if name != "id" else "id INTEGER PRIMARY KEY"
+                for name, col_type in columns
+            )
+            await db.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS vehicles_archive (
+                    {definitions},
+                    archived_at TIMESTAMP NOT NULL
+                )
+            """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vehicles_archive_message ON vehicles_archive(group_message_id)"
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vehicles_archive_status ON vehicles_archive(status)"
+            )
+            # Кандидати на архівування: лише продані авто, без сканування всієї таблиці
+            await db.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_vehicles_sold_at ON vehicles({_SOLD_AT_SQL}) WHERE status = 'sold'"
+            )
+
+            await self._create_vehicles_all_view(db)
+            await db.commit()
+        logger.info("✅ Створено архів проданих авто vehicles_archive")
+
+    async def _create_vehicles_all_view(self, db) -> None:
+        """(Пере)створити view vehicles_all з поточних колонок vehicles"""
+        async with db.execute("PRAGMA table_info(vehicles)") as cursor:
+            column_list = ", ".join(row[1] for row in await cursor.fetchall())
+        await db.execute("DROP VIEW IF EXISTS vehicles_all")
+        await db.execute(
+            f"""
+            CREATE VIEW vehicles_all AS
+            SELECT {column_list}, NULL AS archived_at FROM vehicles
+            UNION ALL
+            SELECT {column_list}, archived_at FROM vehicles_archive
+        """
+        )
+
+    async def _create_export_deltas(self) -> None:
+        """Міграція до версії 5: інкрементальний експорт (індекси змін, журнал видалень, водяні знаки)"""
+        async with self._connect() as db:
+            for table, changed_at in EXPORT_CHANGED_AT_SQL.items():
+                await db.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_changed_at ON {table}({changed_at})")
+
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS deleted_rows (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dataset TEXT NOT NULL,
+                    row_id INTEGER NOT NULL,
+                    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_deleted_rows_dataset ON deleted_rows(dataset, id)")
+            for table, dataset in EXPORT_DELETION_DATASETS.items():
+                # Перенесення між vehicles та vehicles_archive - не видалення:
+                # рядок спершу вставляється в іншу таблицю, потім видаляється
+                other = {"vehicles": "vehicles_archive", "vehicles_archive": "vehicles"}.get(table)
+                condition = f"WHEN NOT EXISTS (SELECT 1 FROM {other} WHERE id = OLD.id)" if other else ""
+                await db.execute(f"DROP TRIGGER IF EXISTS {table}_log_delete")
+                await db.execute(
+                    f"""
+                    CREATE TRIGGER {table}_log_delete AFTER DELETE ON {table} {condition}
+                    BEGIN
+                        INSERT INTO deleted_rows (dataset, row_id) VALUES ('{dataset}', OLD.id);
+                    END
+                """
+                )
+
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS export_watermarks (
+                    export_type TEXT NOT NULL,
+                    dataset TEXT NOT NULL,
+                    changed_since TEXT,
+                    last_deletion_id INTEGER NOT NULL DEFAULT 0,
+                    exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (export_type, dataset)
+                )
+            """
+            )
+            await db.commit()
+        logger.info("✅ Створено журнал видалень та водяні знаки інкрементального експорту")
+
+    async def _create_user_search(self) -> None:
+        """Міграція до версії 6: нормалізовані колонки та триграми для пошуку користувачів"""
+        async with self._connect() as db:
+            async with db.execute("PRAGMA table_info(users)") as cursor:
+                existing = {row[1] for row in await cursor.fetchall()}
+            for column in ("phone_digits", "phone_digits_rev", "name_search", "username_search"):
+                if column not in existing:
+                    await db.execute(f"ALTER TABLE users ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+                await db.execute(f"CREATE INDEX IF NOT EXISTS idx_users_{column} ON users({column})")
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_search_trigrams (
+                    trigram TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    PRIMARY KEY (trigram, user_id)
+                ) WITHOUT ROWID
+            """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_user_search_trigrams_user ON user_search_trigrams(user_id)"
+            )
+            await db.commit()
+
+        count = await self.rebuild_user_search()
+        logger.info(f"✅ Пошукові поля користувачів заповнено ({count} користувачів)")
+
+    async def _create_subscription_digests(self) -> None:
+        """Міграція до версії 7: режим доставки підписок та черга сповіщень pending_notifications"""
+        async with self._connect() as db:
+            async with db.execute("PRAGMA table_info(subscriptions)") as cursor:
+                existing = {row[1] for row in await cursor.fetchall()}
+            if "digest_mode" not in existing:
+                await db.execute("ALTER TABLE subscriptions ADD COLUMN digest_mode TEXT NOT NULL DEFAULT 'instant'")
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pending_notifications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    subscription_id INTEGER NOT NULL,
+                    vehicle_id INTEGER NOT NULL,
+                    due_at TIMESTAMP NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (subscription_id, vehicle_id)
+                )
+            """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_pending_notifications_due ON pending_notifications(due_at, user_id)"
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_pending_notifications_user ON pending_notifications(user_id, due_at)"
+            )
+            await db.commit()
+        logger.info("✅ Створено чергу сповіщень підписок pending_notifications")
+
+    async def _create_subscription_match_indexes(self) -> None:
+        """Міграція до версії 8: часткові індекси доступних авто для попереднього перегляду підписок"""
+        async with self._connect() as db:
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vehicles_available_type "
+                f"ON vehicles(vehicle_type, created_at) WHERE {AVAILABLE_VEHICLE_SQL}"
+            )
+            await db.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_vehicles_available_created ON vehicles(created_at) WHERE {AVAILABLE_VEHICLE_SQL}"
+            )
+            await db.commit()
+        logger.info("✅ Створено індекси доступних авто для підписок")
+
+    async def _create_vehicle_brand_search(self) -> None:
+        """Міграція до версії 9: нормалізований бренд brand_search для умов підписок (див. fold_brand)"""
+        async with self._connect() as db:
+            for table in ("vehicles", "vehicles_archive"):
+                async with db.execute(f"PRAGMA table_info({table})") as cursor:
+                    existing = {row[1] for row in await cursor.fetchall()}
+                if "brand_search" not in existing:
+                    await db.execute(f"ALTER TABLE {table} ADD COLUMN brand_search TEXT NOT NULL DEFAULT ''")
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vehicles_available_brand "
+                f"ON vehicles(brand_search, created_at) WHERE {AVAILABLE_VEHICLE_SQL}"
+            )
+            await self._create_vehicles_all_view(db)
+            await db.commit()
+
+        count = await self.rebuild_vehicle_brand_search()
+        logger.info(f"✅ Нормалізовані бренди авто заповнено ({count} авто)")
+
     # Методи для роботи з користувачами
     async def create_user(self, user: UserModel) -> int:
         """Створити нового користувача"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             cursor = await db.execute(
                 """
                 INSERT INTO users (telegram_id, username, first_name, last_name, 
@@ -602,12 +1136,16 @@ class DatabaseManager:
                     user.is_active,
                 ),
             )
+            await self._store_user_search(
+                db, cursor.lastrowid, user.first_name, user.last_name, user.username, user.phone
+            )
             await db.commit()
+            self._users_changed()
             return cursor.lastrowid
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[UserModel]:
         """Отримати користувача за Telegram ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM users WHERE telegram_id = ?", (telegram_id,)
@@ -624,9 +1162,12 @@ class DatabaseManager:
         set_clause = ", ".join([f"{key} = ?" for key in updates.keys()])
         values = list(updates.values()) + [user_id]
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(f"UPDATE users SET {set_clause} WHERE id = ?", values)
+            if _USER_SEARCH_SOURCES & updates.keys():
+                await self._refresh_user_search(db, user_id)
             await db.commit()
+            self._users_changed()
             return True
 
     async def promote_to_admin(self, user_id: int) -> bool:
@@ -639,7 +1180,7 @@ class DatabaseManager:
 
     async def get_admins(self) -> List[UserModel]:
         """Отримати всіх адміністраторів"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """
@@ -653,7 +1194,7 @@ class DatabaseManager:
 
     async def get_buyers(self) -> List[UserModel]:
         """Отримати всіх покупців"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """
@@ -667,7 +1208,7 @@ class DatabaseManager:
 
     async def get_all_users(self) -> list:
         """Отримати всіх користувачів (для експорту - без валідації)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM users ORDER BY created_at DESC"
@@ -678,10 +1219,10 @@ class DatabaseManager:
     
     async def get_all_vehicles(self) -> list:
         """Отримати всі авто (для експорту - без валідації)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT * FROM vehicles ORDER BY created_at DESC"
+                "SELECT * FROM vehicles_all ORDER BY created_at DESC"
             ) as cursor:
                 rows = await cursor.fetchall()
                 # Повертаємо словники без валідації для експорту
@@ -689,7 +1230,7 @@ class DatabaseManager:
     
     async def get_all_requests(self) -> list:
         """Отримати всі заявки"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM manager_requests ORDER BY created_at DESC"
@@ -700,7 +1241,7 @@ class DatabaseManager:
     
     async def get_all_broadcasts_raw(self) -> list:
         """Отримати всі розсилки (для експорту - без валідації)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM broadcasts ORDER BY created_at DESC"
@@ -709,74 +1250,148 @@ class DatabaseManager:
                 # Повертаємо словники без валідації для експорту
                 return [dict(row) for row in rows]
 
+    async def get_export_page(self, table: str, after_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Сторінка рядків таблиці для потокового експорту (keyset по id, без OFFSET)"""
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Таблиця {table} недоступна для експорту")
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                f"SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+            ) as cursor:
+                return [dict(row) for row in await cursor.fetchall()]
+
+    async def get_changed_rows_page(
+        self,
+        table: str,
+        changed_since: Optional[str],
+        after: Optional[tuple] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """Сторінка рядків, змінених або створених не раніше changed_since (None - усі).
+
+        Рядки йдуть у порядку (час зміни, id) за індексом idx_<table>_changed_at;
+        after - (_changed_at, id) останнього рядка попередньої сторінки.
+        Кожен рядок має поле _changed_at - нормалізований час зміни (для водяного знака).
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Таблиця {table} недоступна для експорту")
+        changed_at = EXPORT_CHANGED_AT_SQL[table]
+        where = "1"
+        params: List[Any] = []
+        if after is not None:
+            where = f"{changed_at} >= ? AND ({changed_at} > ? OR id > ?)"
+            params = [after[0], after[0], after[1]]
+        elif changed_since:
+            where = f"{changed_at} >= ?"
+            params = [changed_since]
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                f"""
+                SELECT *, {changed_at} AS _changed_at FROM {table}
+                WHERE {where}
+                ORDER BY {changed_at}, id
+                LIMIT ?
+            """,
+                params + [limit],
+            ) as cursor:
+                return [dict(row) for row in await cursor.fetchall()]
+
+    async def get_deleted_rows(self, dataset: str, after_id: int = 0) -> List[Dict[str, Any]]:
+        """Записи журналу видалень розділу після after_id"""
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT id, row_id, deleted_at FROM deleted_rows WHERE dataset = ? AND id > ? ORDER BY id",
+                (dataset, after_id),
+            ) as cursor:
+                return [dict(row) for row in await cursor.fetchall()]
+
+    async def get_export_watermark(self, export_type: str, dataset: str) -> Optional[Dict[str, Any]]:
+        """Водяний знак інкрементального експорту або None, якщо такого експорту ще не було"""
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM export_watermarks WHERE export_type = ? AND dataset = ?",
+                (export_type, dataset),
+            ) as cursor:
+                row = await cursor.fetchone()
+                return dict(row) if row else None
+
+    async def save_export_watermarks(self, export_type: str, watermarks: Dict[str, tuple]) -> None:
+        """Зберегти водяні знаки: {dataset: (changed_since, last_deletion_id)}"""
+        async with self._connect() as db:
+            await db.executemany(
+                """
+                INSERT INTO export_watermarks (export_type, dataset, changed_since, last_deletion_id, exported_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(export_type, dataset) DO UPDATE SET
+                    changed_since = excluded.changed_since,
+                    last_deletion_id = excluded.last_deletion_id,
+                    exported_at = CURRENT_TIMESTAMP
+                """,
+                [
+                    (export_type, dataset, changed_since, last_deletion_id)
+                    for dataset, (changed_since, last_deletion_id) in watermarks.items()
+                ],
+            )
+            await db.commit()
+
     async def get_users(self, limit: int = 10, offset: int = 0, sort_by: str = "created_at_desc", 
                        status_filter: str = "all") -> List[UserModel]:
         """Отримати користувачів з пагінацією та фільтрацією"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            
-            # Формуємо WHERE умову для фільтрації
-            where_conditions = []
-            params = []
-            
-            if status_filter == "active":
-                where_conditions.append("is_active = 1")
-            elif status_filter == "blocked":
-                where_conditions.append("is_active = 0")
-            
-            where_clause = ""
-            if where_conditions:
-                where_clause = "WHERE " + " AND ".join(where_conditions)
-            
-            # Формуємо ORDER BY
-            order_by = "created_at DESC"
-            if sort_by == "created_at_asc":
-                order_by = "created_at ASC"
-            elif sort_by == "created_at_desc":
-                order_by = "created_at DESC"
-            elif sort_by == "name_asc":
-                order_by = "first_name ASC, last_name ASC"
-            elif sort_by == "name_desc":
-                order_by = "first_name DESC, last_name DESC"
-            elif sort_by == "role_asc":
-                order_by = "role ASC"
-            elif sort_by == "role_desc":
-                order_by = "role DESC"
-            
-            query = f"""
-                SELECT * FROM users 
-                {where_clause}
-                ORDER BY {order_by}
-                LIMIT ? OFFSET ?
-            """
-            
-            async with db.execute(query, params + [limit, offset]) as cursor:
-                rows = await cursor.fetchall()
-                return [UserModel(**dict(row)) for row in rows]
+        async with self._connect() as db:
+            return await self._fetch_users_page(db, limit, offset, sort_by, status_filter)
+
+    async def _fetch_users_page(self, db, limit: int, offset: int, sort_by: str, status_filter: str) -> List[UserModel]:
+        db.row_factory = aiosqlite.Row
+        query = f"""
+            SELECT * FROM users 
+            {_users_where(status_filter)}
+            ORDER BY {_USERS_ORDER_BY.get(sort_by, "created_at DESC")}
+            LIMIT ? OFFSET ?
+        """
+        async with db.execute(query, (limit, offset)) as cursor:
+            rows = await cursor.fetchall()
+            return [UserModel(**dict(row)) for row in rows]
 
     async def get_users_count(self, status_filter: str = "all") -> int:
         """Отримати загальну кількість користувачів з фільтрацією"""
-        async with aiosqlite.connect(self.db_path) as db:
-            where_conditions = []
-            
-            if status_filter == "active":
-                where_conditions.append("is_active = 1")
-            elif status_filter == "blocked":
-                where_conditions.append("is_active = 0")
-            
-            where_clause = ""
-            if where_conditions:
-                where_clause = "WHERE " + " AND ".join(where_conditions)
-            
-            query = f"SELECT COUNT(*) as count FROM users {where_clause}"
+        async with self._connect() as db:
+            query = f"SELECT COUNT(*) as count FROM users {_users_where(status_filter)}"
             
             async with db.execute(query) as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else 0
 
+    async def get_users_page(
+        self, limit: int = 10, offset: int = 0, sort_by: str = "created_at_desc", status_filter: str = "all"
+    ) -> Tuple[List[UserModel], int, Dict[str, Any]]:
+        """Сторінка списку користувачів за одне звернення до БД
+
+        Returns:
+            (користувачі сторінки, кількість за фільтром, статистика як у get_users_statistics)
+
+        Кількість за фільтром береться зі статистики. Якщо статистики немає в пам'яті,
+        вона та сторінка читаються в одній транзакції і узгоджені між собою.
+        """
+        stats = self._cached_users_statistics()
+        async with self._connect() as db:
+            if stats is not None:
+                users = await self._fetch_users_page(db, limit, offset, sort_by, status_filter)
+            else:
+                await db.execute("BEGIN")
+                try:
+                    stats = await self._load_users_statistics(db)
+                    users = await self._fetch_users_page(db, limit, offset, sort_by, status_filter)
+                finally:
+                    await db.rollback()
+        return users, stats[_USERS_FILTER_TOTALS.get(status_filter, "total_users")], stats
+
     async def get_user_by_id(self, user_id: int) -> Optional[UserModel]:
         """Отримати користувача за ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM users WHERE id = ?", (user_id,)
@@ -794,14 +1409,16 @@ class DatabaseManager:
 
     async def delete_user(self, user_id: int) -> bool:
         """Видалити користувача"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            await db.execute("DELETE FROM user_search_trigrams WHERE user_id = ?", (user_id,))
             await db.commit()
+            self._users_changed()
             return True
 
     async def search_users_by_id(self, user_id: int) -> List[UserModel]:
         """Пошук користувача за ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM users WHERE id = ?", (user_id,)
@@ -811,7 +1428,7 @@ class DatabaseManager:
 
     async def search_users_by_telegram_id(self, telegram_id: int) -> List[UserModel]:
         """Пошук користувача за Telegram ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM users WHERE telegram_id = ?", (telegram_id,)
@@ -819,35 +1436,120 @@ class DatabaseManager:
                 rows = await cursor.fetchall()
                 return [UserModel(**dict(row)) for row in rows]
 
-    async def search_users_by_name(self, name: str) -> List[UserModel]:
-        """Пошук користувачів за іменем або прізвищем"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            search_term = f"%{name}%"
-            async with db.execute(
-                """
-                SELECT * FROM users 
-                WHERE first_name LIKE ? OR last_name LIKE ? OR username LIKE ?
-                ORDER BY created_at DESC
-                """, (search_term, search_term, search_term)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [UserModel(**dict(row)) for row in rows]
+    # ===== Пошук користувачів (нормалізовані колонки, див. user_search.py) =====
 
-    async def search_users_by_phone(self, phone: str) -> List[UserModel]:
-        """Пошук користувачів за номером телефону"""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def _store_user_search(self, db, user_id: int, first_name, last_name, username, phone) -> None:
+        """Записати нормалізовані поля та триграми користувача (в межах транзакції db)"""
+        fields = user_search_fields(first_name, last_name, username, phone)
+        await db.execute(
+            """
+            UPDATE users SET phone_digits = ?, phone_digits_rev = ?, name_search = ?, username_search = ?
+            WHERE id = ?
+        """,
+            (fields["phone_digits"], fields["phone_digits_rev"], fields["name_search"],
+             fields["username_search"], user_id),
+        )
+        await db.execute("DELETE FROM user_search_trigrams WHERE user_id = ?", (user_id,))
+        await db.executemany(
+            "INSERT INTO user_search_trigrams (trigram, user_id) VALUES (?, ?)",
+            [(trigram, user_id) for trigram in trigrams(search_text(fields))],
+        )
+
+    async def _refresh_user_search(self, db, user_id: int) -> None:
+        async with db.execute(
+            "SELECT first_name, last_name, username, phone FROM users WHERE id = ?", (user_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row:
+            await self._store_user_search(db, user_id, *row)
+
+    async def rebuild_user_search(self, batch_size: int = 1000) -> int:
+        """Перерахувати пошукові поля всіх користувачів (міграція, імпорт даних напряму в БД)"""
+        count = 0
+        last_id = 0
+        async with self._connect() as db:
+            while True:
+                async with db.execute(
+                    "SELECT id, first_name, last_name, username, phone FROM users WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ) as cursor:
+                    rows = await cursor.fetchall()
+                if not rows:
+                    break
+                for user_id, *fields in rows:
+                    await self._store_user_search(db, user_id, *fields)
+                await db.commit()
+                count += len(rows)
+                last_id = rows[-1][0]
+        return count
+
+    async def _search_users(self, where: str, params: list, limit: int) -> List[UserModel]:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
-            search_term = f"%{phone}%"
             async with db.execute(
-                "SELECT * FROM users WHERE phone LIKE ? ORDER BY created_at DESC", (search_term,)
+                f"SELECT * FROM users WHERE {where} ORDER BY created_at DESC LIMIT ?", params + [limit]
             ) as cursor:
                 rows = await cursor.fetchall()
                 return [UserModel(**dict(row)) for row in rows]
 
+    async def _search_users_by_text(self, query: str, column_sql: str, prefix_columns: tuple, limit: int) -> List[UserModel]:
+        """Пошук підрядка query у column_sql: за триграмами, для коротких запитів - за початком"""
+        query = fold_text(query)
+        if not query:
+            return []
+        grams = trigrams(query)
+        if not grams:
+            start, end = prefix_range(query)
+            where = " OR ".join(f"({column} >= ? AND {column} < ?)" for column in prefix_columns)
+            return await self._search_users(where, [start, end] * len(prefix_columns), limit)
+
+        placeholders = ", ".join("?" for _ in grams)
+        # Триграми відбирають кандидатів за індексом, instr відкидає збіги триграм не підряд
+        where = f"""
+            id IN (
+                SELECT user_id FROM user_search_trigrams
+                WHERE trigram IN ({placeholders})
+                GROUP BY user_id HAVING COUNT(*) = ?
+            )
+            AND instr({column_sql}, ?) > 0
+        """
+        return await self._search_users(where, list(grams) + [len(grams), query], limit)
+
+    async def search_users_by_name(self, name: str, limit: int = 100) -> List[UserModel]:
+        """Пошук користувачів за іменем, прізвищем або username (без урахування регістру)"""
+        return await self._search_users_by_text(
+            name, "name_search || ' ' || username_search", ("name_search", "username_search"), limit
+        )
+
+    async def search_users_by_username(self, username: str, limit: int = 100) -> List[UserModel]:
+        """Пошук користувачів за username (без урахування регістру, з @ або без)"""
+        return await self._search_users_by_text(username, "username_search", ("username_search",), limit)
+
+    async def search_users_by_phone(self, phone: str, limit: int = 100) -> List[UserModel]:
+        """Пошук користувачів за номером телефону в будь-якому форматі.
+
+        Збіг за кінцем номера (0671234567 знаходить +380671234567) або за початком
+        (0671 - це +380671...).
+        """
+        digits = phone_digits(phone)
+        if not digits:
+            return []
+        conditions = ["(phone_digits_rev >= ? AND phone_digits_rev < ?)"]
+        params = list(prefix_range(digits[::-1]))
+        prefixes = [digits]
+        if digits.startswith("0"):
+            # Локальний формат: 0XX... зберігається як 380XX...
+            prefixes.append("38" + digits)
+        for prefix in prefixes:
+            conditions.append("(phone_digits >= ? AND phone_digits < ?)")
+            params.extend(prefix_range(prefix))
+        # Кожна умова - окремий пошук за своїм індексом
+        where = "id IN (" + " UNION ".join(f"SELECT id FROM users WHERE {condition}" for condition in conditions) + ")"
+        return await self._search_users(where, params, limit)
+
     async def search_users_by_role(self, role: str) -> List[UserModel]:
         """Пошук користувачів за роллю"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM users WHERE role = ? ORDER BY created_at DESC", (role,)
@@ -855,45 +1557,47 @@ class DatabaseManager:
                 rows = await cursor.fetchall()
                 return [UserModel(**dict(row)) for row in rows]
 
-    async def search_users_by_username(self, username: str) -> List[UserModel]:
-        """Пошук користувачів за username"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            search_term = f"%{username}%"
-            async with db.execute(
-                "SELECT * FROM users WHERE username LIKE ? ORDER BY created_at DESC", (search_term,)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [UserModel(**dict(row)) for row in rows]
+    def _cached_users_statistics(self) -> Optional[Dict[str, Any]]:
+        snapshot = _user_stats_snapshots.get(self.db_path)
+        if snapshot is not None and asyncio.get_running_loop().time() - snapshot[0] < settings.user_stats_ttl:
+            return snapshot[1]
+        return None
+
+    async def _load_users_statistics(self, db) -> Dict[str, Any]:
+        """Статистика одним запитом (GROUP BY role з умовними сумами) та запис знімка"""
+        loaded_at = asyncio.get_running_loop().time()
+        stats = {'total_users': 0, 'active_users': 0, 'blocked_users': 0, 'users_by_role': {}}
+        async with db.execute(
+            """
+            SELECT role, COUNT(*), SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN is_active = 0 THEN 1 ELSE 0 END)
+            FROM users GROUP BY role
+        """
+        ) as cursor:
+            for role, total, active, blocked in await cursor.fetchall():
+                stats['total_users'] += total
+                stats['active_users'] += active
+                stats['blocked_users'] += blocked
+                stats['users_by_role'][role] = total
+        _user_stats_snapshots[self.db_path] = (loaded_at, stats)
+        return stats
 
     async def get_users_statistics(self) -> Dict[str, Any]:
-        """Отримати статистику користувачів"""
-        async with aiosqlite.connect(self.db_path) as db:
-            stats = {}
-            
-            # Загальна кількість користувачів
-            async with db.execute("SELECT COUNT(*) FROM users") as cursor:
-                stats['total_users'] = (await cursor.fetchone())[0]
-            
-            # Активні користувачі
-            async with db.execute("SELECT COUNT(*) FROM users WHERE is_active = 1") as cursor:
-                stats['active_users'] = (await cursor.fetchone())[0]
-            
-            # Заблоковані користувачі
-            async with db.execute("SELECT COUNT(*) FROM users WHERE is_active = 0") as cursor:
-                stats['blocked_users'] = (await cursor.fetchone())[0]
-            
-            # Користувачі по ролях
-            async with db.execute("SELECT role, COUNT(*) FROM users GROUP BY role") as cursor:
-                role_stats = await cursor.fetchall()
-                stats['users_by_role'] = {role: count for role, count in role_stats}
-            
+        """Отримати статистику користувачів
+
+        Віддається зі знімка в пам'яті; знімок скидається при змінах користувачів
+        через DatabaseManager та застаріває через USER_STATS_TTL.
+        """
+        stats = self._cached_users_statistics()
+        if stats is not None:
             return stats
+        async with self._connect() as db:
+            return await self._load_users_statistics(db)
 
     # Методи для роботи з авто
     async def create_vehicle(self, vehicle: VehicleModel) -> int:
         """Створити новий автомобіль"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             # Конвертуємо photos в JSON рядок
             photos_json = json.dumps(vehicle.photos) if vehicle.photos else "[]"
             
@@ -934,6 +1638,7 @@ class DatabaseManager:
                 vehicle.vin_code,                 # 33 vin_code
                 vehicle.status_changed_at.isoformat() if vehicle.status_changed_at else None,  # 34 status_changed_at
                 vehicle.sold_at.isoformat() if vehicle.sold_at else None,  # 35 sold_at
+                fold_brand(vehicle.brand),        # 36 brand_search
             )
             
             logger.info(f"📊 create_vehicle: передаємо {len(values)} значень")
@@ -948,19 +1653,24 @@ class DatabaseManager:
                                     seller_id, created_at, updated_at, fuel_type, is_active,
                                     views_count, published_at,
                                     published_in_group, published_in_bot, group_message_id,
-                                    bot_message_id, photos, vin_code, status_changed_at, sold_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                    bot_message_id, photos, vin_code, status_changed_at, sold_at,
+                                    brand_search)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 values,
             )
+            vehicle_id = cursor.lastrowid
+            if vehicle.photos or vehicle.main_photo:
+                await self._load_media_from_json(db, vehicle_id)
             await db.commit()
-            return cursor.lastrowid
+            self._vehicles_changed([vehicle_id])
+            return vehicle_id
 
     async def get_vehicles(
         self, limit: int = 20, offset: int = 0, sort_by: str = "created_at_desc"
     ) -> List[VehicleModel]:
         """Отримати список авто з можливістю сортування"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             
             # Визначаємо порядок сортування
@@ -984,7 +1694,7 @@ class DatabaseManager:
             
             async with db.execute(
                 f"""
-                SELECT * FROM vehicles 
+                SELECT * FROM vehicles_all
                 WHERE is_active = 1
                 {order_clause}
                 LIMIT ? OFFSET ?
@@ -1002,7 +1712,7 @@ class DatabaseManager:
         self, limit: int = 20, offset: int = 0, sort_by: str = "created_at_desc"
     ) -> List[VehicleModel]:
         """Отримати список доступних авто (не проданих) для клієнтів"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             
             # Визначаємо порядок сортування
@@ -1053,7 +1763,7 @@ class DatabaseManager:
         """
         if not types:
             return []
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
 
             order_clause = "ORDER BY created_at DESC"
@@ -1094,25 +1804,61 @@ class DatabaseManager:
 
     async def get_vehicles_count(self) -> int:
         """Отримати загальну кількість активних авто"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
-                "SELECT COUNT(*) as count FROM vehicles WHERE is_active = 1"
+                "SELECT COUNT(*) as count FROM vehicles_all WHERE is_active = 1"
             ) as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else 0
 
     async def get_available_vehicles_count(self) -> int:
         """Отримати кількість доступних авто (не проданих) для клієнтів"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
                 "SELECT COUNT(*) as count FROM vehicles WHERE is_active = 1 AND (status IS NULL OR status != 'sold')"
             ) as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else 0
 
+    async def rebuild_vehicle_facets(self) -> int:
+        """Перерахувати vehicle_facets з нуля (тригери далі підтримують їх самі)"""
+        selects = [
+            f"SELECT '{facet}', {expression}, COUNT(*) FROM vehicles "
+            f"WHERE {_AVAILABLE_SQL.format(row='')} GROUP BY 2"
+            for facet, expression in _vehicle_facet_sql()
+        ]
+        async with self._connect() as db:
+            await db.execute("DELETE FROM vehicle_facets")
+            cursor = await db.execute(
+                "INSERT INTO vehicle_facets (facet, value, count) " + " UNION ALL ".join(selects)
+            )
+            await db.commit()
+            _facets_snapshots.pop(self.db_path, None)
+            return cursor.rowcount
+
+    async def get_vehicle_facets(self) -> Dict[str, Dict[str, int]]:
+        """Лічильники доступних авто: {facet: {value: count}}.
+
+        facet: total ('all'), vehicle_type, condition, price_bucket (див. PRICE_BUCKETS).
+        Віддається зі знімка в пам'яті; знімок скидається при змінах авто через
+        цей менеджер та застаріває через CATALOG_FACETS_TTL.
+        """
+        snapshot = _facets_snapshots.get(self.db_path)
+        now = asyncio.get_running_loop().time()
+        if snapshot is not None and now - snapshot[0] < settings.catalog_facets_ttl:
+            return snapshot[1]
+
+        facets: Dict[str, Dict[str, int]] = {facet: {} for facet, _ in _vehicle_facet_sql()}
+        async with self._connect() as db:
+            async with db.execute("SELECT facet, value, count FROM vehicle_facets WHERE count > 0") as cursor:
+                for facet, value, count in await cursor.fetchall():
+                    facets.setdefault(facet, {})[value] = count
+        _facets_snapshots[self.db_path] = (now, facets)
+        return facets
+
     async def search_vehicles_by_name(self, query: str) -> List[VehicleModel]:
         """Пошук авто за назвою (бренд або модель)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             search_term = f"%{query.lower()}%"
             async with db.execute(
@@ -1129,21 +1875,45 @@ class DatabaseManager:
                 return [VehicleModel(**self._process_vehicle_data(dict(row))) for row in rows]
 
     async def get_vehicle_by_id(self, vehicle_id: int) -> Optional[VehicleModel]:
-        """Отримати авто за ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Отримати авто за ID.
+
+        Якщо авто немає в vehicles, шукає в архіві проданих (vehicles_archive).
+        Читає через кеш у пам'яті (VEHICLE_CACHE_SIZE): зміни авто через
+        DatabaseManager скидають запис, відсутні ID теж кешуються.
+        Повертається копія - її можна змінювати, не зачіпаючи кеш.
+        """
+        key = (self.db_path, vehicle_id)
+        cached = _vehicle_cache.get(key)
+        if cached is MISSING:
+            return None
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        version = _vehicle_cache.version(key)
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM vehicles WHERE id = ?", (vehicle_id,)
             ) as cursor:
                 row = await cursor.fetchone()
-                return VehicleModel(**self._process_vehicle_data(dict(row))) if row else None
+            if row is None:
+                async with db.execute(
+                    "SELECT * FROM vehicles_archive WHERE id = ?", (vehicle_id,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+        if row is None:
+            _vehicle_cache.put(key, MISSING, version)
+            return None
+        vehicle = VehicleModel(**self._process_vehicle_data(dict(row)))
+        _vehicle_cache.put(key, vehicle, version)
+        return vehicle.model_copy(deep=True)
 
     async def get_vehicle_by_id_from_message_id(self, message_id: int) -> Optional[VehicleModel]:
         """Отримати авто за group_message_id"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT * FROM vehicles WHERE group_message_id = ?", (message_id,)
+                "SELECT * FROM vehicles_all WHERE group_message_id = ?", (message_id,)
             ) as cursor:
                 row = await cursor.fetchone()
                 return VehicleModel(**self._process_vehicle_data(dict(row))) if row else None
@@ -1206,7 +1976,7 @@ class DatabaseManager:
         sort_by = filters.get("sort_by", "created_at_desc")
         order_clause = self._get_sort_clause(sort_by)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 f"""
@@ -1237,7 +2007,7 @@ class DatabaseManager:
 
     async def upsert_group_topic(self, thread_id: int, name: str) -> int:
         """Додати або оновити гілку групи"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             # Спробуємо оновити, якщо існує
             await db.execute(
                 "UPDATE group_topics SET name = ? WHERE thread_id = ?",
@@ -1255,7 +2025,7 @@ class DatabaseManager:
 
     async def get_group_topics(self) -> List[GroupTopicModel]:
         """Отримати всі збережені гілки групи"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM group_topics ORDER BY name ASC") as c:
                 rows = await c.fetchall()
@@ -1263,13 +2033,13 @@ class DatabaseManager:
 
     async def delete_group_topic(self, thread_id: int) -> None:
         """Видалити гілку групи за thread_id"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute("DELETE FROM group_topics WHERE thread_id = ?", (thread_id,))
             await db.commit()
 
     async def update_group_topic_thread_id(self, old_thread_id: int, new_thread_id: int) -> None:
         """Оновити thread_id гілки"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 "UPDATE group_topics SET thread_id = ? WHERE thread_id = ?",
                 (new_thread_id, old_thread_id),
@@ -1278,7 +2048,7 @@ class DatabaseManager:
 
     async def create_broadcast(self, data: Dict[str, Any]) -> int:
         """Зберегти чернетку/історію розсилки"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             cursor = await db.execute(
                 """
                 INSERT INTO broadcasts (text, button_text, button_url, media_type, media_file_id, media_group_id, status, schedule_period, scheduled_at, created_at)
@@ -1307,7 +2077,7 @@ class DatabaseManager:
         status_filter: str = "all"
     ) -> List[BroadcastModel]:
         """Отримати список розсилок з пагінацією, сортуванням та фільтрацією"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             
             # Визначаємо сортування
@@ -1344,62 +2114,362 @@ class DatabaseManager:
     
     async def get_broadcasts_count(self, status_filter: str = "all") -> int:
         """Отримати загальну кількість розсилок з фільтром"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             if status_filter == "sent":
                 query = "SELECT COUNT(*) FROM broadcasts WHERE status = 'sent'"
             elif status_filter == "draft":
                 query = "SELECT COUNT(*) FROM broadcasts WHERE status = 'draft'"
             else:
-                query = "SELECT COUNT(*) FROM broadcasts"
-            
-            async with db.execute(query) as c:
-                row = await c.fetchone()
+                query = "SELECT COUNT(*) FROM broadcasts"
+            
+            async with db.execute(query) as c:
+                row = await c.fetchone()
+                return row[0] if row else 0
+    
+    async def get_broadcasts_statistics(self) -> dict:
+        """Отримати статистику розсилок"""
+        async with self._connect() as db:
+            total = await self.get_broadcasts_count("all")
+            sent = await self.get_broadcasts_count("sent")
+            draft = await self.get_broadcasts_count("draft")
+            
+            return {
+                'total_broadcasts': total,
+                'sent_broadcasts': sent,
+                'draft_broadcasts': draft,
+            }
+    
+    async def get_broadcast_by_id(self, broadcast_id: int) -> Optional[BroadcastModel]:
+        """Отримати розсилку за ID"""
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM broadcasts WHERE id = ?", (broadcast_id,)) as c:
+                row = await c.fetchone()
+                if not row:
+                    return None
+                
+                broadcast_data = dict(row)
+                # Обробка дат
+                if broadcast_data.get('created_at'):
+                    if isinstance(broadcast_data['created_at'], str):
+                        broadcast_data['created_at'] = datetime.fromisoformat(broadcast_data['created_at'])
+                if broadcast_data.get('scheduled_at'):
+                    if isinstance(broadcast_data['scheduled_at'], str):
+                        broadcast_data['scheduled_at'] = datetime.fromisoformat(broadcast_data['scheduled_at'])
+                
+                return BroadcastModel(**broadcast_data)
+
+    async def delete_broadcast(self, broadcast_id: int) -> bool:
+        """Видалити розсилку з БД"""
+        try:
+            async with self._connect() as db:
+                await db.execute("DELETE FROM broadcasts WHERE id = ?", (broadcast_id,))
+                await db.commit()
+                logger.info(f"✅ Розсилку {broadcast_id} видалено з БД")
+                return True
+        except Exception as e:
+            logger.error(f"❌ Помилка видалення розсилки {broadcast_id}: {e}")
+            return False
+
+    # ===== Черга публікацій =====
+
+    async def enqueue_publication_job(
+        self, vehicle_id: int, action: str, requested_by: int = None, max_attempts: int = 5
+    ) -> int:
+        """Поставити задачу публікації в чергу (без дублікатів для активних задач)"""
+        async with self._connect() as db:
+            async with db.execute(
+                """
+                SELECT id FROM publication_jobs
+                WHERE vehicle_id = ? AND action = ? AND status IN ('pending', 'running')
+                """,
+                (vehicle_id, action),
+            ) as cursor:
+                existing = await cursor.fetchone()
+                if existing:
+                    return existing[0]
+
+            now = datetime.now().isoformat()
+            cursor = await db.execute(
+                """
+                INSERT INTO publication_jobs
+                (vehicle_id, action, status, max_attempts, next_run_at, requested_by, created_at, updated_at)
+                VALUES (?, ?, 'pending', ?, ?, ?, ?, ?)
+                """,
+                (vehicle_id, action, max_attempts, now, requested_by, now, now),
+            )
+            await db.commit()
+            return cursor.lastrowid
+
+    async def claim_next_publication_job(self) -> Optional[Dict[str, Any]]:
+        """Взяти наступну готову до виконання задачу та позначити її як running"""
+        now = datetime.now().isoformat()
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                """
+                SELECT * FROM publication_jobs
+                WHERE status = 'pending' AND (next_run_at IS NULL OR next_run_at <= ?)
+                ORDER BY next_run_at ASC, id ASC
+                LIMIT 1
+                """,
+                (now,),
+            ) as cursor:
+                row = await cursor.fetchone()
+            if not row:
+                return None
+
+            cursor = await db.execute(
+                """
+                UPDATE publication_jobs
+                SET status = 'running', attempts = attempts + 1, updated_at = ?
+                WHERE id = ? AND status = 'pending'
+                """,
+                (now, row["id"]),
+            )
+            await db.commit()
+            if not cursor.rowcount:
+                return None
+
+            job = dict(row)
+            job["attempts"] += 1
+            job["status"] = "running"
+            job["album_message_ids"] = json.loads(job["album_message_ids"]) if job.get("album_message_ids") else []
+            return job
+
+    async def get_next_publication_job_time(self) -> Optional[datetime]:
+        """Час найближчої відкладеної задачі"""
+        async with self._connect() as db:
+            async with db.execute(
+                "SELECT MIN(next_run_at) FROM publication_jobs WHERE status = 'pending'"
+            ) as cursor:
+                row = await cursor.fetchone()
+                return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    async def save_publication_job_progress(
+        self, job_id: int, album_message_ids: List[int] = None, reply_message_id: int = None
+    ) -> None:
+        """Зберегти проміжний результат задачі (для ідемпотентного повтору)"""
+        async with self._connect() as db:
+            await db.execute(
+                """
+                UPDATE publication_jobs
+                SET album_message_ids = ?, reply_message_id = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    json.dumps(album_message_ids) if album_message_ids else None,
+                    reply_message_id,
+                    datetime.now().isoformat(),
+                    job_id,
+                ),
+            )
+            await db.commit()
+
+    async def complete_publication_job(self, job_id: int, vehicle_id: int, vehicle_updates: Dict[str, Any]) -> None:
+        """Завершити задачу та оновити стан публікації авто в одній транзакції"""
+        now = datetime.now().isoformat()
+        set_clause = ", ".join([f"{key} = ?" for key in vehicle_updates.keys()])
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in vehicle_updates.values()
+        ]
+        async with self._connect() as db:
+            await db.execute(
+                f"UPDATE vehicles SET {set_clause}, updated_at = ? WHERE id = ?",
+                values + [now, vehicle_id],
+            )
+            await db.execute(
+                """
+                UPDATE publication_jobs
+                SET status = 'done', last_error = NULL, updated_at = ?, finished_at = ?
+                WHERE id = ?
+                """,
+                (now, now, job_id),
+            )
+            await db.commit()
+            self._vehicles_changed([vehicle_id])
+
+    async def fail_publication_job(self, job_id: int, error: str, retry_at: Optional[datetime] = None) -> None:
+        """Зафіксувати помилку задачі: повернути в чергу з відкладенням або завершити"""
+        now = datetime.now().isoformat()
+        async with self._connect() as db:
+            if retry_at:
+                await db.execute(
+                    """
+                    UPDATE publication_jobs
+                    SET status = 'pending', last_error = ?, next_run_at = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (error, retry_at.isoformat(), now, job_id),
+                )
+            else:
+                await db.execute(
+                    """
+                    UPDATE publication_jobs
+                    SET status = 'failed', last_error = ?, updated_at = ?, finished_at = ?
+                    WHERE id = ?
+                    """,
+                    (error, now, now, job_id),
+                )
+            await db.commit()
+
+    async def reset_stale_publication_jobs(self) -> int:
+        """Повернути в чергу задачі, перервані зупинкою бота"""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                "UPDATE publication_jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+                (datetime.now().isoformat(),),
+            )
+            await db.commit()
+            return cursor.rowcount or 0
+
+    async def get_last_publication_messages(self, vehicle_id: int) -> List[int]:
+        """Отримати ID повідомлень останньої успішної публікації авто в групі"""
+        async with self._connect() as db:
+            async with db.execute(
+                """
+                SELECT album_message_ids, reply_message_id FROM publication_jobs
+                WHERE vehicle_id = ? AND status = 'done' AND action IN ('publish', 'republish')
+                ORDER BY finished_at DESC, id DESC
+                LIMIT 1
+                """,
+                (vehicle_id,),
+            ) as cursor:
+                row = await cursor.fetchone()
+                if not row:
+                    return []
+                message_ids = json.loads(row[0]) if row[0] else []
+                if row[1]:
+                    message_ids.append(row[1])
+                return message_ids
+
+    async def count_active_publication_jobs(self, requested_by: int = None) -> int:
+        """Кількість задач у черзі (pending/running)"""
+        query = "SELECT COUNT(*) FROM publication_jobs WHERE status IN ('pending', 'running')"
+        params = []
+        if requested_by is not None:
+            query += " AND requested_by = ?"
+            params.append(requested_by)
+        async with self._connect() as db:
+            async with db.execute(query, params) as cursor:
+                row = await cursor.fetchone()
                 return row[0] if row else 0
-    
-    async def get_broadcasts_statistics(self) -> dict:
-        """Отримати статистику розсилок"""
-        async with aiosqlite.connect(self.db_path) as db:
-            total = await self.get_broadcasts_count("all")
-            sent = await self.get_broadcasts_count("sent")
-            draft = await self.get_broadcasts_count("draft")
-            
-            return {
-                'total_broadcasts': total,
-                'sent_broadcasts': sent,
-                'draft_broadcasts': draft,
-            }
-    
-    async def get_broadcast_by_id(self, broadcast_id: int) -> Optional[BroadcastModel]:
-        """Отримати розсилку за ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+
+    async def enqueue_publication_jobs(
+        self, items: List[tuple], requested_by: int = None, max_attempts: int = 5
+    ) -> int:
+        """Поставити в чергу пакет задач [(vehicle_id, action), ...] однією транзакцією.
+
+        Авто, для яких така ж задача вже активна, пропускаються.
+        Повертає кількість доданих задач.
+        """
+        if not items:
+            return 0
+        now = datetime.now().isoformat()
+        rows = [
+            (vehicle_id, action, max_attempts, now, requested_by, now, now, vehicle_id, action)
+            for vehicle_id, action in items
+        ]
+        async with self._connect() as db:
+            before = db.total_changes
+            await db.executemany(
+                """
+                INSERT INTO publication_jobs
+                (vehicle_id, action, status, max_attempts, next_run_at, requested_by, created_at, updated_at)
+                SELECT ?, ?, 'pending', ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM publication_jobs
+                    WHERE vehicle_id = ? AND action = ? AND status IN ('pending', 'running')
+                )
+                """,
+                rows,
+            )
+            await db.commit()
+            return db.total_changes - before
+
+    # ===== Масові операції з авто =====
+
+    async def get_vehicles_for_bulk_action(
+        self,
+        vehicle_types: List[str] = None,
+        status: str = None,
+        older_than_days: int = None,
+    ) -> List[Dict[str, Any]]:
+        """Вибрати активні авто за фільтром (типи, статус, вік оголошення).
+
+        Повертає тільки поля, потрібні для масових дій.
+        """
+        where_conditions = ["is_active = 1"]
+        params: List[Any] = []
+
+        if vehicle_types:
+            placeholders = ", ".join("?" for _ in vehicle_types)
+            where_conditions.append(f"vehicle_type IN ({placeholders})")
+            params.extend(vehicle_types)
+        if status == "sold":
+            where_conditions.append("status = 'sold'")
+        elif status == "available":
+            where_conditions.append("(status IS NULL OR status != 'sold')")
+        if older_than_days:
+            cutoff = (datetime.now() - timedelta(days=older_than_days)).date().isoformat()
+            # date() однаково розбирає формати з 'T' та з пробілом
+            where_conditions.append("date(created_at) <= ?")
+            params.append(cutoff)
+
+        query = f"""
+            SELECT id, status, published_in_group, group_message_id
+            FROM vehicles
+            WHERE {' AND '.join(where_conditions)}
+            ORDER BY id
+        """
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM broadcasts WHERE id = ?", (broadcast_id,)) as c:
-                row = await c.fetchone()
-                if not row:
-                    return None
-                
-                broadcast_data = dict(row)
-                # Обробка дат
-                if broadcast_data.get('created_at'):
-                    if isinstance(broadcast_data['created_at'], str):
-                        broadcast_data['created_at'] = datetime.fromisoformat(broadcast_data['created_at'])
-                if broadcast_data.get('scheduled_at'):
-                    if isinstance(broadcast_data['scheduled_at'], str):
-                        broadcast_data['scheduled_at'] = datetime.fromisoformat(broadcast_data['scheduled_at'])
-                
-                return BroadcastModel(**broadcast_data)
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
 
-    async def delete_broadcast(self, broadcast_id: int) -> bool:
-        """Видалити розсилку з БД"""
+    async def bulk_update_vehicle_status(self, vehicle_ids: List[int], status: str) -> int:
+        """Змінити статус (available/sold) для списку авто однією транзакцією"""
+        if not vehicle_ids:
+            return 0
+        now = datetime.now().isoformat()
+        sold_at = now if status == "sold" else None
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("DELETE FROM broadcasts WHERE id = ?", (broadcast_id,))
+            async with self._connect() as db:
+                # rowcount executemany - лише змінені рядки vehicles, без записів тригерів vehicle_facets_*
+                cursor = await db.executemany(
+                    """
+                    UPDATE vehicles
+                    SET status = ?, status_changed_at = ?, sold_at = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    [(status, now, sold_at, now, vehicle_id) for vehicle_id in vehicle_ids],
+                )
                 await db.commit()
-                logger.info(f"✅ Розсилку {broadcast_id} видалено з БД")
-                return True
+                self._vehicles_changed(vehicle_ids)
+                return cursor.rowcount
         except Exception as e:
-            logger.error(f"❌ Помилка видалення розсилки {broadcast_id}: {e}")
-            return False
+            logger.error(f"❌ Помилка масової зміни статусу авто: {e}")
+            return 0
+
+    async def bulk_archive_vehicles(self, vehicle_ids: List[int]) -> int:
+        """Приховати оголошення (is_active = 0) для списку авто однією транзакцією"""
+        if not vehicle_ids:
+            return 0
+        now = datetime.now().isoformat()
+        try:
+            async with self._connect() as db:
+                cursor = await db.executemany(
+                    "UPDATE vehicles SET is_active = 0, updated_at = ? WHERE id = ?",
+                    [(now, vehicle_id) for vehicle_id in vehicle_ids],
+                )
+                await db.commit()
+                self._vehicles_changed(vehicle_ids)
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"❌ Помилка масового архівування авто: {e}")
+            return 0
 
     # ===== Збережені авто =====
 
@@ -1410,7 +2480,7 @@ class DatabaseManager:
         from .models import SavedVehicleModel
 
         # Перевіряємо чи вже збережено
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
                 """
                 SELECT id FROM saved_vehicles 
@@ -1427,7 +2497,7 @@ class DatabaseManager:
             user_id=user_id, vehicle_id=vehicle_id, notes=notes
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 INSERT INTO saved_vehicles 
@@ -1450,7 +2520,7 @@ class DatabaseManager:
 
     async def remove_saved_vehicle(self, user_id: int, vehicle_id: int) -> bool:
         """Видалити авто з збережених"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 DELETE FROM saved_vehicles 
@@ -1463,7 +2533,7 @@ class DatabaseManager:
 
     async def get_saved_vehicles(self, user_id: int) -> list:
         """Отримати всі збережені авто покупця"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -1480,7 +2550,7 @@ class DatabaseManager:
 
     async def is_vehicle_saved(self, user_id: int, vehicle_id: int) -> bool:
         """Перевірити чи збережено авто покупцем"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
                 """
                 SELECT 1 FROM saved_vehicles 
@@ -1495,7 +2565,7 @@ class DatabaseManager:
         self, user_id: int, vehicle_id: int, notes: str = None
     ) -> bool:
         """Оновити нотатки до збереженого авто"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 UPDATE saved_vehicles 
@@ -1511,7 +2581,7 @@ class DatabaseManager:
         self, user_id: int, vehicle_id: int, category: str
     ) -> bool:
         """Оновити категорію збереженого авто"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 UPDATE saved_vehicles 
@@ -1527,7 +2597,7 @@ class DatabaseManager:
         self, user_id: int, category: str = None
     ) -> list:
         """Отримати збережені авто за категорією"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
 
             if category:
@@ -1565,7 +2635,7 @@ class DatabaseManager:
             user_id=user_id, request_type=request_type, details=details
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 INSERT INTO manager_requests 
@@ -1631,7 +2701,7 @@ class DatabaseManager:
             query += " OFFSET ?"
             params.append(offset)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
@@ -1644,14 +2714,14 @@ class DatabaseManager:
         if status_filter in {"new", "done", "cancelled"}:
             query += " WHERE status = ?"
             params.append(status_filter)
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(query, params) as cursor:
                 row = await cursor.fetchone()
                 return int(row[0])
 
     async def get_manager_requests_stats(self) -> dict:
         """Повернути статистику заявок: total/new/done/cancelled"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             # Загальна
             async with db.execute("SELECT COUNT(*) FROM manager_requests") as c1:
                 total = int((await c1.fetchone())[0])
@@ -1669,7 +2739,7 @@ class DatabaseManager:
     async def update_manager_request_status(self, request_id: int, status: str, admin_id: int = None) -> None:
         """Оновити статус заявки з логуванням адміністратора"""
         now = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             if admin_id:
                 # Якщо передано admin_id, зберігаємо його разом з часом обробки
                 await db.execute(
@@ -1689,7 +2759,7 @@ class DatabaseManager:
     async def delete_manager_request(self, request_id: int) -> bool:
         """Видалити заявку з БД"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 await db.execute("DELETE FROM manager_requests WHERE id = ?", (request_id,))
                 await db.commit()
                 logger.info(f"✅ Заявку {request_id} видалено з БД")
@@ -1725,7 +2795,7 @@ class DatabaseManager:
             results_count=results_count,
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 INSERT INTO search_history 
@@ -1796,7 +2866,7 @@ class DatabaseManager:
 
     async def get_search_history(self, user_id: int, limit: int = 10) -> List[dict]:
         """Отримати історію пошуків користувача"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -1812,7 +2882,7 @@ class DatabaseManager:
 
     async def delete_search_history(self, user_id: int, search_id: int = None) -> bool:
         """Видалити пошук з історії"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             if search_id:
                 await db.execute(
                     """
@@ -1853,16 +2923,17 @@ class DatabaseManager:
             fuel_type=search_params.get("fuel_type"),
             load_capacity=search_params.get("load_capacity"),
             condition=search_params.get("condition"),
+            digest_mode=search_params.get("digest_mode") or "instant",
         )
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 INSERT INTO subscriptions 
                 (user_id, subscription_name, vehicle_type, brand, min_year, max_year, 
                  min_price, max_price, max_mileage, location, engine_type, 
-                 fuel_type, load_capacity, condition, is_active, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 fuel_type, load_capacity, condition, is_active, digest_mode, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     subscription.user_id,
@@ -1880,6 +2951,7 @@ class DatabaseManager:
                     subscription.load_capacity,
                     subscription.condition,
                     subscription.is_active,
+                    subscription.digest_mode,
                     subscription.created_at.isoformat(),
                     subscription.created_at.isoformat(),
                 ),
@@ -1893,7 +2965,7 @@ class DatabaseManager:
 
     async def get_user_subscriptions(self, user_id: int) -> List[dict]:
         """Отримати підписки користувача"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -1910,7 +2982,7 @@ class DatabaseManager:
         self, subscription_id: int, is_active: bool
     ) -> bool:
         """Оновити статус підписки"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 UPDATE subscriptions 
@@ -1919,25 +2991,44 @@ class DatabaseManager:
             """,
                 (is_active, subscription_id),
             )
+            if not is_active:
+                # Призупинена підписка не надсилає і того, що вже чекає в черзі
+                await db.execute("DELETE FROM pending_notifications WHERE subscription_id = ?", (subscription_id,))
             await db.commit()
             return True
 
+    async def update_subscription_digest_mode(self, user_id: int, subscription_id: int, digest_mode: str) -> bool:
+        """Змінити режим доставки підписки (instant, hourly, daily)"""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                """
+                UPDATE subscriptions 
+                SET digest_mode = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND id = ?
+            """,
+                (digest_mode, user_id, subscription_id),
+            )
+            await db.commit()
+            return cursor.rowcount > 0
+
     async def delete_subscription(self, user_id: int, subscription_id: int) -> bool:
         """Видалити підписку"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+        async with self._connect() as db:
+            cursor = await db.execute(
                 """
                 DELETE FROM subscriptions 
                 WHERE user_id = ? AND id = ?
             """,
                 (user_id, subscription_id),
             )
+            if cursor.rowcount:
+                await db.execute("DELETE FROM pending_notifications WHERE subscription_id = ?", (subscription_id,))
             await db.commit()
             return True
 
     async def get_active_subscriptions(self) -> List[dict]:
         """Отримати всі активні підписки (для перевірки нових авто)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -1949,64 +3040,68 @@ class DatabaseManager:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
     
-    async def find_vehicles_for_subscription(self, subscription: dict) -> List[VehicleModel]:
-        """Знайти авто що відповідають критеріям підписки"""
-        query = "SELECT * FROM vehicles WHERE status = 'available'"
-        params = []
-        
-        if subscription.get('vehicle_type'):
-            query += " AND vehicle_type = ?"
-            params.append(subscription['vehicle_type'])
-        
-        if subscription.get('brand'):
-            query += " AND brand = ?"
-            params.append(subscription['brand'])
-        
-        if subscription.get('min_year'):
-            query += " AND year >= ?"
-            params.append(subscription['min_year'])
-        
-        if subscription.get('max_year'):
-            query += " AND year <= ?"
-            params.append(subscription['max_year'])
-        
-        if subscription.get('min_price'):
-            query += " AND price >= ?"
-            params.append(subscription['min_price'])
-        
-        if subscription.get('max_price'):
-            query += " AND price <= ?"
-            params.append(subscription['max_price'])
-        
-        if subscription.get('max_mileage'):
-            query += " AND mileage <= ?"
-            params.append(subscription['max_mileage'])
-        
-        if subscription.get('condition'):
-            query += " AND condition = ?"
-            params.append(subscription['condition'])
+    async def find_vehicles_for_subscription(self, subscription: dict, limit: int = 100) -> List[VehicleModel]:
+        """Знайти авто що відповідають критеріям підписки (найновіші, не більше limit)"""
+        where, params = subscription_match_sql(subscription)
         
         # Додаємо фільтр тільки для нових авто (створених після останнього сповіщення)
         if subscription.get('last_notification'):
-            query += " AND created_at > ?"
+            where += " AND created_at > ?"
             params.append(subscription['last_notification'])
         
-        query += " ORDER BY created_at DESC"
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                vehicles = []
-                for row in rows:
-                    vehicle_data = dict(row)
-                    vehicle_data = self._process_vehicle_data(vehicle_data)
-                    vehicles.append(VehicleModel(**vehicle_data))
-                return vehicles
-    
+        async with self._connect() as db:
+            return await self._fetch_subscription_matches(db, where, params, limit)
+
+    async def _fetch_subscription_matches(self, db, where: str, params: list, limit: int) -> List[VehicleModel]:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            f"SELECT * FROM vehicles WHERE {where} ORDER BY created_at DESC LIMIT ?", params + [limit]
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [VehicleModel(**self._process_vehicle_data(dict(row))) for row in rows]
+
+    async def rebuild_vehicle_brand_search(self, batch_size: int = 1000) -> int:
+        """Перерахувати brand_search усіх авто з архівом (міграція, імпорт даних напряму в БД)"""
+        count = 0
+        async with self._connect() as db:
+            for table in ("vehicles", "vehicles_archive"):
+                last_id = 0
+                while True:
+                    async with db.execute(
+                        f"SELECT id, brand FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                    ) as cursor:
+                        rows = await cursor.fetchall()
+                    if not rows:
+                        break
+                    await db.executemany(
+                        f"UPDATE {table} SET brand_search = ? WHERE id = ?",
+                        [(fold_brand(brand), vehicle_id) for vehicle_id, brand in rows],
+                    )
+                    await db.commit()
+                    count += len(rows)
+                    last_id = rows[-1][0]
+        return count
+
+    async def preview_subscription_matches(
+        self, subscription: dict, limit: int = 3, count_cap: int = 500
+    ) -> Tuple[int, List[VehicleModel]]:
+        """Скільки наявних авто вже відповідає підписці та limit найновіших з них.
+
+        Умови - ті самі, що й для сповіщень (subscription_match.py). Підрахунок
+        зупиняється на count_cap: результат count_cap означає "count_cap або більше".
+        """
+        where, params = subscription_match_sql(subscription)
+        async with self._connect() as db:
+            async with db.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM vehicles WHERE {where} LIMIT ?)", params + [count_cap]
+            ) as cursor:
+                count = (await cursor.fetchone())[0]
+            vehicles = await self._fetch_subscription_matches(db, where, params, limit) if count else []
+        return count, vehicles
+
     async def update_subscription_last_notification(self, subscription_id: int) -> bool:
         """Оновити час останнього сповіщення для підписки"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """
                 UPDATE subscriptions 
@@ -2018,54 +3113,127 @@ class DatabaseManager:
             await db.commit()
             return True
 
-    # ===== МЕТОДИ ДЛЯ РОБОТИ З ФОТО =====
+    # ===== Черга сповіщень підписок (дайджести) =====
 
-    async def add_photo(
-        self, vehicle_id: int, file_id: str, file_path: str, is_main: bool = False
-    ) -> int:
-        """Додати фото до авто"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Якщо це головне фото, знімаємо статус головного з інших фото
-            if is_main:
-                await db.execute(
-                    """
-                    UPDATE photos SET is_main = 0 
-                    WHERE vehicle_id = ?
+    async def enqueue_subscription_notifications(self, items: List[tuple]) -> int:
+        """Поставити в чергу збіги [(user_id, subscription_id, vehicle_id, due_at), ...].
+
+        Повторний збіг тієї ж підписки з тим же авто ігнорується.
+        Повертає кількість доданих сповіщень.
+        """
+        if not items:
+            return 0
+        rows = [
+            (user_id, subscription_id, vehicle_id, due_at.isoformat())
+            for user_id, subscription_id, vehicle_id, due_at in items
+        ]
+        async with self._connect() as db:
+            before = db.total_changes
+            await db.executemany(
+                """
+                INSERT OR IGNORE INTO pending_notifications (user_id, subscription_id, vehicle_id, due_at)
+                VALUES (?, ?, ?, ?)
                 """,
-                    (vehicle_id,),
-                )
+                rows,
+            )
+            await db.commit()
+            return db.total_changes - before
 
-            # Додаємо нове фото
-            cursor = await db.execute(
+    async def get_due_notifications(self, now: datetime, max_users: int = 50) -> List[dict]:
+        """Сповіщення, час яких настав, для перших max_users користувачів.
+
+        Кожен користувач потрапляє у вибірку з усіма своїми сповіщеннями, щоб
+        дайджест не розривався між проходами. Для видалених або призупинених
+        підписок subscription_active порожнє - такі сповіщення лише прибираються.
+        """
+        due = now.isoformat()
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
                 """
-                INSERT INTO photos (vehicle_id, file_id, file_path, is_main)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT pn.id, pn.user_id, pn.subscription_id, pn.vehicle_id, pn.attempts,
+                       s.subscription_name, s.is_active AS subscription_active, u.telegram_id
+                FROM pending_notifications pn
+                LEFT JOIN subscriptions s ON s.id = pn.subscription_id
+                LEFT JOIN users u ON u.id = pn.user_id
+                WHERE pn.user_id IN (
+                    SELECT DISTINCT user_id FROM pending_notifications WHERE due_at <= ? LIMIT ?
+                )
+                AND pn.due_at <= ?
+                ORDER BY pn.user_id, pn.id
             """,
-                (vehicle_id, file_id, file_path, is_main),
+                (due, max_users, due),
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [dict(row) for row in rows]
+
+    async def get_next_notification_time(self) -> Optional[datetime]:
+        """Час найближчого сповіщення в черзі"""
+        async with self._connect() as db:
+            async with db.execute("SELECT MIN(due_at) FROM pending_notifications") as cursor:
+                row = await cursor.fetchone()
+                return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    async def complete_notifications(self, notification_ids: List[int], subscription_ids: List[int] = ()) -> None:
+        """Прибрати доставлені (або вже непотрібні) сповіщення з черги.
+
+        subscription_ids - підписки, за якими щойно надіслано повідомлення (last_notification).
+        """
+        if not notification_ids:
+            return
+        async with self._connect() as db:
+            placeholders = ", ".join("?" for _ in notification_ids)
+            await db.execute(f"DELETE FROM pending_notifications WHERE id IN ({placeholders})", list(notification_ids))
+            if subscription_ids:
+                placeholders = ", ".join("?" for _ in subscription_ids)
+                await db.execute(
+                    f"""
+                    UPDATE subscriptions 
+                    SET last_notification = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE id IN ({placeholders})
+                """,
+                    list(subscription_ids),
+                )
+            await db.commit()
+
+    async def postpone_notifications(self, notification_ids: List[int], due_at: datetime) -> None:
+        """Відкласти сповіщення після невдалої відправки"""
+        if not notification_ids:
+            return
+        placeholders = ", ".join("?" for _ in notification_ids)
+        async with self._connect() as db:
+            await db.execute(
+                f"UPDATE pending_notifications SET attempts = attempts + 1, due_at = ? WHERE id IN ({placeholders})",
+                [due_at.isoformat()] + list(notification_ids),
             )
             await db.commit()
-            return cursor.lastrowid
 
     async def update_vehicle(self, vehicle_id: int, update_data: dict) -> bool:
-        """Оновити авто"""
+        """Оновити авто (photos та main_photo записуються у vehicle_media)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 # Підготовлюємо SQL запит для оновлення
                 set_clauses = []
                 values = []
+                media = {}
                 
                 for field, value in update_data.items():
+                    if field in ("photos", "main_photo"):
+                        media[field] = value
+                        continue
                     if field in ["vehicle_type", "condition"] and hasattr(value, 'value'):
                         value = value.value
-                    elif field == "photos" and isinstance(value, list):
-                        value = json.dumps(value)
                     elif field in ["created_at", "updated_at"] and hasattr(value, 'isoformat'):
                         value = value.isoformat()
                     
                     set_clauses.append(f"{field} = ?")
                     values.append(value)
+                    # Нормалізований бренд для умов підписок оновлюється разом з брендом
+                    if field == "brand":
+                        set_clauses.append("brand_search = ?")
+                        values.append(fold_brand(value))
                 
-                if not set_clauses:
+                if not update_data:
                     return False
                 
                 # Додаємо updated_at
@@ -2077,8 +3245,20 @@ class DatabaseManager:
                 
                 sql = f"UPDATE vehicles SET {', '.join(set_clauses)} WHERE id = ?"
                 
-                await db.execute(sql, values)
+                cursor = await db.execute(sql, values)
+                found = cursor.rowcount > 0
+                # Редагування авто з архіву повертає його в гарячу таблицю
+                if not found and await self._restore_archived_vehicle(db, vehicle_id):
+                    await db.execute(sql, values)
+                    found = True
+                if found and media:
+                    if "photos" in media:
+                        await self._replace_album(db, vehicle_id, media["photos"])
+                    if "main_photo" in media:
+                        await self._set_main_media(db, vehicle_id, media["main_photo"])
+                    await self._store_media_json(db, vehicle_id)
                 await db.commit()
+                self._vehicles_changed([vehicle_id])
                 
                 return True
                 
@@ -2086,6 +3266,12 @@ class DatabaseManager:
             logger.error(f"Помилка оновлення авто: {e}")
             return False
 
+    # ===== МЕТОДИ ДЛЯ РОБОТИ З ФОТО =====
+    # Медіа авто - таблиця vehicle_media: медіагрупа (position 0..n-1) та головне фото
+    # картки (is_main = 1, з медіагрупи або окремий рядок з position = NULL).
+    # vehicles.photos / main_photo лишаються денормалізованою копією для коду,
+    # що читає VehicleModel; їх оновлює _store_media_json з vehicle_media.
+
     def _parse_media_id(self, raw_id: str) -> tuple[str, str]:
         """Розпізнати тип медіа зі збереженого рядка.
 
@@ -2100,62 +3286,261 @@ class DatabaseManager:
             pass
         return "photo", raw_id
 
+    async def _load_media_from_json(self, db, vehicle_id: int = None, source: str = "vehicles") -> int:
+        """Перенести JSON-колонки photos / main_photo у vehicle_media (для одного авто або всіх)"""
+        params = (vehicle_id,) if vehicle_id is not None else ()
+        if vehicle_id is not None:
+            await db.execute("DELETE FROM vehicle_media WHERE vehicle_id = ?", params)
+        else:
+            await db.execute("DELETE FROM vehicle_media")
+        cursor = await db.execute(
+            f"""
+            INSERT INTO vehicle_media (vehicle_id, position, kind, file_id)
+            SELECT v.id,
+                   CAST(j.key AS INTEGER),
+                   CASE WHEN j.value LIKE 'video:%' THEN 'video' ELSE 'photo' END,
+                   CASE WHEN j.value LIKE 'video:%' THEN substr(j.value, 7) ELSE j.value END
+            FROM {source} v,
+                 json_each(CASE WHEN json_valid(v.photos) AND json_type(v.photos) = 'array'
+                                THEN v.photos ELSE '[]' END) j
+            WHERE j.type = 'text' AND j.value != ''
+            {"AND v.id = ?" if vehicle_id is not None else ""}
+            """,
+            params,
+        )
+        count = cursor.rowcount or 0
+        # Головне фото з медіагрупи - перше входження main_photo
+        await db.execute(
+            f"""
+            UPDATE vehicle_media SET is_main = 1
+            WHERE id IN (
+                SELECT MIN(m.id) FROM vehicle_media m JOIN {source} v ON v.id = m.vehicle_id
+                WHERE {_MEDIA_RAW_SQL} = v.main_photo
+                {"AND m.vehicle_id = ?" if vehicle_id is not None else ""}
+                GROUP BY m.vehicle_id
+            )
+            """,
+            params,
+        )
+        # Головне фото, якого немає в медіагрупі, - окремий рядок без позиції
+        cursor = await db.execute(
+            f"""
+            INSERT INTO vehicle_media (vehicle_id, position, kind, file_id, is_main)
+            SELECT v.id, NULL,
+                   CASE WHEN v.main_photo LIKE 'video:%' THEN 'video' ELSE 'photo' END,
+                   CASE WHEN v.main_photo LIKE 'video:%' THEN substr(v.main_photo, 7) ELSE v.main_photo END,
+                   1
+            FROM {source} v
+            WHERE TRIM(COALESCE(v.main_photo, '')) NOT IN ('', '[Очищено]', 'Не вказано', 'none', 'None')
+              AND NOT EXISTS (SELECT 1 FROM vehicle_media m WHERE m.vehicle_id = v.id AND m.is_main = 1)
+              {"AND v.id = ?" if vehicle_id is not None else ""}
+            """,
+            params,
+        )
+        return count + (cursor.rowcount or 0)
+
+    async def _store_media_json(self, db, vehicle_id: int) -> int:
+        """Оновити vehicles.photos / main_photo з vehicle_media одним UPDATE (0 - авто немає в vehicles)"""
+        cursor = await db.execute(
+            f"""
+            UPDATE vehicles SET
+                photos = (
+                    SELECT json_group_array(raw) FROM (
+                        SELECT {_MEDIA_RAW_SQL} AS raw FROM vehicle_media
+                        WHERE vehicle_id = ? AND position IS NOT NULL ORDER BY position
+                    )
+                ),
+                main_photo = (
+                    SELECT {_MEDIA_RAW_SQL} FROM vehicle_media WHERE vehicle_id = ? AND is_main = 1
+                ),
+                updated_at = ?
+            WHERE id = ?
+            """,
+            (vehicle_id, vehicle_id, datetime.now().isoformat(), vehicle_id),
+        )
+        return cursor.rowcount
+
+    async def _commit_media(self, db, vehicle_id: int) -> bool:
+        """Оновити JSON-копію та зафіксувати зміни медіа; якщо авто немає - відкотити їх"""
+        if not await self._store_media_json(db, vehicle_id):
+            # Редагування авто з архіву повертає його в гарячу таблицю
+            if not await self._restore_archived_vehicle(db, vehicle_id):
+                await db.rollback()
+                return False
+            await self._store_media_json(db, vehicle_id)
+        await db.commit()
+        self._vehicles_changed([vehicle_id])
+        return True
+
+    async def _replace_album(self, db, vehicle_id: int, photos: Optional[List[str]]) -> None:
+        """Записати медіагрупу авто: якщо старий список - початок нового, додаються лише нові рядки"""
+        photos = [raw for raw in (photos or []) if isinstance(raw, str) and raw]
+        async with db.execute(
+            f"""
+            SELECT {_MEDIA_RAW_SQL}, is_main FROM vehicle_media
+            WHERE vehicle_id = ? AND position IS NOT NULL ORDER BY position
+        """,
+            (vehicle_id,),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        current = [row[0] for row in rows]
+        if photos[: len(current)] == current:
+            new_photos = photos[len(current):]
+            async with db.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM vehicle_media WHERE vehicle_id = ?",
+                (vehicle_id,),
+            ) as cursor:
+                start = (await cursor.fetchone())[0]
+            main_raw = None
+        else:
+            new_photos, start = photos, 0
+            # Головне фото з медіагрупи переживає її заміну (стає окремим рядком, якщо його більше немає в групі)
+            main_raw = next((raw for raw, is_main in rows if is_main), None)
+            await db.execute(
+                "DELETE FROM vehicle_media WHERE vehicle_id = ? AND position IS NOT NULL", (vehicle_id,)
+            )
+        await db.executemany(
+            "INSERT INTO vehicle_media (vehicle_id, position, kind, file_id) VALUES (?, ?, ?, ?)",
+            [(vehicle_id, start + index, *self._parse_media_id(raw)) for index, raw in enumerate(new_photos)],
+        )
+        if main_raw:
+            await self._set_main_media(db, vehicle_id, main_raw)
+
+    async def _set_main_media(self, db, vehicle_id: int, raw_id: Optional[str]) -> None:
+        """Зробити головним медіа raw_id (None - прибрати головне фото)"""
+        await db.execute("DELETE FROM vehicle_media WHERE vehicle_id = ? AND position IS NULL", (vehicle_id,))
+        await db.execute(
+            "UPDATE vehicle_media SET is_main = 0 WHERE vehicle_id = ? AND is_main = 1", (vehicle_id,)
+        )
+        if not raw_id:
+            return
+        kind, file_id = self._parse_media_id(raw_id)
+        cursor = await db.execute(
+            """
+            UPDATE vehicle_media SET is_main = 1
+            WHERE id = (
+                SELECT id FROM vehicle_media
+                WHERE vehicle_id = ? AND position IS NOT NULL AND kind = ? AND file_id = ?
+                ORDER BY position LIMIT 1
+            )
+        """,
+            (vehicle_id, kind, file_id),
+        )
+        if not cursor.rowcount:
+            await db.execute(
+                "INSERT INTO vehicle_media (vehicle_id, position, kind, file_id, is_main) VALUES (?, NULL, ?, ?, 1)",
+                (vehicle_id, kind, file_id),
+            )
+
+    async def rebuild_vehicle_media(self) -> int:
+        """Перебудувати vehicle_media з JSON-колонок photos / main_photo для всіх авто (з архівом)"""
+        async with self._connect() as db:
+            async with db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'vehicles_all'"
+            ) as cursor:
+                source = "vehicles_all" if await cursor.fetchone() else "vehicles"
+            count = await self._load_media_from_json(db, source=source)
+            await db.commit()
+            return count
+
+    def _media_row_to_dict(self, row: aiosqlite.Row) -> dict:
+        media = dict(row)
+        media["type"] = media["kind"]
+        media["is_main"] = bool(media["is_main"])
+        media["file_path"] = ""
+        media["raw_id"] = f"video:{media['file_id']}" if media["kind"] == "video" else media["file_id"]
+        return media
+
+    async def get_vehicle_media(self, vehicle_id: int) -> List[dict]:
+        """Усі медіа авто: медіагрупа в порядку показу, далі окреме головне фото"""
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM vehicle_media WHERE vehicle_id = ? ORDER BY position IS NULL, position",
+                (vehicle_id,),
+            ) as cursor:
+                return [self._media_row_to_dict(row) for row in await cursor.fetchall()]
+
+    async def get_vehicle_media_ids(self, vehicle_id: int) -> Tuple[List[str], Optional[str]]:
+        """Медіагрупа та головне фото авто у форматі vehicles.photos / main_photo"""
+        media = await self.get_vehicle_media(vehicle_id)
+        photos = [item["raw_id"] for item in media if item["position"] is not None]
+        main_photo = next((item["raw_id"] for item in media if item["is_main"]), None)
+        return photos, main_photo
+
+    async def add_photo(
+        self,
+        vehicle_id: int,
+        file_id: str,
+        file_path: str = "",
+        is_main: bool = False,
+        kind: str = "photo",
+        file_unique_id: str = None,
+    ) -> int:
+        """Додати фото/відео в кінець медіагрупи авто (file_path не зберігається).
+
+        Повертає id рядка vehicle_media або 0, якщо авто не знайдено.
+        """
+        async with self._connect() as db:
+            cursor = await db.execute(
+                """
+                INSERT INTO vehicle_media (vehicle_id, position, kind, file_id, file_unique_id)
+                VALUES (
+                    ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM vehicle_media WHERE vehicle_id = ?),
+                    ?, ?, ?
+                )
+            """,
+                (vehicle_id, vehicle_id, kind, file_id, file_unique_id),
+            )
+            media_id = cursor.lastrowid
+            if is_main:
+                await self._set_main_media(db, vehicle_id, f"video:{file_id}" if kind == "video" else file_id)
+            return media_id if await self._commit_media(db, vehicle_id) else 0
+
+    async def replace_vehicle_photos(self, vehicle_id: int, photos: List[str]) -> bool:
+        """Записати медіагрупу авто (дописування в кінець додає лише нові рядки)"""
+        async with self._connect() as db:
+            await self._replace_album(db, vehicle_id, photos)
+            return await self._commit_media(db, vehicle_id)
+
+    async def set_main_photo(self, vehicle_id: int, raw_id: Optional[str]) -> bool:
+        """Змінити головне фото картки (None - прибрати)"""
+        async with self._connect() as db:
+            await self._set_main_media(db, vehicle_id, raw_id)
+            return await self._commit_media(db, vehicle_id)
+
     async def get_vehicle_photos(self, vehicle_id: int) -> List[dict]:
-        """Отримати всі фото/відео авто (з урахуванням типу)"""
-        # Отримуємо авто з БД
-        vehicle = await self.get_vehicle_by_id(vehicle_id)
-        if not vehicle or not vehicle.photos:
-            return []
-        
-        # Повертаємо всі медіа як список словників; головне визначається через main_photo
-        photos = []
-        for i, photo_id in enumerate(vehicle.photos):
-            media_type, file_id = self._parse_media_id(photo_id)
-            main_media_type, main_file_id = self._parse_media_id(vehicle.main_photo) if vehicle.main_photo else (None, None)
-            photos.append({
-                "id": i + 1,
-                "vehicle_id": vehicle_id,
-                "file_id": file_id,
-                "type": media_type,
-                "file_path": "",
-                "is_main": (file_id == main_file_id),
-                "created_at": vehicle.created_at
-            })
-        
-        return photos
+        """Отримати всі фото/відео медіагрупи авто (з урахуванням типу)"""
+        media = await self.get_vehicle_media(vehicle_id)
+        return [item for item in media if item["position"] is not None]
 
     async def get_main_photo(self, vehicle_id: int) -> Optional[dict]:
-        """Отримати головне медіа авто (фото або відео)"""
-        # Спочатку отримуємо авто з БД
-        vehicle = await self.get_vehicle_by_id(vehicle_id)
-        if not vehicle or not vehicle.photos or len(vehicle.photos) == 0:
-            return None
-        
-        # Якщо задано main_photo — повертаємо його з визначеним типом
-        if vehicle.main_photo:
-            media_type, file_id = self._parse_media_id(vehicle.main_photo)
-            return {
-                "file_id": file_id,
-                "type": media_type,
-                "vehicle_id": vehicle_id,
-                "is_main": True
-            }
-        return None
+        """Отримати головне медіа авто (фото або відео) - один рядок за індексом"""
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM vehicle_media WHERE vehicle_id = ? AND is_main = 1", (vehicle_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return self._media_row_to_dict(row) if row else None
 
     async def delete_vehicle(self, vehicle_id: int) -> bool:
         """Видалити авто"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             # Видаляємо пов'язані записи
             await db.execute("DELETE FROM saved_vehicles WHERE vehicle_id = ?", (vehicle_id,))
+            await db.execute("DELETE FROM vehicle_media WHERE vehicle_id = ?", (vehicle_id,))
             
-            # Видаляємо авто
+            # Видаляємо авто (з гарячої таблиці або з архіву)
             await db.execute("DELETE FROM vehicles WHERE id = ?", (vehicle_id,))
+            await db.execute("DELETE FROM vehicles_archive WHERE id = ?", (vehicle_id,))
             await db.commit()
+            self._vehicles_changed([vehicle_id])
             return True
 
     async def get_vehicles_by_status(self, status: str, page: int = 1, per_page: int = 10, sort_by: str = "created_at_desc") -> List[VehicleModel]:
         """Отримати авто за статусом з пагінацією та сортуванням"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             
             # Визначаємо порядок сортування
@@ -2171,7 +3556,7 @@ class DatabaseManager:
             offset = (page - 1) * per_page
             
             async with db.execute(
-                f"SELECT * FROM vehicles WHERE status = ? {order_clause} LIMIT ? OFFSET ?",
+                f"SELECT * FROM vehicles_all WHERE status = ? {order_clause} LIMIT ? OFFSET ?",
                 (status, per_page, offset)
             ) as cursor:
                 rows = await cursor.fetchall()
@@ -2179,9 +3564,9 @@ class DatabaseManager:
 
     async def get_vehicles_count_by_status(self, status: str) -> int:
         """Отримати кількість авто за статусом"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
-                "SELECT COUNT(*) FROM vehicles WHERE status = ?",
+                "SELECT COUNT(*) FROM vehicles_all WHERE status = ?",
                 (status,)
             ) as cursor:
                 result = await cursor.fetchone()
@@ -2189,23 +3574,87 @@ class DatabaseManager:
 
     async def delete_all_vehicles(self) -> int:
         """Видалити всі авто"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             # Видаляємо всі пов'язані записи
             await db.execute("DELETE FROM saved_vehicles")
-            await db.execute("DELETE FROM photos")
-            
+            await db.execute("DELETE FROM vehicle_media")
+
             # Видаляємо всі авто
             cursor = await db.execute("DELETE FROM vehicles")
+            archived = await db.execute("DELETE FROM vehicles_archive")
             await db.commit()
-            return cursor.rowcount
+            self._vehicles_changed()
+            return cursor.rowcount + archived.rowcount
+
+    # ===== Архів проданих авто (vehicles_archive) =====
+    # Клієнтські запити читають лише гарячу таблицю vehicles. Адмінські списки,
+    # пошук та експорт - view vehicles_all (vehicles + vehicles_archive).
+
+    async def _archive_columns(self, db) -> str:
+        """Спільні колонки vehicles та vehicles_archive"""
+        async with db.execute("PRAGMA table_info(vehicles_archive)") as cursor:
+            return ", ".join(row[1] for row in await cursor.fetchall() if row[1] != "archived_at")
+
+    async def _restore_archived_vehicle(self, db, vehicle_id: int) -> bool:
+        """Повернути авто з архіву в vehicles (в межах транзакції db)"""
+        columns = await self._archive_columns(db)
+        cursor = await db.execute(
+            f"INSERT INTO vehicles ({columns}) SELECT {columns} FROM vehicles_archive WHERE id = ?",
+            (vehicle_id,),
+        )
+        if not cursor.rowcount:
+            return False
+        await db.execute("DELETE FROM vehicles_archive WHERE id = ?", (vehicle_id,))
+        logger.info(f"♻️ Авто {vehicle_id} повернуто з архіву")
+        return True
+
+    async def archive_sold_vehicles(self, older_than_days: int, limit: int = 100) -> int:
+        """Перенести в vehicles_archive один пакет авто, проданих понад older_than_days днів тому.
+
+        Повертає кількість перенесених авто (менше limit - кандидатів більше немає).
+        """
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).date().isoformat()
+        async with self._connect() as db:
+            async with db.execute(
+                f"""
+                SELECT id FROM vehicles
+                WHERE status = 'sold' AND {_SOLD_AT_SQL} < ?
+                ORDER BY {_SOLD_AT_SQL}
+                LIMIT ?
+            """,
+                (cutoff, limit),
+            ) as cursor:
+                vehicle_ids = [row[0] for row in await cursor.fetchall()]
+            if not vehicle_ids:
+                return 0
+
+            columns = await self._archive_columns(db)
+            placeholders = ", ".join("?" for _ in vehicle_ids)
+            await db.execute(
+                f"""
+                INSERT INTO vehicles_archive ({columns}, archived_at)
+                SELECT {columns}, ? FROM vehicles WHERE id IN ({placeholders})
+            """,
+                [datetime.now().isoformat()] + vehicle_ids,
+            )
+            await db.execute(f"DELETE FROM vehicles WHERE id IN ({placeholders})", vehicle_ids)
+            await db.commit()
+        self._vehicles_changed(vehicle_ids)
+        return len(vehicle_ids)
+
+    async def get_archived_vehicles_count(self) -> int:
+        """Кількість авто в архіві"""
+        async with self._connect() as db:
+            async with db.execute("SELECT COUNT(*) FROM vehicles_archive") as cursor:
+                return int((await cursor.fetchone())[0])
 
     # Методи швидкого пошуку
     async def search_vehicles_by_vin(self, vin_code: str) -> List[VehicleModel]:
         """Пошук авто по VIN коду"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT * FROM vehicles WHERE vin_code LIKE ?",
+                "SELECT * FROM vehicles_all WHERE vin_code LIKE ?",
                 (f"%{vin_code}%",)
             ) as cursor:
                 rows = await cursor.fetchall()
@@ -2213,10 +3662,10 @@ class DatabaseManager:
 
     async def search_vehicles_by_brand(self, brand: str) -> List[VehicleModel]:
         """Пошук авто по марці"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT * FROM vehicles WHERE brand LIKE ?",
+                "SELECT * FROM vehicles_all WHERE brand LIKE ?",
                 (f"%{brand}%",)
             ) as cursor:
                 rows = await cursor.fetchall()
@@ -2224,10 +3673,10 @@ class DatabaseManager:
 
     async def search_vehicles_by_model(self, model: str) -> List[VehicleModel]:
         """Пошук авто по моделі"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
-                "SELECT * FROM vehicles WHERE model LIKE ?",
+                "SELECT * FROM vehicles_all WHERE model LIKE ?",
                 (f"%{model}%",)
             ) as cursor:
                 rows = await cursor.fetchall()
@@ -2235,11 +3684,11 @@ class DatabaseManager:
 
     async def search_vehicles_by_brand_model(self, query: str) -> List[VehicleModel]:
         """Пошук авто по марці АБО моделі (об'єднаний пошук)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             like = f"%{query}%"
             async with db.execute(
-                "SELECT * FROM vehicles WHERE brand LIKE ? OR model LIKE ?",
+                "SELECT * FROM vehicles_all WHERE brand LIKE ? OR model LIKE ?",
                 (like, like)
             ) as cursor:
                 rows = await cursor.fetchall()
@@ -2247,7 +3696,7 @@ class DatabaseManager:
 
     async def search_vehicles_by_brand_and_model(self, brand: str, model: str) -> List[VehicleModel]:
         """Пошук авто по марці ТА моделі (послідовний пошук)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             brand_like = f"%{brand}%"
             model_like = f"%{model}%"
@@ -2266,7 +3715,7 @@ class DatabaseManager:
 
     async def search_vehicles_by_years(self, year_from: int, year_to: int) -> List[VehicleModel]:
         """Пошук авто по діапазону років"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -2283,7 +3732,7 @@ class DatabaseManager:
 
     async def search_vehicles_by_price_range(self, price_from: float, price_to: float) -> List[VehicleModel]:
         """Пошук авто по діапазону цін"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 """
@@ -2299,5 +3748,8 @@ class DatabaseManager:
                 return [VehicleModel(**self._process_vehicle_data(dict(row))) for row in rows]
 
 
+# Замір часу всіх публічних методів для метрик
+instrument_async_methods(DatabaseManager, db_query_duration)
+
 # Глобальний екземпляр менеджера бази даних
 db_manager = DatabaseManager()
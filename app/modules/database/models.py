@@ -231,6 +231,7 @@ class SubscriptionModel(BaseModel):
     load_capacity: Optional[int] = None
     condition: Optional[VehicleCondition] = None
     is_active: bool = True
+    digest_mode: str = "instant"  # instant | hourly | daily
     last_notification: Optional[datetime] = None  # Останнє сповіщення
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
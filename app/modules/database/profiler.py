@@ -0,0 +1,293 @@
+"""
+Профайлер SQL-запитів DatabaseManager (вмикається налаштуванням)
+
+Записує нормалізований SQL, форму параметрів, тривалість і кількість рядків.
+Для першого запиту кожної форми зберігає EXPLAIN QUERY PLAN.
+Звіт top-N доступний через сигнал SIGUSR1 або команду адміністратора /db_profile.
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+import aiosqlite
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"IN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+
+# Для цих інструкцій план запиту має сенс
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH")
+
+
+def normalize_sql(sql: str) -> str:
+    """Привести SQL до форми без літералів, щоб групувати однакові запити"""
+    normalized = _WHITESPACE_RE.sub(" ", sql).strip()
+    normalized = _STRING_RE.sub("?", normalized)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    return _IN_LIST_RE.sub("IN (?…)", normalized)
+
+
+def params_shape(params: Any) -> str:
+    """Опис параметрів без значень: типи по позиціях"""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+
+
+@dataclass
+class QueryStats:
+    """Агреговані дані по одній формі запиту"""
+
+    sql: str
+    params: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    slow_count: int = 0
+    plan: List[str] = field(default_factory=list)
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+@dataclass
+class SlowQuery:
+    """Окремий повільний запит"""
+
+    sql: str
+    params: str
+    duration: float
+    rows: int
+    at: datetime = field(default_factory=datetime.now)
+
+
+class QueryProfiler:
+    """Збирає статистику запитів та журнал повільних запитів"""
+
+    def __init__(self, enabled: bool = False, slow_threshold_ms: float = 50.0, slow_log_size: int = 200):
+        self.enabled = enabled
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.stats: Dict[str, QueryStats] = {}
+        self.slow_log: Deque[SlowQuery] = deque(maxlen=slow_log_size)
+        self.started_at = datetime.now()
+
+    def needs_plan(self, sql: str) -> bool:
+        """Чи потрібно зняти план для цієї форми (тільки перший раз)"""
+        key = normalize_sql(sql)
+        if key in self.stats:
+            return False
+        return key.lstrip("(").upper().startswith(_EXPLAINABLE)
+
+    def record(
+        self, sql: str, params: Any, duration: float, rows: int, plan: List[str] = None, shape: str = None
+    ) -> None:
+        key = normalize_sql(sql)
+        shape = shape or params_shape(params)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = QueryStats(sql=key, params=shape)
+            self.stats[key] = stats
+        if plan:
+            stats.plan = plan
+        stats.count += 1
+        stats.total_time += duration
+        stats.max_time = max(stats.max_time, duration)
+        stats.rows += rows
+
+        if duration >= self.slow_threshold:
+            stats.slow_count += 1
+            self.slow_log.append(SlowQuery(sql=key, params=shape, duration=duration, rows=rows))
+            logger.warning(f"🐢 Повільний запит {duration * 1000:.1f} мс ({rows} рядків): {key[:200]}")
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self.slow_log.clear()
+        self.started_at = datetime.now()
+
+    def top(self, limit: int = 10, order_by: str = "total_time") -> List[QueryStats]:
+        """Найважчі форми запитів (total_time | max_time | avg_time | count)"""
+        return sorted(self.stats.values(), key=lambda s: getattr(s, order_by), reverse=True)[:limit]
+
+    def format_report(self, limit: int = 10, with_plans: bool = True) -> str:
+        """Текстовий звіт top-N"""
+        if not self.stats:
+            return "Профайлер запитів: даних немає" + ("" if self.enabled else " (вимкнено)")
+
+        lines = [
+            f"Профайлер запитів з {self.started_at:%Y-%m-%d %H:%M:%S}: "
+            f"{len(self.stats)} форм, {sum(s.count for s in self.stats.values())} запитів, "
+            f"повільних (≥{self.slow_threshold * 1000:.0f} мс): {sum(s.slow_count for s in self.stats.values())}",
+        ]
+        for index, stats in enumerate(self.top(limit), start=1):
+            lines.append(
+                f"{index}. total {stats.total_time * 1000:.1f} мс | n={stats.count} | "
+                f"avg {stats.avg_time * 1000:.2f} мс | max {stats.max_time * 1000:.1f} мс | "
+                f"rows {stats.rows} | params {stats.params}"
+            )
+            lines.append(f"   {stats.sql[:300]}")
+            if with_plans and stats.plan:
+                lines.extend(f"   ↳ {step}" for step in stats.plan)
+        return "\n".join(lines)
+
+    def dump(self, limit: int = 10) -> None:
+        """Вивести звіт у лог"""
+        logger.info("📊 " + self.format_report(limit))
+
+
+class ProfiledConnection:
+    """Обгортка aiosqlite.Connection, що замірює кожен execute"""
+
+    def __init__(self, connection: aiosqlite.Connection, profiler: QueryProfiler):
+        object.__setattr__(self, "_connection", connection)
+        object.__setattr__(self, "_profiler", profiler)
+        object.__setattr__(self, "_pending", None)
+
+    async def __aenter__(self) -> "ProfiledConnection":
+        await self._connection.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._finish_pending()
+        await self._connection.__aexit__(exc_type, exc, tb)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # row_factory та інші атрибути встановлюємо на справжньому з'єднанні
+        setattr(self._connection, name, value)
+
+    def execute(self, sql: str, parameters: Any = None) -> "_ProfiledResult":
+        return _ProfiledResult(self, sql, parameters)
+
+    async def executemany(self, sql: str, parameters: Any) -> aiosqlite.Cursor:
+        self._finish_pending()
+        rows = list(parameters)
+        start = time.perf_counter()
+        cursor = await self._connection.executemany(sql, rows)
+        duration = time.perf_counter() - start
+        shape = f"[{len(rows)}× {params_shape(rows[0]) if rows else '()'}]"
+        self._profiler.record(sql, None, duration, max(cursor.rowcount, 0), shape=shape)
+        return cursor
+
+    async def _run(self, sql: str, parameters: Any) -> "_ProfiledCursor":
+        self._finish_pending()
+        plan = await self._explain(sql, parameters) if self._profiler.needs_plan(sql) else None
+        start = time.perf_counter()
+        cursor = await self._connection.execute(sql, parameters)
+        # Для UPDATE/DELETE/INSERT кількість рядків відома одразу, для SELECT рахуємо при вибірці
+        pending = _PendingQuery(sql, parameters, time.perf_counter() - start, plan, max(cursor.rowcount, 0))
+        object.__setattr__(self, "_pending", pending)
+        return _ProfiledCursor(cursor, pending)
+
+    async def _explain(self, sql: str, parameters: Any) -> Optional[List[str]]:
+        try:
+            cursor = await self._connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ())
+            rows = await cursor.fetchall()
+            await cursor.close()
+            # Рядок плану: (id, parent, notused, detail)
+            return [row[-1] for row in rows]
+        except Exception as e:
+            logger.debug(f"Не вдалося отримати план запиту: {e}")
+            return None
+
+    def _finish_pending(self) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        object.__setattr__(self, "_pending", None)
+        self._profiler.record(pending.sql, pending.parameters, pending.duration, pending.rows, pending.plan)
+
+
+@dataclass
+class _PendingQuery:
+    sql: str
+    parameters: Any
+    duration: float
+    plan: Optional[List[str]]
+    rows: int = 0
+
+
+class _ProfiledResult:
+    """Підтримує обидва варіанти: await db.execute(...) та async with db.execute(...)"""
+
+    def __init__(self, connection: ProfiledConnection, sql: str, parameters: Any):
+        self._connection = connection
+        self._sql = sql
+        self._parameters = parameters
+        self._cursor: Optional[_ProfiledCursor] = None
+
+    def __await__(self):
+        return self._connection._run(self._sql, self._parameters).__await__()
+
+    async def __aenter__(self) -> "_ProfiledCursor":
+        self._cursor = await self._connection._run(self._sql, self._parameters)
+        return self._cursor
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._cursor.close()
+        self._connection._finish_pending()
+
+
+class _ProfiledCursor:
+    """Курсор, що додає час і кількість рядків вибірки до запиту"""
+
+    def __init__(self, cursor: aiosqlite.Cursor, pending: _PendingQuery):
+        self._cursor = cursor
+        self._pending = pending
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    async def fetchone(self):
+        start = time.perf_counter()
+        row = await self._cursor.fetchone()
+        self._pending.duration += time.perf_counter() - start
+        if row is not None:
+            self._pending.rows += 1
+        return row
+
+    async def fetchall(self):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchall()
+        self._pending.duration += time.perf_counter() - start
+        self._pending.rows += len(rows)
+        return rows
+
+    async def fetchmany(self, size: int = None):
+        start = time.perf_counter()
+        rows = await (self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany())
+        self._pending.duration += time.perf_counter() - start
+        self._pending.rows += len(rows)
+        return rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            row = await self.fetchone()
+            if row is None:
+                break
+            yield row
+
+
+# Глобальний профайлер запитів
+query_profiler = QueryProfiler(
+    enabled=settings.query_profiler_enabled,
+    slow_threshold_ms=settings.query_slow_threshold_ms,
+)
@@ -0,0 +1,110 @@
+"""
+Умови збігу авто з підпискою - одне визначення для SQL та для Python
+
+vehicle_matches_subscription перевіряє нове авто перед сповіщенням,
+subscription_match_sql будує WHERE для вибірки вже наявних авто (попередній
+перегляд при створенні підписки). Обидві функції проходять по SUBSCRIPTION_CRITERIA,
+тож нова умова додається в одному місці і не розходиться між ними.
+
+Порожні (None, 0, "") поля підписки не обмежують вибірку.
+
+SQLite lower() знає лише латиницю, тому бренд порівнюється з колонкою brand_search,
+яку DatabaseManager заповнює через fold_brand при кожному записі бренду.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, List, Tuple
+
+# Авто, які взагалі можуть потрапити в підписку (умова збігається з частковими індексами vehicles)
+AVAILABLE_VEHICLE_SQL = "status = 'available' AND is_active = 1"
+
+
+def fold_brand(value: Any) -> str:
+    """Бренд для порівняння: без урахування регістру (і кирилиці) та зайвих пробілів"""
+    return " ".join(str(value or "").casefold().split())
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _equals(column: str) -> Callable[[Any], Tuple[str, list]]:
+    return lambda value: (f"{column} = ?", [_enum_value(value)])
+
+
+@dataclass(frozen=True)
+class SubscriptionCriterion:
+    """Умова підписки: поле підписки, SQL-умова та та сама перевірка для авто"""
+
+    key: str
+    sql: Callable[[Any], Tuple[str, list]]
+    check: Callable[[Any, Any], bool]  # (авто, значення з підписки) -> збігається
+
+
+SUBSCRIPTION_CRITERIA: List[SubscriptionCriterion] = [
+    SubscriptionCriterion(
+        "vehicle_type",
+        _equals("vehicle_type"),
+        lambda vehicle, value: _enum_value(vehicle.vehicle_type) == _enum_value(value),
+    ),
+    # Без урахування регістру - і для латиниці, і для кирилиці ("МАЗ" = "маз")
+    SubscriptionCriterion(
+        "brand",
+        lambda value: ("brand_search = ?", [fold_brand(value)]),
+        lambda vehicle, value: fold_brand(vehicle.brand) == fold_brand(value),
+    ),
+    SubscriptionCriterion(
+        "min_year",
+        lambda value: ("year >= ?", [value]),
+        lambda vehicle, value: vehicle.year is not None and vehicle.year >= value,
+    ),
+    SubscriptionCriterion(
+        "max_year",
+        lambda value: ("year <= ?", [value]),
+        lambda vehicle, value: vehicle.year is not None and vehicle.year <= value,
+    ),
+    SubscriptionCriterion(
+        "min_price",
+        lambda value: ("price >= ?", [value]),
+        lambda vehicle, value: vehicle.price is not None and vehicle.price >= value,
+    ),
+    SubscriptionCriterion(
+        "max_price",
+        lambda value: ("price <= ?", [value]),
+        lambda vehicle, value: vehicle.price is not None and vehicle.price <= value,
+    ),
+    # Авто без вказаного пробігу не відсіюються
+    SubscriptionCriterion(
+        "max_mileage",
+        lambda value: ("(mileage IS NULL OR mileage <= ?)", [value]),
+        lambda vehicle, value: not vehicle.mileage or vehicle.mileage <= value,
+    ),
+    SubscriptionCriterion(
+        "condition",
+        _equals("condition"),
+        lambda vehicle, value: _enum_value(vehicle.condition) == _enum_value(value),
+    ),
+]
+
+
+def subscription_match_sql(subscription: dict) -> Tuple[str, list]:
+    """WHERE (без слова WHERE) та параметри для авто, що відповідають підписці"""
+    conditions = [AVAILABLE_VEHICLE_SQL]
+    params: list = []
+    for criterion in SUBSCRIPTION_CRITERIA:
+        value = subscription.get(criterion.key)
+        if value:
+            sql, values = criterion.sql(value)
+            conditions.append(sql)
+            params.extend(values)
+    return " AND ".join(conditions), params
+
+
+def vehicle_matches_subscription(vehicle, subscription: dict) -> bool:
+    """Чи відповідає авто підписці (ті самі умови, що й subscription_match_sql)"""
+    if _enum_value(vehicle.status) != "available" or not vehicle.is_active:
+        return False
+    for criterion in SUBSCRIPTION_CRITERIA:
+        value = subscription.get(criterion.key)
+        if value and not criterion.check(vehicle, value):
+            return False
+    return True
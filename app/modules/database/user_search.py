@@ -0,0 +1,71 @@
+"""
+Нормалізовані поля для пошуку користувачів адміністратором
+
+SQLite lower() не знає кирилиці, а реверсу рядка в SQL немає, тому поля
+рахуються в Python при збереженні користувача (DatabaseManager.create_user,
+update_user) і зберігаються в колонках users з індексами:
+
+- phone_digits     - лише цифри телефону, 0XXXXXXXXX як 380XXXXXXXXX (пошук за початком номера)
+- phone_digits_rev - ті самі цифри задом наперед (пошук за кінцем номера)
+- name_search      - "ім'я прізвище" після casefold (пошук за початком імені)
+- username_search  - username після casefold, без @
+
+Пошук підрядка в імені/username - через таблицю триграм user_search_trigrams.
+"""
+import re
+from typing import Dict, Optional, Set
+
+# Мінімальна довжина запиту для пошуку за триграмами; коротші - пошук за початком
+TRIGRAM_SIZE = 3
+
+# Верхня межа діапазону "рядки, що починаються з prefix" для індексу
+_PREFIX_END = "\U0010ffff"
+
+
+def phone_digits(phone: Optional[str]) -> str:
+    """Лише цифри номера"""
+    return re.sub(r"\D", "", phone or "")
+
+
+def canonical_phone_digits(phone: Optional[str]) -> str:
+    """Цифри номера; старі локальні номери 0XXXXXXXXX - у міжнародному вигляді 380XXXXXXXXX"""
+    digits = phone_digits(phone)
+    if len(digits) == 10 and digits.startswith("0"):
+        return "38" + digits
+    return digits
+
+
+def fold_text(value: Optional[str]) -> str:
+    """Нормалізація тексту для пошуку: casefold, без зайвих пробілів та @"""
+    return " ".join((value or "").replace("@", " ").casefold().split())
+
+
+def prefix_range(prefix: str) -> tuple:
+    """(від, до) для умови `column >= ? AND column < ?` - рядки, що починаються з prefix"""
+    return prefix, prefix + _PREFIX_END
+
+
+def user_search_fields(
+    first_name: Optional[str],
+    last_name: Optional[str],
+    username: Optional[str],
+    phone: Optional[str],
+) -> Dict[str, str]:
+    """Значення нормалізованих колонок users"""
+    digits = canonical_phone_digits(phone)
+    return {
+        "phone_digits": digits,
+        "phone_digits_rev": digits[::-1],
+        "name_search": fold_text(f"{first_name or ''} {last_name or ''}"),
+        "username_search": fold_text(username),
+    }
+
+
+def search_text(fields: Dict[str, str]) -> str:
+    """Текст, по якому шукає пошук за іменем: ім'я, прізвище та username"""
+    return f"{fields['name_search']} {fields['username_search']}".strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Усі триграми тексту"""
+    return {text[i : i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
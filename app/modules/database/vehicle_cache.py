@@ -0,0 +1,76 @@
+"""
+Кеш авто в пам'яті процесу для DatabaseManager.get_vehicle_by_id
+
+LRU з обмеженим розміром: id -> готовий VehicleModel (або позначка, що авто
+немає). Кожен запис має версію; будь-яка зміна авто через DatabaseManager
+підвищує версію id, тож результат читання, що почалося до зміни, не
+потрапить у кеш після неї.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from app.monitoring.metrics import cache_requests_total, cache_size
+
+# Позначка "такого авто немає" (негативний кеш)
+MISSING = object()
+
+
+class VehicleCache:
+    """LRU-кеш авто з версіями записів"""
+
+    name = "vehicle"
+
+    def __init__(self, max_size: int = 2000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        # Загальне покоління: підвищується при скиданні всього кешу
+        self._generation = 0
+
+    def version(self, key: Hashable) -> Tuple[int, int]:
+        """Версія запису, яку треба передати в put після читання з БД"""
+        return self._generation, self._versions.get(key, 0)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Значення з кешу, MISSING для відомо відсутнього авто, None - промах"""
+        if self.max_size <= 0:
+            return None
+        value = self._entries.get(key)
+        if value is None:
+            cache_requests_total.inc(cache=self.name, result="miss")
+            return None
+        self._entries.move_to_end(key)
+        cache_requests_total.inc(cache=self.name, result="hit")
+        return value
+
+    def put(self, key: Hashable, value: object, version: Tuple[int, int]) -> None:
+        """Зберегти результат читання, якщо запис не змінився під час читання"""
+        if self.max_size <= 0 or version != self.version(key):
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            self._versions.pop(evicted, None)
+        cache_size.set(len(self._entries), cache=self.name)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Скинути запис після зміни авто"""
+        self._entries.pop(key, None)
+        self._versions[key] = self._versions.get(key, 0) + 1
+        if len(self._versions) > 4 * max(self.max_size, 1):
+            # Версії змінених, але не закешованих id не повинні рости без меж
+            self.clear()
+            return
+        cache_size.set(len(self._entries), cache=self.name)
+
+    def clear(self) -> None:
+        """Скинути весь кеш (масові зміни)"""
+        self._entries.clear()
+        self._versions.clear()
+        self._generation += 1
+        cache_size.set(0, cache=self.name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
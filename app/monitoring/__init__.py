@@ -0,0 +1,18 @@
+"""
+Моніторинг бота: метрики та HTTP-ендпоінт /metrics
+"""
+from .metrics import (
+    registry,
+    update_duration,
+    updates_total,
+    db_query_duration,
+    telegram_api_duration,
+    background_tasks_running,
+    background_tasks_total,
+    background_task_duration,
+    event_loop_lag,
+    event_loop_stalls_total,
+    throttled_updates_total,
+    instrument_async_methods,
+)
+from .server import MetricsServer
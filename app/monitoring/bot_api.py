@@ -0,0 +1,33 @@
+"""
+Замір часу викликів Telegram Bot API через middleware сесії aiogram
+"""
+
+import time
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from .metrics import telegram_api_duration
+
+
+class BotApiMetricsMiddleware(BaseRequestMiddleware):
+    """Записує тривалість кожного запиту до Bot API з назвою методу та результатом"""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        method_name = getattr(method, "__api_method__", type(method).__name__)
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            telegram_api_duration.observe(time.perf_counter() - start, method=method_name, status=status)
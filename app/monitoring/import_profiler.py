@@ -0,0 +1,133 @@
+"""
+Профіль часу імпорту модулів під час запуску (STARTUP_PROFILE=1)
+
+Встановлює finder у sys.meta_path, який замірює виконання кожного модуля:
+сумарний час (разом з вкладеними імпортами) та власний час модуля.
+Модуль навмисно не імпортує aiogram чи модулі бота, щоб його можна було
+встановити першим.
+"""
+
+import logging
+import sys
+import threading
+import time
+from importlib.abc import Loader, MetaPathFinder
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ImportProfiler:
+    """Збирає час імпорту по модулях"""
+
+    def __init__(self):
+        # module -> (сумарний час, власний час)
+        self.records: Dict[str, Tuple[float, float]] = {}
+        self._local = threading.local()
+        self._finder: Optional["_TimingFinder"] = None
+
+    @property
+    def installed(self) -> bool:
+        return self._finder is not None
+
+    def install(self) -> None:
+        """Почати замір імпортів"""
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        """Припинити замір (зібрані дані зберігаються)"""
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _stack(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def format_report(self, limit: int = 25) -> str:
+        """Текстовий звіт: найважчі модулі за власним та сумарним часом"""
+        if not self.records:
+            return "Профіль імпортів порожній"
+
+        # Сума власних часів не рахує вкладені імпорти двічі
+        total = sum(own for _, own in self.records.values())
+        lines = [f"Імпортовано {len(self.records)} модулів за {total * 1000:.0f} мс"]
+
+        by_package: Dict[str, float] = {}
+        for name, (_, own) in self.records.items():
+            root = name.split(".", 1)[0]
+            by_package[root] = by_package.get(root, 0.0) + own
+        lines.append("Пакети (власний час модулів):")
+        for root, own in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            lines.append(f"  {own * 1000:8.1f} мс  {root}")
+
+        lines.append(f"Top-{limit} модулів (власний / сумарний час):")
+        ordered = sorted(self.records.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (cumulative, own) in ordered[:limit]:
+            lines.append(f"  {own * 1000:8.1f} / {cumulative * 1000:8.1f} мс  {name}")
+        return "\n".join(lines)
+
+    def dump(self, limit: int = 25) -> None:
+        """Вивести звіт у лог"""
+        logger.info("⏱️ " + self.format_report(limit))
+
+
+class _TimingFinder(MetaPathFinder):
+    """Знаходить модуль штатними finder'ами та підміняє loader на той, що замірює час"""
+
+    def __init__(self, profiler: ImportProfiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class _TimingLoader(Loader):
+    """Обгортка loader'а; після виконання модуля повертає оригінальний loader"""
+
+    def __init__(self, loader: Loader, profiler: ImportProfiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        stack = self._profiler._stack()
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self._profiler.records[module.__name__] = (elapsed, elapsed - children)
+            # Інші бібліотеки можуть перевіряти тип loader'а модуля
+            module.__loader__ = self._loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+
+
+# Глобальний профайлер імпортів
+import_profiler = ImportProfiler()
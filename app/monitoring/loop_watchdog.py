@@ -0,0 +1,114 @@
+"""
+Сторож event loop: затримка циклу подій та пошук блокуючого коду
+
+Фонова корутина періодично засинає на `interval` і міряє, наскільки пізніше
+вона прокинулась - це затримка (lag) циклу, яка йде в гістограму метрик.
+Окремий потік перевіряє, як давно корутина прокидалась: якщо цикл стоїть
+довше за поріг, він знімає стек потоку event loop і пише його в лог -
+видно саме той код (експорт Excel, великий fetchall), що тримає цикл.
+
+Режим налагодження (LOOP_DEBUG=true) вмикає asyncio debug зі
+slow_callback_duration: asyncio логує кожен крок корутини, довший за поріг.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from .metrics import event_loop_lag, event_loop_stalls_total
+
+logger = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    """Вимірює затримку event loop і ловить стек коду, що його блокує"""
+
+    def __init__(self, interval: float = 0.5, stall_threshold: float = 0.5):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        # Момент, коли корутина мала прокинутись наступного разу (time.monotonic)
+        self._expected_wakeup = 0.0
+        self._reported_wakeup: Optional[float] = None
+        self.max_lag = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, debug: bool = False, debug_threshold: float = 0.1) -> None:
+        """Запустити вимірювання в поточному event loop
+
+        Args:
+            debug: Увімкнути asyncio debug та логування повільних кроків
+            debug_threshold: Поріг (сек) для повільного кроку та стеку в режимі debug
+        """
+        if self.is_running:
+            return
+        loop = asyncio.get_running_loop()
+        if debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = debug_threshold
+            self.stall_threshold = min(self.stall_threshold, debug_threshold)
+            logger.warning(
+                f"🐢 Режим пошуку блокуючих викликів: поріг {debug_threshold * 1000:.0f} мс"
+            )
+
+        self._loop_thread_id = threading.get_ident()
+        self._expected_wakeup = time.monotonic() + self.interval
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._probe(), name="loop_watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"⏱️ Сторож event loop запущено (інтервал {self.interval} с, "
+            f"поріг {self.stall_threshold * 1000:.0f} мс)"
+        )
+
+    async def stop(self) -> None:
+        """Зупинити корутину та потік"""
+        self._stop_event.set()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 1.0)
+            self._thread = None
+
+    async def _probe(self) -> None:
+        while True:
+            self._expected_wakeup = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._expected_wakeup)
+            event_loop_lag.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.stall_threshold:
+                logger.warning(f"🐢 Event loop був заблокований {lag * 1000:.0f} мс")
+
+    def _watch(self) -> None:
+        """Потік: знімає стек event loop, поки той заблокований"""
+        check_interval = max(0.01, self.stall_threshold / 4)
+        while not self._stop_event.wait(check_interval):
+            expected = self._expected_wakeup
+            stalled = time.monotonic() - expected
+            # Один стек на одне блокування
+            if stalled < self.stall_threshold or self._reported_wakeup == expected:
+                continue
+            self._reported_wakeup = expected
+            event_loop_stalls_total.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<стек недоступний>"
+            logger.warning(
+                f"🐢 Event loop заблокований вже {stalled * 1000:.0f} мс, поточний стек:\n{stack}"
+            )
@@ -0,0 +1,284 @@
+"""
+Метрики бота у форматі Prometheus (без зовнішніх залежностей)
+
+Гістограми зберігаються в пам'яті процесу та віддаються текстом
+через ендпоінт /metrics (див. server.py).
+"""
+
+import functools
+import inspect
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Межі кошиків у секундах: від швидких запитів до БД до повільних викликів API
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Лічильник з мітками"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge:
+    """Поточне значення з мітками (кількість задач, розмір черги)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Гістограма тривалостей з мітками"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # мітки -> [лічильники кошиків..., сума, кількість]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = [0.0] * (len(self.buckets) + 2)
+            self._series[key] = series
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def time(self, **labels: str) -> "_Timer":
+        """Контекстний менеджер для заміру тривалості блоку"""
+        return _Timer(self, labels)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        """Сума та кількість спостережень по кожному набору міток"""
+        return {
+            key: {"sum": series[-2], "count": series[-1]}
+            for key, series in self._series.items()
+        }
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            for index, bound in enumerate(self.buckets):
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {series[index]}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {series[-2]}")
+            lines.append(f"{self.name}_count{plain} {series[-1]}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self._histogram = histogram
+        self._labels = labels
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+
+
+class MetricsRegistry:
+    """Реєстр усіх метрик процесу"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), **kwargs) -> Histogram:
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, **kwargs)
+        return self._metrics[name]
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, documentation, labelnames)
+        return self._metrics[name]
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        if name not in self._metrics:
+            self._metrics[name] = Gauge(name, documentation, labelnames)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """Текстовий формат експозиції Prometheus"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def instrument_async_methods(
+    cls: type,
+    histogram: Histogram,
+    label: str = "method",
+    exclude: Iterable[str] = (),
+) -> type:
+    """Обгорнути всі публічні async-методи класу таймером гістограми"""
+    excluded = set(exclude)
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or name in excluded or not inspect.iscoroutinefunction(func):
+            continue
+        if getattr(func, "__instrumented__", False):
+            continue
+        setattr(cls, name, _timed(func, histogram, {label: name}))
+    return cls
+
+
+def _timed(func: Callable, histogram: Histogram, labels: Dict[str, str]) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start, **labels)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+# Глобальний реєстр метрик
+registry = MetricsRegistry()
+
+update_duration = registry.histogram(
+    "bot_update_duration_seconds",
+    "Час обробки оновлення Telegram",
+    ("event_type", "router", "handler"),
+)
+updates_total = registry.counter(
+    "bot_updates_total",
+    "Кількість оброблених оновлень",
+    ("event_type", "status"),
+)
+db_query_duration = registry.histogram(
+    "bot_db_query_duration_seconds",
+    "Час виконання методів DatabaseManager",
+    ("method",),
+)
+telegram_api_duration = registry.histogram(
+    "bot_telegram_api_duration_seconds",
+    "Час викликів Telegram Bot API",
+    ("method", "status"),
+)
+background_tasks_running = registry.gauge(
+    "bot_background_tasks_running",
+    "Кількість фонових задач, що виконуються або чекають на слот",
+    ("group",),
+)
+background_tasks_total = registry.counter(
+    "bot_background_tasks_total",
+    "Завершені фонові задачі за результатом",
+    ("group", "status"),
+)
+background_task_duration = registry.histogram(
+    "bot_background_task_duration_seconds",
+    "Тривалість фонових задач",
+    ("group",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0),
+)
+event_loop_lag = registry.histogram(
+    "bot_event_loop_lag_seconds",
+    "Затримка event loop: наскільки пізніше запланованого прокидається корутина",
+)
+event_loop_stalls_total = registry.counter(
+    "bot_event_loop_stalls_total",
+    "Кількість блокувань event loop довших за поріг (зі знятим стеком)",
+)
+throttled_updates_total = registry.counter(
+    "bot_throttled_updates_total",
+    "Callback-запити, відкинуті обмеженням частоти",
+    ("throttle_class",),
+)
+cache_requests_total = registry.counter(
+    "bot_cache_requests_total",
+    "Звернення до кешів у пам'яті процесу за результатом (hit/miss)",
+    ("cache", "result"),
+)
+cache_size = registry.gauge(
+    "bot_cache_size",
+    "Кількість записів у кешах у пам'яті процесу",
+    ("cache",),
+)
+backups_total = registry.counter(
+    "bot_backups_total",
+    "Резервні копії БД за результатом",
+    ("status",),
+)
+backup_last_success = registry.gauge(
+    "bot_backup_last_success_timestamp_seconds",
+    "Час (unix) останньої успішної резервної копії БД",
+)
+subscription_messages_total = registry.counter(
+    "bot_subscription_messages_total",
+    "Повідомлення підписок (дайджести) за результатом",
+    ("status",),
+)
+subscription_matches_total = registry.counter(
+    "bot_subscription_matches_total",
+    "Збіги нових авто з підписками за режимом доставки",
+    ("digest_mode",),
+)
@@ -0,0 +1,70 @@
+"""
+Мінімальний HTTP-сервер для віддачі метрик (GET /metrics)
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from .metrics import MetricsRegistry, registry as default_registry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """HTTP-ендпоінт з метриками на asyncio без сторонніх залежностей"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100, registry: MetricsRegistry = None):
+        self.host = host
+        self.port = port
+        self.registry = registry or default_registry
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Запустити сервер"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"📈 Метрики доступні на http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Зупинити сервер"""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # Дочитуємо заголовки, тіло запиту не потрібне
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+                if not line or line in (b"\r\n", b"\n"):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            method = parts[0] if parts else ""
+            path = parts[1].split("?", 1)[0] if len(parts) > 1 else ""
+
+            if method == "GET" and path == "/metrics":
+                await self._respond(writer, "200 OK", self.registry.render(), CONTENT_TYPE)
+            else:
+                await self._respond(writer, "404 Not Found", "Not Found\n", "text/plain")
+        except Exception as e:
+            logger.debug(f"Помилка обробки запиту метрик: {e}")
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: str, body: str, content_type: str) -> None:
+        payload = body.encode("utf-8")
+        headers = (
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(headers.encode("latin-1") + payload)
+        await writer.drain()
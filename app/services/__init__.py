@@ -0,0 +1,3 @@
+"""
+Спільні фонові сервіси бота
+"""
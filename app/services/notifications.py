@@ -0,0 +1,199 @@
+"""
+Асинхронний сервіс службових сповіщень
+
+Розсилає повідомлення кільком отримувачам у фоні, не блокуючи обробник:
+- обмежена кількість одночасних відправок (semaphore)
+- мінімальний інтервал між повідомленнями в один чат
+- повтор при TelegramRetryAfter
+- облік доставки по кожній розсилці
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeliveryReport:
+    """Звіт про доставку однієї розсилки"""
+
+    name: str
+    total: int
+    sent: int = 0
+    failed: int = 0
+    errors: Dict[int, str] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.sent + self.failed >= self.total
+
+
+class NotificationService:
+    """Фонова розсилка повідомлень з обмеженням паралельності та частоти"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 5,
+        per_chat_interval: float = 1.0,
+        max_attempts: int = 3,
+        history_size: int = 100,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_chat_interval = per_chat_interval
+        self.max_attempts = max_attempts
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._last_sent_at: Dict[int, float] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.history: Deque[DeliveryReport] = deque(maxlen=history_size)
+        self.total_sent = 0
+        self.total_failed = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Створюємо ліниво, щоб semaphore належав робочому event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def fan_out(
+        self,
+        bot: Bot,
+        chat_ids: Iterable[int],
+        text: str,
+        name: str = "notification",
+        **kwargs: Any,
+    ) -> DeliveryReport:
+        """Запланувати відправку повідомлення всім отримувачам і одразу повернути звіт.
+
+        Args:
+            bot: Екземпляр бота
+            chat_ids: ID чатів отримувачів (дублікати відкидаються)
+            text: Текст повідомлення
+            name: Назва розсилки для логів
+            **kwargs: Додаткові параметри bot.send_message (reply_markup, parse_mode)
+
+        Returns:
+            DeliveryReport, який заповнюється по мірі доставки
+        """
+        recipients = list(dict.fromkeys(int(chat_id) for chat_id in chat_ids))
+        report = DeliveryReport(name=name, total=len(recipients))
+        self.history.append(report)
+
+        if not recipients:
+            report.finished_at = datetime.now()
+            logger.info(f"ℹ️ Розсилка '{name}': немає отримувачів")
+            return report
+
+        task = asyncio.create_task(
+            self._run(bot, recipients, text, report, kwargs),
+            name=f"notify:{name}",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return report
+
+    async def _run(
+        self,
+        bot: Bot,
+        recipients: List[int],
+        text: str,
+        report: DeliveryReport,
+        kwargs: Dict[str, Any],
+    ) -> None:
+        await asyncio.gather(
+            *(self._deliver(bot, chat_id, text, report, kwargs) for chat_id in recipients)
+        )
+        report.finished_at = datetime.now()
+        logger.info(
+            f"📨 Розсилка '{report.name}': доставлено {report.sent}/{report.total}, помилок {report.failed}"
+        )
+
+    async def _deliver(
+        self,
+        bot: Bot,
+        chat_id: int,
+        text: str,
+        report: DeliveryReport,
+        kwargs: Dict[str, Any],
+    ) -> None:
+        lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        # Слот semaphore тримаємо лише на час відправки: очікування ліміту чату
+        # чи повтору не займає його і не гальмує доставку в інші чати
+        async with lock:
+            error = ""
+            for attempt in range(1, self.max_attempts + 1):
+                await self._wait_chat_interval(chat_id)
+                delay = 0.0
+                try:
+                    async with self._get_semaphore():
+                        await bot.send_message(chat_id, text, **kwargs)
+                    self._last_sent_at[chat_id] = time.monotonic()
+                    report.sent += 1
+                    self.total_sent += 1
+                    return
+                except TelegramRetryAfter as e:
+                    logger.warning(f"⏳ Ліміт Telegram для чату {chat_id}, чекаємо {e.retry_after} с")
+                    delay = e.retry_after
+                    error = str(e)
+                except TelegramForbiddenError as e:
+                    # Користувач заблокував бота - повтор не допоможе
+                    error = str(e)
+                    break
+                except Exception as e:
+                    error = str(e)
+                    if attempt < self.max_attempts:
+                        delay = attempt
+                if delay:
+                    await asyncio.sleep(delay)
+
+            report.failed += 1
+            report.errors[chat_id] = error
+            self.total_failed += 1
+            logger.error(f"Не вдалося відправити сповіщення в чат {chat_id}: {error}")
+
+    async def _wait_chat_interval(self, chat_id: int) -> None:
+        last_sent = self._last_sent_at.get(chat_id)
+        if last_sent is None:
+            return
+        delay = self.per_chat_interval - (time.monotonic() - last_sent)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @property
+    def pending(self) -> int:
+        """Кількість розсилок, що ще виконуються"""
+        return len(self._tasks)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Загальна статистика доставки"""
+        return {
+            "pending": self.pending,
+            "sent": self.total_sent,
+            "failed": self.total_failed,
+        }
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Дочекатися завершення всіх запланованих розсилок"""
+        if not self._tasks:
+            return
+        await asyncio.wait(list(self._tasks), timeout=timeout)
+
+
+# Глобальний екземпляр сервісу сповіщень
+notification_service = NotificationService(
+    max_concurrency=settings.notify_max_concurrency,
+    per_chat_interval=settings.notify_per_chat_interval,
+)
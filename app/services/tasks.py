@@ -0,0 +1,182 @@
+"""
+Реєстр фонових задач (TaskSupervisor)
+
+Замість asyncio.create_task "вистрілив і забув":
+- кожна задача має назву та групу і тримається сильним посиланням до завершення
+- помилки логуються з назвою задачі, а не губляться
+- кількість одночасних задач у групі обмежена semaphore
+- при зупинці бота службові задачі скасовуються, робочі дочікуються
+  з таймаутом, потім по черзі виконуються зареєстровані хуки (черги, воркери)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.monitoring.metrics import (
+    background_task_duration,
+    background_tasks_running,
+    background_tasks_total,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _TaskInfo:
+    name: str
+    group: str
+    drain: bool
+    created_at: float
+    coro: Coroutine
+    started: bool = False
+
+
+class TaskSupervisor:
+    """Запускає та відстежує фонові задачі бота"""
+
+    def __init__(self, max_concurrency: int = 20, drain_timeout: float = 15.0):
+        self.max_concurrency = max_concurrency
+        self.drain_timeout = drain_timeout
+        self._tasks: Dict[asyncio.Task, _TaskInfo] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._limits: Dict[str, int] = {}
+        self._shutdown_hooks: List[Tuple[str, Callable[[], Awaitable[None]]]] = []
+        self._closing = False
+
+    def set_group_limit(self, group: str, limit: int) -> None:
+        """Окремий ліміт одночасних задач для групи"""
+        self._limits[group] = limit
+
+    def add_shutdown_hook(self, name: str, hook: Callable[[], Awaitable[None]]) -> None:
+        """Хук зупинки (злити чергу, зупинити воркер); виконуються в порядку додавання"""
+        self._shutdown_hooks.append((name, hook))
+
+    @property
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def spawn(
+        self,
+        coro: Coroutine,
+        name: str,
+        group: str = "default",
+        drain: bool = True,
+    ) -> Optional[asyncio.Task]:
+        """Запустити задачу під наглядом.
+
+        Args:
+            coro: Корутина задачі
+            name: Назва для логів (наприклад "media_group:123")
+            group: Група для лімітів та метрик
+            drain: True - дочекатися завершення при зупинці, False - скасувати
+                   (нескінченні цикли обслуговування)
+
+        Returns:
+            asyncio.Task або None, якщо бот уже зупиняється
+        """
+        if self._closing:
+            coro.close()
+            background_tasks_total.inc(group=group, status="rejected")
+            logger.warning(f"⚠️ Фонову задачу {name} не запущено: бот зупиняється")
+            return None
+
+        info = _TaskInfo(
+            name=name, group=group, drain=drain, created_at=time.monotonic(), coro=coro
+        )
+        task = asyncio.create_task(self._supervise(coro, info), name=name)
+        self._tasks[task] = info
+        background_tasks_running.inc(group=group)
+        task.add_done_callback(self._on_done)
+        return task
+
+    def find(self, name: str) -> Optional[asyncio.Task]:
+        """Активна задача з такою назвою"""
+        for task, info in self._tasks.items():
+            if info.name == name and not task.done():
+                return task
+        return None
+
+    def count(self, group: str = None) -> int:
+        """Кількість активних задач (усього або в групі)"""
+        return sum(1 for info in self._tasks.values() if group is None or info.group == group)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Кількість активних задач по групах"""
+        stats: Dict[str, int] = {}
+        for info in self._tasks.values():
+            stats[info.group] = stats.get(info.group, 0) + 1
+        return stats
+
+    def _semaphore(self, group: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(group)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._limits.get(group, self.max_concurrency))
+            self._semaphores[group] = semaphore
+        return semaphore
+
+    async def _supervise(self, coro: Coroutine, info: _TaskInfo) -> None:
+        info.started = True
+        status = "ok"
+        try:
+            async with self._semaphore(info.group):
+                await coro
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            status = "error"
+            logger.error(f"❌ Фонова задача {info.name} завершилась з помилкою: {e}", exc_info=True)
+        finally:
+            # Корутина, що не встигла стартувати (скасована в черзі), закривається без попередження
+            coro.close()
+            background_tasks_total.inc(group=info.group, status=status)
+            background_task_duration.observe(time.monotonic() - info.created_at, group=info.group)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        info = self._tasks.pop(task, None)
+        if info is None:
+            return
+        background_tasks_running.dec(group=info.group)
+        if not info.started:
+            # Задачу скасовано ще до першого кроку - _supervise не виконувався
+            info.coro.close()
+            background_tasks_total.inc(group=info.group, status="cancelled")
+
+    async def shutdown(self, timeout: float = None) -> None:
+        """Зупинка: скасувати службові задачі, дочекатися робочих, виконати хуки"""
+        self._closing = True
+        timeout = self.drain_timeout if timeout is None else timeout
+
+        daemons = [task for task, info in self._tasks.items() if not info.drain]
+        for task in daemons:
+            task.cancel()
+
+        pending = [task for task, info in self._tasks.items() if info.drain]
+        if pending:
+            logger.info(f"⏳ Очікуємо завершення {len(pending)} фонових задач (до {timeout:.0f} с)")
+            _, still_running = await asyncio.wait(pending, timeout=timeout)
+            for task in still_running:
+                logger.warning(f"⚠️ Фонову задачу {self._tasks[task].name} скасовано по таймауту")
+                task.cancel()
+            daemons.extend(still_running)
+
+        if daemons:
+            await asyncio.gather(*daemons, return_exceptions=True)
+
+        for name, hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"❌ Помилка при зупинці '{name}': {e}")
+        logger.info("🛑 Фонові задачі зупинено")
+
+
+# Глобальний реєстр фонових задач
+task_supervisor = TaskSupervisor(
+    max_concurrency=settings.background_max_concurrency,
+    drain_timeout=settings.shutdown_drain_timeout,
+)
@@ -0,0 +1,192 @@
+"""
+Редагування повідомлень без зайвих викликів Telegram API
+
+Для кожного (chat_id, message_id) пам'ятаємо хеш останнього відмальованого
+тексту, медіа та клавіатури. Далі:
+- якщо нічого не змінилось - редагування пропускається
+- якщо змінився лише підпис - edit_caption замість edit_media
+- якщо змінилась лише клавіатура - edit_reply_markup
+- "message is not modified" вважається успіхом, а не приводом
+  видаляти повідомлення та надсилати нове
+
+Збережений стан довіряємо, лише якщо повідомлення з callback має той самий
+edit_date та клавіатуру, що й після нашого редагування - якщо його змінив
+інший обробник, редагуємо як зазвичай.
+
+Методи повертають True, якщо повідомлення показує потрібний вміст, і False,
+якщо редагування не вдалося - тоді обробник робить свій fallback.
+З propagate_api_errors=True False означає лише TelegramBadRequest, а решта
+помилок API (RetryAfter, мережа) передається викликачу - щоб fallback
+"надіслати нове повідомлення" не дублював повідомлення при таких збоях.
+"""
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
+from aiogram.types import (
+    InlineKeyboardMarkup,
+    InputMediaPhoto,
+    InputMediaVideo,
+    Message,
+)
+
+from app.utils.formatting import get_default_parse_mode
+
+logger = logging.getLogger(__name__)
+
+# Скільки повідомлень пам'ятати
+MAX_TRACKED_MESSAGES = 5000
+
+
+@dataclass(frozen=True)
+class _Rendered:
+    media: Optional[Tuple[str, str]]  # (photo|video, file_id) або None для тексту
+    text_hash: int
+    markup_hash: int
+    edit_date: Optional[int]
+
+
+def _markup_hash(reply_markup: Optional[InlineKeyboardMarkup]) -> int:
+    if reply_markup is None:
+        return hash("")
+    return hash(reply_markup.model_dump_json(exclude_none=True))
+
+
+def _edit_date(message: Union[Message, bool, None]) -> Optional[int]:
+    edit_date = getattr(message, "edit_date", None)
+    if edit_date is None:
+        return None
+    return int(edit_date.timestamp()) if hasattr(edit_date, "timestamp") else int(edit_date)
+
+
+def _is_not_modified(error: TelegramBadRequest) -> bool:
+    return "message is not modified" in str(error).lower()
+
+
+class MessageEditor:
+    """Пам'ятає вміст відредагованих повідомлень і пропускає зайві редагування"""
+
+    def __init__(self, max_messages: int = MAX_TRACKED_MESSAGES):
+        self.max_messages = max_messages
+        self._rendered: "OrderedDict[Tuple[int, int], _Rendered]" = OrderedDict()
+
+    def _known(self, message: Message) -> Optional[_Rendered]:
+        """Збережений стан, якщо повідомлення відтоді ніхто не змінював"""
+        key = (message.chat.id, message.message_id)
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            return None
+        if rendered.edit_date != _edit_date(message) or rendered.markup_hash != _markup_hash(
+            message.reply_markup
+        ):
+            del self._rendered[key]
+            return None
+        self._rendered.move_to_end(key)
+        return rendered
+
+    def _remember(
+        self,
+        message: Message,
+        result: Union[Message, bool],
+        media: Optional[Tuple[str, str]],
+        text_hash: int,
+        markup_hash: int,
+    ) -> None:
+        key = (message.chat.id, message.message_id)
+        self._rendered[key] = _Rendered(media, text_hash, markup_hash, _edit_date(result))
+        self._rendered.move_to_end(key)
+        while len(self._rendered) > self.max_messages:
+            self._rendered.popitem(last=False)
+
+    def forget(self, message: Message) -> None:
+        """Забути повідомлення (наприклад, після видалення)"""
+        self._rendered.pop((message.chat.id, message.message_id), None)
+
+    async def edit_text(
+        self,
+        message: Message,
+        text: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+        parse_mode: Optional[str] = None,
+        propagate_api_errors: bool = False,
+    ) -> bool:
+        """Відредагувати текстове повідомлення"""
+        parse_mode = parse_mode or get_default_parse_mode()
+        text_hash = hash((text, parse_mode))
+        markup_hash = _markup_hash(reply_markup)
+        known = self._known(message)
+
+        try:
+            if known and known.media is None and known.text_hash == text_hash:
+                if known.markup_hash == markup_hash:
+                    logger.debug(f"⏭️ Повідомлення {message.message_id} не змінилось, редагування пропущено")
+                    return True
+                result = await message.edit_reply_markup(reply_markup=reply_markup)
+            else:
+                result = await message.edit_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+        except TelegramBadRequest as e:
+            if not _is_not_modified(e):
+                logger.debug(f"Не вдалося edit_text {message.message_id}: {e}")
+                return False
+            result = None
+        except TelegramAPIError as e:
+            if propagate_api_errors:
+                raise
+            logger.debug(f"Не вдалося edit_text {message.message_id}: {e}")
+            return False
+
+        # "not modified": нового edit_date немає, стан збігається з тим, що бачив callback
+        self._remember(message, result if result is not None else message, None, text_hash, markup_hash)
+        return True
+
+    async def edit_media(
+        self,
+        message: Message,
+        media_type: str,
+        file_id: str,
+        caption: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+        parse_mode: Optional[str] = None,
+    ) -> bool:
+        """Відредагувати повідомлення з фото/відео (media_type: photo або video)"""
+        parse_mode = parse_mode or get_default_parse_mode()
+        media = (media_type, file_id)
+        text_hash = hash((caption, parse_mode))
+        markup_hash = _markup_hash(reply_markup)
+        known = self._known(message)
+
+        try:
+            if known and known.media == media:
+                if known.text_hash == text_hash and known.markup_hash == markup_hash:
+                    logger.debug(f"⏭️ Повідомлення {message.message_id} не змінилось, редагування пропущено")
+                    return True
+                if known.text_hash == text_hash:
+                    result = await message.edit_reply_markup(reply_markup=reply_markup)
+                else:
+                    # Те саме фото - достатньо змінити підпис
+                    result = await message.edit_caption(
+                        caption=caption, reply_markup=reply_markup, parse_mode=parse_mode
+                    )
+            else:
+                media_class = InputMediaVideo if media_type == "video" else InputMediaPhoto
+                result = await message.edit_media(
+                    media=media_class(media=file_id, caption=caption, parse_mode=parse_mode),
+                    reply_markup=reply_markup,
+                )
+        except TelegramBadRequest as e:
+            if not _is_not_modified(e):
+                logger.debug(f"Не вдалося edit_media {message.message_id}: {e}")
+                return False
+            result = None
+        except TelegramAPIError as e:
+            logger.debug(f"Не вдалося edit_media {message.message_id}: {e}")
+            return False
+
+        self._remember(message, result if result is not None else message, media, text_hash, markup_hash)
+        return True
+
+
+# Глобальний редактор повідомлень
+message_editor = MessageEditor()
@@ -0,0 +1,97 @@
+"""
+Об'єднання швидких натискань навігації (prev/next, сторінки)
+
+Коли користувач кілька разів поспіль тисне «Далі», кожне натискання
+запускає свій обробник: запит до БД та edit_media, які змагаються між собою.
+Тут кожне натискання отримує номер покоління для свого повідомлення.
+Рендеринг виконується по черзі під блокуванням повідомлення, і лише останнє
+натискання справді малює картку - старіші пропускаються.
+
+Використання в обробнику:
+
+    nav = navigation_coalescer.begin(callback.message)
+    await state.update_data(current_index=new_index)  # дешеві зміни стану - як раніше
+    async with nav as is_latest:
+        if not is_latest:
+            return
+        vehicle = await db_manager.get_vehicle_by_id(...)
+        if nav.superseded:
+            return
+        await render(...)
+"""
+import asyncio
+import logging
+from typing import Dict, Tuple
+
+from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+# Скільки повідомлень відстежувати, перш ніж прибирати неактивні
+MAX_TRACKED_MESSAGES = 1000
+
+
+class _NavigationSlot:
+    __slots__ = ("generation", "lock")
+
+    def __init__(self):
+        self.generation = 0
+        self.lock = asyncio.Lock()
+
+
+class NavigationTicket:
+    """Одне натискання навігації для конкретного повідомлення"""
+
+    def __init__(self, coalescer: "NavigationCoalescer", key: Tuple[int, int], slot: _NavigationSlot):
+        self._coalescer = coalescer
+        self._key = key
+        self._slot = slot
+        self.generation = slot.generation
+
+    @property
+    def superseded(self) -> bool:
+        """Чи з'явилось новіше натискання для цього повідомлення"""
+        return self._slot.generation != self.generation
+
+    async def __aenter__(self) -> bool:
+        await self._slot.lock.acquire()
+        if self.superseded:
+            logger.debug(f"⏭️ Рендеринг навігації {self._key} пропущено: є новіше натискання")
+            return False
+        return True
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._slot.lock.release()
+        if not self.superseded:
+            self._coalescer._forget(self._key, self._slot)
+
+
+class NavigationCoalescer:
+    """Покоління та блокування рендерингу по (chat_id, message_id)"""
+
+    def __init__(self):
+        self._slots: Dict[Tuple[int, int], _NavigationSlot] = {}
+
+    def begin(self, message: Message) -> NavigationTicket:
+        """Зареєструвати нове натискання; попередні для цього повідомлення стають застарілими"""
+        key = (message.chat.id, message.message_id)
+        slot = self._slots.get(key)
+        if slot is None:
+            if len(self._slots) >= MAX_TRACKED_MESSAGES:
+                self._prune()
+            slot = self._slots[key] = _NavigationSlot()
+        slot.generation += 1
+        return NavigationTicket(self, key, slot)
+
+    def _forget(self, key: Tuple[int, int], slot: _NavigationSlot) -> None:
+        if self._slots.get(key) is slot and not slot.lock.locked():
+            del self._slots[key]
+
+    def _prune(self) -> None:
+        # Слоти натискань, що завершились без рендерингу (ранній return)
+        for key in [key for key, slot in self._slots.items() if not slot.lock.locked()]:
+            del self._slots[key]
+
+
+# Глобальний координатор навігації
+navigation_coalescer = NavigationCoalescer()
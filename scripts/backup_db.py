@@ -0,0 +1,101 @@
+"""Create, verify and restore compressed backups of the bot database.
+
+Backups are taken with the SQLite online backup API, so ``create`` is safe
+while the bot is running. ``restore`` overwrites the target database and must
+only be run with the bot stopped.
+
+Examples:
+    python scripts/backup_db.py create
+    python scripts/backup_db.py list
+    python scripts/backup_db.py verify            # newest backup
+    python scripts/backup_db.py verify data/backups/truck_bot_20250101_030000.db.gz
+    python scripts/backup_db.py restore data/backups/truck_bot_20250101_030000.db.gz --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Online backups of the bot SQLite database")
+    parser.add_argument("--db", default=None, help="database path (default: DATABASE_URL from settings)")
+    parser.add_argument("--dir", default=None, help="backup directory (default: BACKUP_DIR from settings)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("create", help="take a backup now")
+    commands.add_parser("list", help="list backups, newest first")
+
+    verify = commands.add_parser("verify", help="unpack a backup into a temp file and run integrity_check")
+    verify.add_argument("backup", nargs="?", type=Path, default=None, help="backup file (default: newest)")
+
+    restore = commands.add_parser("restore", help="verify a backup and restore it (bot must be stopped)")
+    restore.add_argument("backup", type=Path)
+    restore.add_argument("--target", default=None, help="restore into this file instead of the live database")
+    restore.add_argument("--force", action="store_true", help="overwrite an existing target database")
+    return parser.parse_args()
+
+
+def resolve_backup(backup, path: Optional[Path]) -> Path:
+    if path is not None:
+        if not path.exists():
+            raise SystemExit(f"Backup not found: {path}")
+        return path
+    backups = backup.list_backups()
+    if not backups:
+        raise SystemExit(f"No backups in {backup.backup_dir}")
+    return backups[0]
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ.setdefault("BOT_TOKEN", "123456:BACKUP")
+    sys.path.insert(0, str(BASE_DIR))
+
+    from app.config.settings import settings
+    from app.modules.database.backup import DatabaseBackup
+
+    backup = DatabaseBackup(
+        args.db or settings.database_url.replace("sqlite:///", ""),
+        args.dir or settings.backup_dir,
+        keep=settings.backup_keep,
+        pages_per_step=settings.backup_pages_per_step,
+        step_pause=settings.backup_step_pause,
+    )
+
+    if args.command == "create":
+        if not Path(backup.db_path).exists():
+            raise SystemExit(f"Database not found: {backup.db_path}")
+        path = asyncio.run(backup.create_backup())
+        print(f"Backup written to {path}")
+
+    elif args.command == "list":
+        for path in backup.list_backups():
+            print(f"{path.name}  {path.stat().st_size / 1024 / 1024:8.1f} MB")
+
+    elif args.command == "verify":
+        path = resolve_backup(backup, args.backup)
+        report = backup.verify_backup(path)
+        print(f"{path.name}: {json.dumps(report, ensure_ascii=False)}")
+        if not report["ok"]:
+            raise SystemExit(1)
+
+    elif args.command == "restore":
+        path = resolve_backup(backup, args.backup)
+        target = args.target or backup.db_path
+        if Path(target).exists() and not args.force:
+            raise SystemExit(f"{target} exists; stop the bot and pass --force to overwrite it")
+        report = backup.restore_backup(path, target)
+        print(f"Restored {path.name} into {target}: {json.dumps(report, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
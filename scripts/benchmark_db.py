@@ -0,0 +1,436 @@
+"""Benchmark every public DatabaseManager method on synthetic datasets.
+
+For each size (default 1k, 10k and 100k rows) a dataset is generated with
+``scripts/generate_dataset.py`` (cached under ``data/bench/``), copied to a
+scratch file and every public coroutine of ``DatabaseManager`` is timed
+against it. Results can be saved as a baseline JSON and later compared.
+
+Examples:
+    python scripts/benchmark_db.py --save-baseline
+    python scripts/benchmark_db.py --sizes 1000 10000 --compare
+    python scripts/benchmark_db.py --only search_vehicles get_available_vehicles_by_types
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+BENCH_DIR = BASE_DIR / "data" / "bench"
+DEFAULT_BASELINE = BENCH_DIR / "db_baseline.json"
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Methods that are not timed on purpose
+SKIPPED = {
+    "init_database": "schema setup, timed indirectly by dataset generation",
+    "delete_all_vehicles": "destroys the dataset for every following case",
+}
+
+
+@dataclass
+class Case:
+    """One benchmarked call; ``make`` receives the context and returns a coroutine."""
+
+    method: str
+    make: Callable[["Context"], Awaitable[Any]]
+    label: str = ""
+    writes: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.method}[{self.label}]" if self.label else self.method
+
+
+class Context:
+    """Sample ids taken from the dataset so calls hit real rows."""
+
+    def __init__(self, db, db_path: Path, rows: int) -> None:
+        self.db = db
+        self.rows = rows
+        self.counter = 0
+        with sqlite3.connect(db_path) as conn:
+            self.user_id, self.telegram_id = conn.execute(
+                "SELECT id, telegram_id FROM users ORDER BY id LIMIT 1 OFFSET ?", (rows // 2,)
+            ).fetchone()
+            self.heavy_user_id = conn.execute(
+                "SELECT user_id FROM saved_vehicles GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1"
+            ).fetchone()[0]
+            self.vehicle_id, self.group_message_id, self.vin, self.brand, self.model = conn.execute(
+                "SELECT id, group_message_id, vin_code, brand, model FROM vehicles "
+                "WHERE group_message_id IS NOT NULL ORDER BY id LIMIT 1 OFFSET ?",
+                (rows // 3,),
+            ).fetchone()
+            self.subscription = dict(zip(
+                ("id", "user_id", "vehicle_type", "brand", "min_year", "max_price"),
+                conn.execute(
+                    "SELECT id, user_id, vehicle_type, brand, min_year, max_price FROM subscriptions "
+                    "WHERE vehicle_type IS NOT NULL ORDER BY id LIMIT 1"
+                ).fetchone(),
+            ))
+            self.request_id = conn.execute("SELECT MAX(id) FROM manager_requests").fetchone()[0]
+            self.broadcast_id = conn.execute("SELECT MAX(id) FROM broadcasts").fetchone()[0]
+            self.thread_id = conn.execute("SELECT MAX(thread_id) FROM group_topics").fetchone()[0]
+
+    def next(self) -> int:
+        self.counter += 1
+        return self.counter
+
+
+def build_cases() -> List[Case]:
+    from app.modules.database.models import UserModel, VehicleCondition, VehicleModel, VehicleType
+
+    def new_user(c: Context):
+        return c.db.create_user(UserModel(telegram_id=9_000_000_000 + c.next(), first_name="Bench"))
+
+    def new_vehicle(c: Context):
+        return c.db.create_vehicle(VehicleModel(
+            vehicle_type=VehicleType.SADDLE_TRACTOR, brand="DAF", model="XF", year=2019,
+            condition=VehicleCondition.USED, price=42000.0, seller_id=1, photos=["bench_photo"],
+        ))
+
+    def cold_vehicle_by_id(c: Context):
+        # Скидаємо запис кешу, щоб виміряти читання з БД
+        c.db._vehicles_changed([c.vehicle_id])
+        return c.db.get_vehicle_by_id(c.vehicle_id)
+
+    def enqueue_notifications(c: Context):
+        # Масове додавання: 30 нових авто збіглися з однією підпискою
+        start = c.next() * 30
+        return c.db.enqueue_subscription_notifications([
+            (c.subscription["user_id"], c.subscription["id"], vehicle_id, datetime.now())
+            for vehicle_id in range(start, start + 30)
+        ])
+
+    search_params = {"vehicle_type": "saddle_tractor", "min_year": 2015, "max_price": 60000}
+
+    return [
+        # Користувачі
+        Case("create_user", new_user, writes=True),
+        Case("get_user_by_telegram_id", lambda c: c.db.get_user_by_telegram_id(c.telegram_id)),
+        Case("get_user_by_id", lambda c: c.db.get_user_by_id(c.user_id)),
+        Case("update_user", lambda c: c.db.update_user(c.user_id, {"first_name": f"Bench{c.next()}"}), writes=True),
+        Case("promote_to_admin", lambda c: c.db.promote_to_admin(c.user_id), writes=True),
+        Case("demote_from_admin", lambda c: c.db.demote_from_admin(c.user_id), writes=True),
+        Case("block_user", lambda c: c.db.block_user(c.user_id), writes=True),
+        Case("unblock_user", lambda c: c.db.unblock_user(c.user_id), writes=True),
+        Case("get_admins", lambda c: c.db.get_admins()),
+        Case("get_buyers", lambda c: c.db.get_buyers()),
+        Case("get_all_users", lambda c: c.db.get_all_users()),
+        Case("get_users", lambda c: c.db.get_users(limit=10, offset=c.rows // 2), "deep page"),
+        Case("get_users", lambda c: c.db.get_users(limit=10, status_filter="blocked"), "blocked"),
+        Case("get_users_count", lambda c: c.db.get_users_count()),
+        Case("get_users_page", lambda c: c.db.get_users_page(limit=10, offset=c.rows // 2), "cached stats"),
+        Case("get_users_page", lambda c: (c.db._users_changed(), c.db.get_users_page(limit=10, status_filter="blocked"))[1], "cold"),
+        Case("get_users_statistics", lambda c: c.db.get_users_statistics(), "snapshot"),
+        Case("get_users_statistics", lambda c: (c.db._users_changed(), c.db.get_users_statistics())[1], "cold"),
+        Case("delete_user", lambda c: c.db.delete_user(c.rows - c.next()), writes=True),
+        Case("search_users_by_id", lambda c: c.db.search_users_by_id(c.user_id)),
+        Case("search_users_by_telegram_id", lambda c: c.db.search_users_by_telegram_id(c.telegram_id)),
+        Case("search_users_by_name", lambda c: c.db.search_users_by_name("Олен")),
+        Case("search_users_by_name", lambda c: c.db.search_users_by_name("ол"), "short prefix"),
+        Case("search_users_by_phone", lambda c: c.db.search_users_by_phone("067123")),
+        Case("search_users_by_phone", lambda c: c.db.search_users_by_phone("4567"), "suffix"),
+        Case("search_users_by_role", lambda c: c.db.search_users_by_role("admin")),
+        Case("search_users_by_username", lambda c: c.db.search_users_by_username("user_12")),
+        Case("rebuild_user_search", lambda c: c.db.rebuild_user_search(), writes=True),
+        # Авто
+        Case("create_vehicle", new_vehicle, writes=True),
+        Case("get_vehicle_by_id", lambda c: c.db.get_vehicle_by_id(c.vehicle_id), "cached"),
+        Case("get_vehicle_by_id", cold_vehicle_by_id, "cold"),
+        Case("get_vehicle_by_id", lambda c: c.db.get_vehicle_by_id(-c.next()), "missing id"),
+        Case("get_vehicle_by_id_from_message_id", lambda c: c.db.get_vehicle_by_id_from_message_id(c.group_message_id)),
+        Case("update_vehicle", lambda c: c.db.update_vehicle(c.vehicle_id, {"views_count": c.next()}), writes=True),
+        Case("get_all_vehicles", lambda c: c.db.get_all_vehicles()),
+        Case("get_export_page", lambda c: c.db.get_export_page("vehicles", after_id=c.rows // 2)),
+        Case("get_changed_rows_page", lambda c: c.db.get_changed_rows_page("vehicles", "2099-01-01")),
+        Case("get_deleted_rows", lambda c: c.db.get_deleted_rows("vehicles")),
+        Case("get_export_watermark", lambda c: c.db.get_export_watermark("all", "vehicles")),
+        Case("save_export_watermarks", lambda c: c.db.save_export_watermarks("bench", {"vehicles": ("2099-01-01", 0)}), writes=True),
+        Case("get_vehicles", lambda c: c.db.get_vehicles(limit=20)),
+        Case("get_vehicles", lambda c: c.db.get_vehicles(limit=20, offset=c.rows // 2), "deep page"),
+        Case("get_available_vehicles", lambda c: c.db.get_available_vehicles(limit=20)),
+        Case("get_available_vehicles", lambda c: c.db.get_available_vehicles(limit=20, sort_by="price_asc"), "price_asc"),
+        Case("get_available_vehicles_by_types", lambda c: c.db.get_available_vehicles_by_types(["van", "refrigerator"], limit=20)),
+        Case("get_vehicles_count", lambda c: c.db.get_vehicles_count()),
+        Case("get_available_vehicles_count", lambda c: c.db.get_available_vehicles_count()),
+        Case("get_vehicle_facets", lambda c: c.db.get_vehicle_facets(), "snapshot"),
+        Case("get_vehicle_facets", lambda c: (c.db._vehicles_changed(), c.db.get_vehicle_facets())[1], "cold"),
+        Case("rebuild_vehicle_facets", lambda c: c.db.rebuild_vehicle_facets(), writes=True),
+        Case("get_vehicles_by_status", lambda c: c.db.get_vehicles_by_status("sold", page=3)),
+        Case("get_archived_vehicles_count", lambda c: c.db.get_archived_vehicles_count()),
+        Case("get_vehicles_count_by_status", lambda c: c.db.get_vehicles_count_by_status("available")),
+        Case("search_vehicles", lambda c: c.db.search_vehicles(dict(search_params, sort_by="price_asc"))),
+        Case("search_vehicles_by_name", lambda c: c.db.search_vehicles_by_name(c.brand)),
+        Case("search_vehicles_by_vin", lambda c: c.db.search_vehicles_by_vin(c.vin)),
+        Case("search_vehicles_by_brand", lambda c: c.db.search_vehicles_by_brand("Volvo")),
+        Case("search_vehicles_by_model", lambda c: c.db.search_vehicles_by_model(c.model)),
+        Case("search_vehicles_by_brand_model", lambda c: c.db.search_vehicles_by_brand_model(f"{c.brand} {c.model}")),
+        Case("search_vehicles_by_brand_and_model", lambda c: c.db.search_vehicles_by_brand_and_model(c.brand, c.model)),
+        Case("search_vehicles_by_years", lambda c: c.db.search_vehicles_by_years(2020, 2022)),
+        Case("search_vehicles_by_price_range", lambda c: c.db.search_vehicles_by_price_range(20000, 25000)),
+        Case("get_vehicles_for_bulk_action", lambda c: c.db.get_vehicles_for_bulk_action(["trailer"], "available", 90)),
+        Case("bulk_update_vehicle_status", lambda c: c.db.bulk_update_vehicle_status(list(range(1, 201)), "available"), writes=True),
+        Case("bulk_archive_vehicles", lambda c: c.db.bulk_archive_vehicles([c.rows]), writes=True),
+        Case("archive_sold_vehicles", lambda c: c.db.archive_sold_vehicles(30, limit=100), writes=True),
+        Case("cleanup_invalid_vehicle_data", lambda c: c.db.cleanup_invalid_vehicle_data(), writes=True),
+        Case("add_photo", lambda c: c.db.add_photo(c.vehicle_id, "bench_file", "bench/path.jpg"), writes=True),
+        Case("get_vehicle_photos", lambda c: c.db.get_vehicle_photos(c.vehicle_id)),
+        Case("get_main_photo", lambda c: c.db.get_main_photo(c.vehicle_id)),
+        Case("get_vehicle_media", lambda c: c.db.get_vehicle_media(c.vehicle_id)),
+        Case("get_vehicle_media_ids", lambda c: c.db.get_vehicle_media_ids(c.vehicle_id)),
+        Case("set_main_photo", lambda c: c.db.set_main_photo(c.vehicle_id, "bench_file"), writes=True),
+        Case("replace_vehicle_photos", lambda c: c.db.replace_vehicle_photos(c.vehicle_id, [f"bench_{c.next()}"]), writes=True),
+        Case("rebuild_vehicle_media", lambda c: c.db.rebuild_vehicle_media(), writes=True),
+        Case("delete_vehicle", lambda c: c.db.delete_vehicle(c.rows - c.next()), writes=True),
+        # Збережені авто
+        Case("save_vehicle", lambda c: c.db.save_vehicle(c.user_id, c.next()), writes=True),
+        Case("is_vehicle_saved", lambda c: c.db.is_vehicle_saved(c.heavy_user_id, c.vehicle_id)),
+        Case("get_saved_vehicles", lambda c: c.db.get_saved_vehicles(c.heavy_user_id)),
+        Case("get_saved_vehicles_by_category", lambda c: c.db.get_saved_vehicles_by_category(c.heavy_user_id, "favorites")),
+        Case("update_saved_vehicle_notes", lambda c: c.db.update_saved_vehicle_notes(c.user_id, 1, "bench"), writes=True),
+        Case("update_saved_vehicle_category", lambda c: c.db.update_saved_vehicle_category(c.user_id, 1, "compare"), writes=True),
+        Case("remove_saved_vehicle", lambda c: c.db.remove_saved_vehicle(c.user_id, c.next()), writes=True),
+        # Заявки
+        Case("create_manager_request", lambda c: c.db.create_manager_request(c.user_id, "general", "bench"), writes=True),
+        Case("get_all_requests", lambda c: c.db.get_all_requests()),
+        Case("get_manager_requests", lambda c: c.db.get_manager_requests(status_filter="new", limit=10, offset=20)),
+        Case("get_manager_requests", lambda c: c.db.get_manager_requests(user_id=c.user_id), "by user"),
+        Case("get_manager_requests_count", lambda c: c.db.get_manager_requests_count("new")),
+        Case("get_manager_requests_stats", lambda c: c.db.get_manager_requests_stats()),
+        Case("update_manager_request_status", lambda c: c.db.update_manager_request_status(c.request_id, "done", c.user_id), writes=True),
+        Case("delete_manager_request", lambda c: c.db.delete_manager_request(c.request_id - c.next()), writes=True),
+        # Історія пошуку та підписки
+        Case("save_search_history", lambda c: c.db.save_search_history(c.user_id, search_params, 10), writes=True),
+        Case("get_search_history", lambda c: c.db.get_search_history(c.user_id)),
+        Case("delete_search_history", lambda c: c.db.delete_search_history(c.user_id, c.next()), writes=True),
+        Case("create_subscription", lambda c: c.db.create_subscription(c.user_id, "Bench", search_params), writes=True),
+        Case("get_user_subscriptions", lambda c: c.db.get_user_subscriptions(c.subscription["user_id"])),
+        Case("get_active_subscriptions", lambda c: c.db.get_active_subscriptions()),
+        Case("find_vehicles_for_subscription", lambda c: c.db.find_vehicles_for_subscription(c.subscription)),
+        Case("preview_subscription_matches", lambda c: c.db.preview_subscription_matches(c.subscription)),
+        Case("rebuild_vehicle_brand_search", lambda c: c.db.rebuild_vehicle_brand_search(), writes=True),
+        Case("update_subscription_status", lambda c: c.db.update_subscription_status(c.subscription["id"], True), writes=True),
+        Case("update_subscription_last_notification", lambda c: c.db.update_subscription_last_notification(c.subscription["id"]), writes=True),
+        Case("delete_subscription", lambda c: c.db.delete_subscription(c.user_id, c.next()), writes=True),
+        Case("update_subscription_digest_mode", lambda c: c.db.update_subscription_digest_mode(c.subscription["user_id"], c.subscription["id"], "daily"), writes=True),
+        Case("enqueue_subscription_notifications", enqueue_notifications, writes=True),
+        Case("get_due_notifications", lambda c: c.db.get_due_notifications(datetime.now())),
+        Case("get_next_notification_time", lambda c: c.db.get_next_notification_time()),
+        Case("postpone_notifications", lambda c: c.db.postpone_notifications([c.next()], datetime.now()), writes=True),
+        Case("complete_notifications", lambda c: c.db.complete_notifications([c.next()], [c.subscription["id"]]), writes=True),
+        # Розсилки та гілки групи
+        Case("create_broadcast", lambda c: c.db.create_broadcast({"text": "Bench", "status": "draft"}), writes=True),
+        Case("get_all_broadcasts_raw", lambda c: c.db.get_all_broadcasts_raw()),
+        Case("list_broadcasts", lambda c: c.db.list_broadcasts(limit=20, status_filter="sent")),
+        Case("get_broadcasts_count", lambda c: c.db.get_broadcasts_count()),
+        Case("get_broadcasts_statistics", lambda c: c.db.get_broadcasts_statistics()),
+        Case("get_broadcast_by_id", lambda c: c.db.get_broadcast_by_id(c.broadcast_id)),
+        Case("delete_broadcast", lambda c: c.db.delete_broadcast(c.broadcast_id - c.next()), writes=True),
+        Case("upsert_group_topic", lambda c: c.db.upsert_group_topic(c.thread_id, "Bench"), writes=True),
+        Case("get_group_topics", lambda c: c.db.get_group_topics()),
+        Case("update_group_topic_thread_id", lambda c: c.db.update_group_topic_thread_id(c.thread_id, c.thread_id), writes=True),
+        Case("delete_group_topic", lambda c: c.db.delete_group_topic(-c.next()), writes=True),
+        # Версія схеми та фонові виправлення
+        Case("get_schema_version", lambda c: c.db.get_schema_version()),
+        Case("get_max_vehicle_id", lambda c: c.db.get_max_vehicle_id()),
+        Case("get_data_fix_state", lambda c: c.db.get_data_fix_state("bench")),
+        Case("save_data_fix_progress", lambda c: c.db.save_data_fix_progress("bench", c.next(), 0), writes=True),
+        Case("cleanup_invalid_vehicle_data", lambda c: c.db.cleanup_invalid_vehicle_data(0, 500), "500 ids", writes=True),
+        # Черга публікацій
+        Case("enqueue_publication_job", lambda c: c.db.enqueue_publication_job(c.next(), "publish", c.user_id), writes=True),
+        Case("enqueue_publication_jobs", lambda c: c.db.enqueue_publication_jobs([(vid, "republish") for vid in range(1, 101)], c.user_id), writes=True),
+        Case("count_active_publication_jobs", lambda c: c.db.count_active_publication_jobs()),
+        Case("get_next_publication_job_time", lambda c: c.db.get_next_publication_job_time()),
+        Case("claim_next_publication_job", lambda c: c.db.claim_next_publication_job(), writes=True),
+        Case("save_publication_job_progress", lambda c: c.db.save_publication_job_progress(1, [1, 2, 3], 4), writes=True),
+        Case("fail_publication_job", lambda c: c.db.fail_publication_job(1, "bench"), writes=True),
+        Case("complete_publication_job", lambda c: c.db.complete_publication_job(1, c.vehicle_id, {"published_in_group": True}), writes=True),
+        Case("get_last_publication_messages", lambda c: c.db.get_last_publication_messages(c.vehicle_id)),
+        Case("reset_stale_publication_jobs", lambda c: c.db.reset_stale_publication_jobs(), writes=True),
+    ]
+
+
+async def time_case(case: Case, ctx: Context, repeats: int, budget: float) -> Dict[str, Any]:
+    """Run one case up to ``repeats`` times or until the time budget is spent."""
+    timings: List[float] = []
+    error: Optional[str] = None
+    spent_until = time.perf_counter() + budget
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            await case.make(ctx)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:200]
+            break
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() > spent_until:
+            break
+
+    if not timings:
+        return {"error": error}
+    ordered = sorted(timings)
+    result = {
+        "runs": len(timings),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def prepare_dataset(rows: int, seed: int) -> Path:
+    """Get a cached dataset and copy it to a scratch file for this run."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from generate_dataset import DatasetSpec, ensure_dataset
+
+    source, created = ensure_dataset(BENCH_DIR / f"dataset_{rows}_{seed}.db", DatasetSpec.for_rows(rows, seed))
+    print(f"\n== {rows} rows ({'generated' if created else 'cached'} {source.name}) ==")
+
+    # Write cases change the data, so every run starts from a fresh copy
+    work_path = BENCH_DIR / f"work_{rows}.db"
+    shutil.copyfile(source, work_path)
+    return work_path
+
+
+async def run_size(work_path: Path, rows: int, cases: List[Case], repeats: int, budget: float) -> Dict[str, Any]:
+    from app.modules.database.manager import DatabaseManager
+
+    db = DatabaseManager(str(work_path))
+    ctx = Context(db, work_path, rows)
+
+    results: Dict[str, Any] = {}
+    # Reads first, against untouched data; writes afterwards
+    for case in sorted(cases, key=lambda item: item.writes):
+        result = await time_case(case, ctx, repeats, budget)
+        results[case.name] = result
+        if "error" in result and "median_ms" not in result:
+            print(f"  {case.name:<48} ERROR {result['error']}")
+        else:
+            print(f"  {case.name:<48} {result['median_ms']:>10.3f} ms  (p95 {result['p95_ms']:.3f}, n={result['runs']})")
+
+    return results
+
+
+def uncovered_methods(cases: List[Case]) -> List[str]:
+    """Public coroutines of DatabaseManager that have no case and are not skipped."""
+    from app.modules.database.manager import DatabaseManager
+
+    covered = {case.method for case in cases} | set(SKIPPED)
+    return sorted(
+        name
+        for name, member in inspect.getmembers(DatabaseManager, inspect.iscoroutinefunction)
+        if not name.startswith("_") and name not in covered
+    )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_delta_ms: float) -> int:
+    """Print per-case changes against the baseline and return the number of regressions."""
+    regressions = 0
+    print("\n== Comparison with baseline ==")
+    for size, results in current["results"].items():
+        base_results = baseline.get("results", {}).get(size)
+        if not base_results:
+            print(f"  {size} rows: no baseline")
+            continue
+        for name, result in results.items():
+            base = base_results.get(name)
+            if not base or "median_ms" not in base or "median_ms" not in result:
+                continue
+            delta = result["median_ms"] - base["median_ms"]
+            ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+            if ratio > 1 + threshold and delta > min_delta_ms:
+                regressions += 1
+                marker = "REGRESSION"
+            elif ratio < 1 - threshold and -delta > min_delta_ms:
+                marker = "faster"
+            else:
+                continue
+            print(f"  {marker:<10} {size:>7} {name:<48} {base['median_ms']:>9.3f} -> {result['median_ms']:>9.3f} ms ({ratio:.2f}x)")
+    print(f"  {regressions} regression(s) above {threshold:.0%} and {min_delta_ms} ms")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager methods on synthetic datasets")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=20, help="max runs per case")
+    parser.add_argument("--budget", type=float, default=2.0, help="max seconds per case")
+    parser.add_argument("--only", nargs="+", default=None, help="benchmark only these methods")
+    parser.add_argument("--output", type=Path, default=None, help="write results JSON here")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {DEFAULT_BASELINE.name}")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, type=Path, default=None,
+                        help="compare with a baseline JSON (default: saved baseline)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown treated as regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore smaller absolute changes")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ.setdefault("BOT_TOKEN", "123456:BENCHMARK")
+    # Profiler and INFO logging would distort the timings
+    os.environ["QUERY_PROFILER_ENABLED"] = "false"
+    sys.path.insert(0, str(BASE_DIR))
+    logging.disable(logging.INFO)
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+
+    cases = build_cases()
+    if args.only:
+        cases = [case for case in cases if case.method in args.only]
+    else:
+        missing = uncovered_methods(cases)
+        if missing:
+            print(f"Warning: no benchmark case for {', '.join(missing)}")
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeats": args.repeats,
+        },
+        "results": {},
+    }
+    for rows in args.sizes:
+        work_path = prepare_dataset(rows, args.seed)
+        try:
+            report["results"][str(rows)] = asyncio.run(run_size(work_path, rows, cases, args.repeats, args.budget))
+        finally:
+            work_path.unlink(missing_ok=True)
+
+    targets = [path for path in (args.output, DEFAULT_BASELINE if args.save_baseline else None) if path]
+    for path in targets:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResults written to {path}")
+
+    if args.compare:
+        if not args.compare.exists():
+            raise SystemExit(f"Baseline not found: {args.compare}")
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(report, baseline, args.threshold, args.min_delta_ms):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
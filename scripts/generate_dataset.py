@@ -0,0 +1,398 @@
+"""Generate a reproducible synthetic SQLite dataset for performance work.
+
+The schema is created by ``DatabaseManager.init_database()`` so the file always
+matches the current code; rows are then bulk-inserted with plain ``sqlite3``.
+The same ``--rows`` and ``--seed`` always produce the same data.
+
+Example:
+    python scripts/generate_dataset.py --rows 10000 --output data/bench_10k.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Relative weights observed in the production catalog: tractors and trailers dominate
+VEHICLE_TYPE_WEIGHTS = {
+    "saddle_tractor": 30,
+    "trailer": 18,
+    "semi_container_carrier": 12,
+    "refrigerator": 10,
+    "van": 10,
+    "container_carrier": 8,
+    "variable_body": 7,
+    "bus": 5,
+}
+
+# Brands per type; earlier entries are more popular (Zipf-like choice)
+BRANDS = {
+    "saddle_tractor": ["DAF", "MAN", "Volvo", "Scania", "Mercedes-Benz", "Renault", "Iveco"],
+    "trailer": ["Schmitz", "Krone", "Kögel", "Wielton", "Fliegl"],
+    "semi_container_carrier": ["Krone", "Schmitz", "Kögel", "Wielton"],
+    "refrigerator": ["Schmitz", "Chereau", "Krone", "Lamberet"],
+    "van": ["Mercedes-Benz", "Iveco", "Renault", "Volkswagen", "Ford"],
+    "container_carrier": ["DAF", "MAN", "Volvo", "Scania"],
+    "variable_body": ["MAN", "DAF", "Mercedes-Benz", "Iveco"],
+    "bus": ["Mercedes-Benz", "Volkswagen", "Renault", "Ford", "Iveco"],
+}
+
+# Median price (USD) per type for a 7 year old vehicle
+BASE_PRICE = {
+    "saddle_tractor": 38000,
+    "trailer": 16000,
+    "semi_container_carrier": 14000,
+    "refrigerator": 26000,
+    "van": 19000,
+    "container_carrier": 42000,
+    "variable_body": 31000,
+    "bus": 17000,
+}
+
+LOCATIONS = ["Київ", "Львів", "Одеса", "Дніпро", "Харків", "Рівне", "Луцьк", "Вінниця", "Житомир", "Ужгород"]
+FUEL_TYPES = ["Дизель", "Дизель", "Дизель", "Газ/Бензин", "Електро"]
+TRANSMISSIONS = ["Автомат", "Механіка", "Робот"]
+FIRST_NAMES = ["Олександр", "Андрій", "Сергій", "Іван", "Олег", "Марія", "Олена", "Тарас", "Юрій", "Наталія"]
+LAST_NAMES = ["Шевченко", "Коваленко", "Бондаренко", "Ткаченко", "Кравченко", "Олійник", "Мельник", "Поліщук"]
+REQUEST_TYPES = ["vehicle_application", "general"]
+REQUEST_STATUSES = {"new": 40, "done": 50, "cancelled": 10}
+SAVED_CATEGORIES = {"favorites": 80, "compare": 15, "later": 5}
+
+# Tables filled by the generator, in insertion order
+TABLES = ("users", "vehicles", "saved_vehicles", "subscriptions", "manager_requests", "broadcasts", "group_topics")
+
+
+@dataclass
+class DatasetSpec:
+    """Row counts for one dataset; everything scales from ``rows``."""
+
+    rows: int
+    seed: int = 42
+    users: int = 0
+    vehicles: int = 0
+    saved_vehicles: int = 0
+    subscriptions: int = 0
+    manager_requests: int = 0
+    broadcasts: int = 0
+    group_topics: int = 12
+
+    @classmethod
+    def for_rows(cls, rows: int, seed: int = 42) -> "DatasetSpec":
+        return cls(
+            rows=rows,
+            seed=seed,
+            users=rows,
+            vehicles=rows,
+            saved_vehicles=rows * 2,
+            subscriptions=max(1, rows // 4),
+            manager_requests=max(1, rows // 5),
+            broadcasts=max(1, rows // 200),
+        )
+
+
+def weighted_choice(rng: random.Random, weights: Dict[str, int]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def zipf_choice(rng: random.Random, items: Sequence[str]) -> str:
+    return rng.choices(items, weights=[1 / (rank + 1) for rank in range(len(items))])[0]
+
+
+def timestamp(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def random_moment(rng: random.Random, now: datetime, days: int = 730) -> datetime:
+    # Newer rows are more frequent: the catalog and audience keep growing
+    return now - timedelta(seconds=int(days * 86400 * rng.random() ** 1.6))
+
+
+def build_users(spec: DatasetSpec, rng: random.Random, now: datetime) -> List[tuple]:
+    rows = []
+    for index in range(spec.users):
+        created = random_moment(rng, now)
+        first_name = rng.choice(FIRST_NAMES)
+        rows.append((
+            1_000_000 + index,
+            f"user_{index}" if rng.random() < 0.7 else None,
+            first_name,
+            rng.choice(LAST_NAMES) if rng.random() < 0.6 else None,
+            f"+38067{index % 10_000_000:07d}" if rng.random() < 0.55 else None,
+            "admin" if index < max(1, spec.users // 1000) else "buyer",
+            0 if rng.random() < 0.03 else 1,
+            timestamp(created),
+            timestamp(created),
+        ))
+    return rows
+
+
+def build_vehicles(spec: DatasetSpec, rng: random.Random, now: datetime, admin_ids: List[int]) -> List[tuple]:
+    rows = []
+    for index in range(spec.vehicles):
+        vehicle_type = weighted_choice(rng, VEHICLE_TYPE_WEIGHTS)
+        brand = zipf_choice(rng, BRANDS[vehicle_type])
+        age = min(25, max(0, int(rng.triangular(0, 20, 7))))
+        year = now.year - age
+        condition = "new" if age == 0 and rng.random() < 0.8 else "used"
+        price = round(BASE_PRICE[vehicle_type] * (0.9 ** (age - 7)) * rng.lognormvariate(0, 0.25), -2)
+        mileage = 0 if condition == "new" else int(max(1000, rng.gauss(110_000, 35_000) * max(age, 1)))
+        created = random_moment(rng, now)
+        sold = rng.random() < 0.25
+        sold_at = created + timedelta(days=rng.randint(3, 120)) if sold else None
+        published = rng.random() < 0.8
+        photos = [f"AgACAgIAAx{index:08d}_{n}" for n in range(rng.randint(1, 10))]
+        rows.append((
+            brand,
+            f"{brand[:2].upper()}{rng.randint(100, 999)}",
+            year,
+            vehicle_type,
+            condition,
+            "sold" if sold else "available",
+            price,
+            mileage,
+            round(rng.uniform(4.0, 13.0), 1),
+            rng.randrange(150, 600, 10),
+            rng.choice(TRANSMISSIONS),
+            rng.choice(FUEL_TYPES),
+            rng.randrange(1000, 40000, 500),
+            rng.choice(LOCATIONS),
+            f"Стан добрий, {rng.choice(LOCATIONS)}, {rng.randint(1, 3)} власник(и)",
+            json.dumps(photos),
+            photos[0],
+            rng.choice(admin_ids),
+            0 if rng.random() < 0.05 else 1,
+            int(rng.paretovariate(1.5) * 10),
+            timestamp(created) if published else None,
+            1 if published else 0,
+            1,
+            10_000 + index if published else None,
+            "".join(rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ0123456789") for _ in range(17)),
+            timestamp(sold_at) if sold_at else None,
+            timestamp(sold_at) if sold_at else None,
+            timestamp(created),
+            timestamp(sold_at or created),
+        ))
+    return rows
+
+
+def build_saved_vehicles(spec: DatasetSpec, rng: random.Random, now: datetime) -> List[tuple]:
+    pairs = set()
+    # Most users save nothing; a minority saves a lot
+    while len(pairs) < min(spec.saved_vehicles, spec.users * spec.vehicles):
+        user_id = min(spec.users, int(rng.paretovariate(1.2))) if rng.random() < 0.3 else rng.randint(1, spec.users)
+        pairs.add((user_id, rng.randint(1, spec.vehicles)))
+    rows = []
+    for user_id, vehicle_id in sorted(pairs):
+        created = timestamp(random_moment(rng, now, 365))
+        notes = "Подзвонити продавцю" if rng.random() < 0.1 else None
+        rows.append((user_id, vehicle_id, notes, weighted_choice(rng, SAVED_CATEGORIES), created, created))
+    return rows
+
+
+def build_subscriptions(spec: DatasetSpec, rng: random.Random, now: datetime) -> List[tuple]:
+    rows = []
+    for index in range(spec.subscriptions):
+        vehicle_type = weighted_choice(rng, VEHICLE_TYPE_WEIGHTS) if rng.random() < 0.8 else None
+        brand = zipf_choice(rng, BRANDS[vehicle_type]) if vehicle_type and rng.random() < 0.4 else None
+        min_year = now.year - rng.randint(3, 15) if rng.random() < 0.5 else None
+        max_price = float(rng.randrange(10_000, 120_000, 5_000)) if rng.random() < 0.6 else None
+        created = random_moment(rng, now, 365)
+        rows.append((
+            rng.randint(1, spec.users),
+            f"Підписка {index + 1}",
+            vehicle_type,
+            brand,
+            min_year,
+            None,
+            None,
+            max_price,
+            rng.choice(["new", "used"]) if rng.random() < 0.2 else None,
+            0 if rng.random() < 0.15 else 1,
+            timestamp(created + timedelta(days=rng.randint(0, 30))) if rng.random() < 0.5 else None,
+            timestamp(created),
+            timestamp(created),
+        ))
+    return rows
+
+
+def build_manager_requests(spec: DatasetSpec, rng: random.Random, now: datetime) -> List[tuple]:
+    rows = []
+    for _ in range(spec.manager_requests):
+        request_type = rng.choice(REQUEST_TYPES)
+        created = random_moment(rng, now, 365)
+        rows.append((
+            rng.randint(1, spec.users),
+            rng.randint(1, spec.vehicles) if request_type == "vehicle_application" else None,
+            request_type,
+            "Цікавить авто, зателефонуйте будь ласка",
+            weighted_choice(rng, REQUEST_STATUSES),
+            timestamp(created),
+            timestamp(created),
+        ))
+    return rows
+
+
+def build_broadcasts(spec: DatasetSpec, rng: random.Random, now: datetime) -> List[tuple]:
+    rows = []
+    for index in range(spec.broadcasts):
+        status = rng.choices(["sent", "draft", "scheduled"], weights=[70, 20, 10])[0]
+        rows.append((
+            f"Розсилка #{index + 1}: нові надходження",
+            "Детальніше" if rng.random() < 0.5 else None,
+            "https://t.me/example" if rng.random() < 0.5 else None,
+            rng.choice([None, "photo", "video"]),
+            status,
+            rng.choice(["none", "none", "daily", "weekly"]),
+            timestamp(now + timedelta(days=rng.randint(1, 14))) if status == "scheduled" else None,
+            timestamp(random_moment(rng, now, 365)),
+        ))
+    return rows
+
+
+INSERTS: Dict[str, str] = {
+    "users": """
+        INSERT INTO users (telegram_id, username, first_name, last_name, phone, role, is_active, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "vehicles": """
+        INSERT INTO vehicles (brand, model, year, vehicle_type, condition, status, price, mileage,
+                              engine_volume, power_hp, transmission, fuel_type, load_capacity, location,
+                              description, photos, main_photo, seller_id, is_active, views_count,
+                              published_at, published_in_group, published_in_bot, group_message_id,
+                              vin_code, status_changed_at, sold_at, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "saved_vehicles": """
+        INSERT INTO saved_vehicles (user_id, vehicle_id, notes, category, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    "subscriptions": """
+        INSERT INTO subscriptions (user_id, subscription_name, vehicle_type, brand, min_year, max_year,
+                                   min_price, max_price, condition, is_active, last_notification,
+                                   created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "manager_requests": """
+        INSERT INTO manager_requests (user_id, vehicle_id, request_type, details, status, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "broadcasts": """
+        INSERT INTO broadcasts (text, button_text, button_url, media_type, status, schedule_period,
+                                scheduled_at, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "group_topics": "INSERT INTO group_topics (thread_id, name) VALUES (?, ?)",
+}
+
+
+def _database_manager(db_path: Path):
+    os.environ.setdefault("BOT_TOKEN", "123456:DATASET")
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    from app.modules.database.manager import DatabaseManager
+
+    return DatabaseManager(str(db_path))
+
+
+def create_schema(db_path: Path) -> None:
+    """Create (or upgrade) the schema through the application's own migrations."""
+    asyncio.run(_database_manager(db_path).init_database())
+
+
+def generate(db_path: Path, spec: DatasetSpec, overwrite: bool = False) -> Dict[str, int]:
+    """Fill a fresh SQLite file according to ``spec`` and return row counts per table."""
+    if db_path.exists():
+        if not overwrite:
+            raise SystemExit(f"{db_path} already exists (use --overwrite)")
+        db_path.unlink()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    create_schema(db_path)
+
+    rng = random.Random(spec.seed)
+    # Fixed "now" keeps the data identical between runs
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    admins = max(1, spec.users // 1000)
+
+    builders = {
+        "users": lambda: build_users(spec, rng, now),
+        "vehicles": lambda: build_vehicles(spec, rng, now, list(range(1, admins + 1))),
+        "saved_vehicles": lambda: build_saved_vehicles(spec, rng, now),
+        "subscriptions": lambda: build_subscriptions(spec, rng, now),
+        "manager_requests": lambda: build_manager_requests(spec, rng, now),
+        "broadcasts": lambda: build_broadcasts(spec, rng, now),
+        "group_topics": lambda: [(100 + index, f"Гілка {index + 1}") for index in range(spec.group_topics)],
+    }
+
+    counts: Dict[str, int] = {}
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA synchronous = OFF")
+        for table in TABLES:
+            rows = builders[table]()
+            conn.executemany(INSERTS[table], rows)
+            counts[table] = len(rows)
+
+    # Rows were inserted straight into users and vehicles; derive the normalized search columns,
+    # trigrams, folded brands and vehicle_media the same way the migrations do
+    manager = _database_manager(db_path)
+    counts["user_search"] = asyncio.run(manager.rebuild_user_search())
+    counts["vehicle_brand_search"] = asyncio.run(manager.rebuild_vehicle_brand_search())
+    counts["vehicle_media"] = asyncio.run(manager.rebuild_vehicle_media())
+    return counts
+
+
+def load_spec(path: Path) -> Optional[DatasetSpec]:
+    """Read the spec stored next to a generated dataset, if any."""
+    meta = path.with_suffix(".json")
+    if not meta.exists():
+        return None
+    return DatasetSpec(**json.loads(meta.read_text(encoding="utf-8")))
+
+
+def ensure_dataset(db_path: Path, spec: DatasetSpec) -> Tuple[Path, bool]:
+    """Reuse a previously generated dataset with the same spec or build a new one."""
+    if db_path.exists() and load_spec(db_path) == spec:
+        # A dataset generated before a schema change is brought up to date in place
+        create_schema(db_path)
+        return db_path, False
+    generate(db_path, spec, overwrite=True)
+    db_path.with_suffix(".json").write_text(json.dumps(asdict(spec), indent=2), encoding="utf-8")
+    return db_path, True
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a synthetic m_truck_bot SQLite dataset")
+    parser.add_argument("--rows", type=int, default=1000, help="base row count (users and vehicles)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="SQLite file (default: data/bench_<rows>.db)")
+    parser.add_argument("--overwrite", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    output = args.output or BASE_DIR / "data" / f"bench_{args.rows}.db"
+    spec = DatasetSpec.for_rows(args.rows, args.seed)
+
+    started = time.perf_counter()
+    counts = generate(output, spec, overwrite=args.overwrite)
+    output.with_suffix(".json").write_text(json.dumps(asdict(spec), indent=2), encoding="utf-8")
+
+    print(f"Dataset written to {output} in {time.perf_counter() - started:.1f} s")
+    for table, count in counts.items():
+        print(f"  {table:<18} {count:>9}")
+
+
+if __name__ == "__main__":
+    main()
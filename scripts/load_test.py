@@ -0,0 +1,342 @@
+"""Offline end-to-end load test for the bot dispatcher.
+
+Builds the real dispatcher via ``app.main.create_dispatcher()``, replaces the
+Telegram HTTP session with a local stub that answers Bot API calls after a
+configurable latency, and replays scripted user journeys as synthetic
+``Update`` objects at a target rate. No network access is needed.
+
+Example:
+    python scripts/load_test.py --users 50 --rate 200 --api-latency-ms 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import typing
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+CATALOG_GROUPS = ["vans_and_refrigerators", "container_carriers", "tractors_and_semi", "variable_body"]
+JOURNEYS = ["registration", "catalog", "prev_next_spam", "favorite", "subscription"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay synthetic user journeys against the dispatcher")
+    parser.add_argument("--users", type=int, default=20, help="number of concurrent synthetic users")
+    parser.add_argument("--rate", type=float, default=100.0, help="target updates per second (0 = unlimited)")
+    parser.add_argument("--vehicles", type=int, default=200, help="vehicles to seed into the catalog")
+    parser.add_argument("--api-latency-ms", type=float, default=30.0, help="stub Bot API latency")
+    parser.add_argument("--api-jitter-ms", type=float, default=10.0, help="random +/- jitter for API latency")
+    parser.add_argument("--spam-clicks", type=int, default=15, help="prev/next presses per user")
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help="comma separated journeys to run")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: fresh temp file)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def configure_environment(args: argparse.Namespace) -> Path:
+    """Point settings at an isolated database before the app is imported."""
+    db_path = Path(args.db) if args.db else Path(tempfile.mkdtemp(prefix="m_truck_load_")) / "load_test.db"
+    os.environ["BOT_TOKEN"] = "123456:LOAD-TEST-TOKEN"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["ADMIN_IDS"] = ""
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    # Query counts per update come from the query profiler
+    os.environ["QUERY_PROFILER_ENABLED"] = "true"
+    os.environ.setdefault("QUERY_SLOW_THRESHOLD_MS", "1000000")
+    sys.path.insert(0, str(BASE_DIR))
+    return db_path
+
+
+def build_stub_session(latency_ms: float, jitter_ms: float):
+    """Create an aiogram session that answers every Bot API call locally."""
+    from aiogram.client.session.base import BaseSession
+    from aiogram.types import Chat, Message, User
+
+    class StubSession(BaseSession):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls: Counter = Counter()
+            self._message_ids = itertools.count(1000)
+            self._bot_user = User(id=123456, is_bot=True, first_name="LoadTest", username="load_test_bot")
+
+        async def close(self) -> None:
+            return None
+
+        async def stream_content(self, url: str, headers: Optional[Dict[str, Any]] = None, timeout: int = 30,
+                                 chunk_size: int = 65536, raise_for_status: bool = True) -> AsyncGenerator[bytes, None]:
+            yield b""
+
+        async def make_request(self, bot, method, timeout: Optional[int] = None) -> Any:
+            self.calls[method.__api_method__] += 1
+            delay = max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000
+            if delay:
+                await asyncio.sleep(delay)
+            return self._fake_result(method)
+
+        def _message(self, method) -> Message:
+            chat_id = getattr(method, "chat_id", None)
+            return Message(
+                message_id=next(self._message_ids),
+                date=datetime.now(),
+                chat=Chat(id=chat_id if isinstance(chat_id, int) else 0, type="private"),
+                from_user=self._bot_user,
+                text=getattr(method, "text", None),
+            )
+
+        def _fake_result(self, method) -> Any:
+            returning = method.__returning__
+            options = typing.get_args(returning) if typing.get_origin(returning) is typing.Union else (returning,)
+            for option in options:
+                if option is Message:
+                    return self._message(method)
+                if typing.get_origin(option) is list:
+                    media = getattr(method, "media", None) or [None]
+                    return [self._message(method) for _ in media]
+                if option is User:
+                    return self._bot_user
+            if bool in options:
+                return True
+            return True
+
+    return StubSession()
+
+
+class RateLimiter:
+    """Spaces out updates globally to hit a target rate."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = time.perf_counter()
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.perf_counter()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class UpdateFactory:
+    """Builds synthetic Update objects for one user."""
+
+    _update_ids = itertools.count(1)
+
+    def __init__(self, telegram_id: int) -> None:
+        self.telegram_id = telegram_id
+        self.user = {"id": telegram_id, "is_bot": False, "first_name": f"Load{telegram_id}", "username": f"load_{telegram_id}"}
+        self.chat = {"id": telegram_id, "type": "private"}
+        self._message_ids = itertools.count(1)
+
+    def message(self, text: str = None, **extra: Any):
+        from aiogram.types import Update
+
+        payload = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": self.chat,
+            "from": self.user,
+        }
+        if text is not None:
+            payload["text"] = text
+            if text.startswith("/"):
+                payload["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        payload.update(extra)
+        return Update.model_validate({"update_id": next(self._update_ids), "message": payload})
+
+    def contact(self, phone: str):
+        return self.message(contact={"phone_number": phone, "first_name": self.user["first_name"], "user_id": self.telegram_id})
+
+    def callback(self, data: str):
+        from aiogram.types import Update
+
+        return Update.model_validate({
+            "update_id": next(self._update_ids),
+            "callback_query": {
+                "id": str(next(self._update_ids)),
+                "from": self.user,
+                "chat_instance": str(self.telegram_id),
+                "data": data,
+                "message": {
+                    "message_id": next(self._message_ids),
+                    "date": int(time.time()),
+                    "chat": self.chat,
+                    "from": {"id": 123456, "is_bot": True, "first_name": "LoadTest"},
+                    "text": "card",
+                },
+            },
+        })
+
+
+def journey_updates(name: str, factory: UpdateFactory, rng: random.Random, vehicle_ids: List[int], spam_clicks: int):
+    """Return the scripted list of updates for one journey."""
+    if name == "registration":
+        return [factory.message("/start"), factory.contact(f"+38050{rng.randint(1000000, 9999999)}")]
+    if name == "catalog":
+        return [
+            factory.callback("client_catalog_menu"),
+            factory.callback("client_catalog_select_type"),
+            factory.callback(f"client_catalog_type_{rng.choice(CATALOG_GROUPS)}"),
+        ]
+    if name == "prev_next_spam":
+        updates = [factory.callback(f"client_catalog_type_{rng.choice(CATALOG_GROUPS)}")]
+        for _ in range(spam_clicks):
+            direction = "next" if rng.random() < 0.75 else "prev"
+            updates.append(factory.callback(f"{direction}_vehicle_{rng.choice(vehicle_ids)}"))
+        return updates
+    if name == "favorite":
+        return [factory.callback(f"favorite_vehicle_{vehicle_id}") for vehicle_id in rng.sample(vehicle_ids, k=min(3, len(vehicle_ids)))]
+    if name == "subscription":
+        return [
+            factory.callback("create_subscription"),
+            factory.message(f"Load subscription {factory.telegram_id}"),
+            factory.callback(f"sub_type_{rng.choice(CATALOG_GROUPS)}"),
+            factory.callback("sub_skip_brand"),
+            factory.callback("sub_skip_min_year"),
+            factory.callback("sub_skip_max_year"),
+            factory.callback("sub_skip_min_price"),
+            factory.callback("sub_skip_max_price"),
+            factory.callback("sub_skip_condition"),
+            factory.callback("confirm_subscription"),
+        ]
+    raise SystemExit(f"Unknown journey: {name}")
+
+
+async def seed_catalog(count: int, rng: random.Random) -> List[int]:
+    """Insert a seller and ``count`` vehicles spread across all vehicle types."""
+    from app.modules.database.manager import db_manager
+    from app.modules.database.models import UserModel, UserRole, VehicleCondition, VehicleModel, VehicleType
+
+    seller_id = await db_manager.create_user(UserModel(telegram_id=1, first_name="Seller", role=UserRole.ADMIN))
+    brands = ["MAN", "DAF", "Volvo", "Scania", "Mercedes-Benz", "Renault", "Iveco", "Schmitz"]
+    vehicle_ids = []
+    for index in range(count):
+        vehicle_type = list(VehicleType)[index % len(VehicleType)]
+        vehicle_ids.append(await db_manager.create_vehicle(VehicleModel(
+            vehicle_type=vehicle_type,
+            brand=rng.choice(brands),
+            model=f"M{rng.randint(100, 999)}",
+            year=rng.randint(2008, 2024),
+            condition=rng.choice(list(VehicleCondition)),
+            price=float(rng.randint(8, 120) * 1000),
+            mileage=rng.randint(50, 1200) * 1000,
+            photos=[f"photo_{index}_{n}" for n in range(rng.randint(1, 6))],
+            main_photo=f"photo_{index}_0",
+            seller_id=seller_id,
+        )))
+    return vehicle_ids
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(args: argparse.Namespace) -> None:
+    from aiogram import Bot
+
+    from app.main import create_dispatcher
+    from app.modules.database.manager import db_manager
+    from app.modules.database.profiler import query_profiler
+    from app.monitoring.metrics import db_query_duration
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    journeys = [name.strip() for name in args.journeys.split(",") if name.strip()]
+
+    await db_manager.init_database()
+    vehicle_ids = await seed_catalog(args.vehicles, rng)
+
+    session = build_stub_session(args.api_latency_ms, args.api_jitter_ms)
+    bot = Bot(token=os.environ["BOT_TOKEN"], session=session)
+    dp = await create_dispatcher()
+
+    # Setup traffic (init + seeding) is excluded from the per-update numbers
+    query_profiler.reset()
+    setup_calls = sum(stats["count"] for stats in db_query_duration.snapshot().values())
+
+    limiter = RateLimiter(args.rate)
+    latencies: List[float] = []
+    per_journey: Dict[str, List[float]] = {name: [] for name in journeys}
+    errors: Counter = Counter()
+
+    async def simulate_user(index: int) -> None:
+        factory = UpdateFactory(telegram_id=100_000 + index)
+        user_rng = random.Random(args.seed + index)
+        for journey in journeys:
+            for update in journey_updates(journey, factory, user_rng, vehicle_ids, args.spam_clicks):
+                await limiter.wait()
+                start = time.perf_counter()
+                try:
+                    await dp.feed_update(bot, update)
+                except Exception as e:
+                    errors[f"{journey}: {type(e).__name__}: {e}"[:160]] += 1
+                elapsed = time.perf_counter() - start
+                latencies.append(elapsed)
+                per_journey[journey].append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(simulate_user(index) for index in range(args.users)))
+    wall_time = time.perf_counter() - started
+
+    total_updates = len(latencies)
+    total_queries = sum(stats.count for stats in query_profiler.stats.values())
+    manager_calls = sum(stats["count"] for stats in db_query_duration.snapshot().values()) - setup_calls
+    api_calls = sum(session.calls.values())
+
+    print(f"DB path: {os.environ['DATABASE_URL']}")
+    print(f"Users: {args.users} | journeys: {', '.join(journeys)} | target rate: {args.rate or 'unlimited'} upd/s")
+    print(f"Stub API latency: {args.api_latency_ms:.0f}±{args.api_jitter_ms:.0f} ms | catalog: {len(vehicle_ids)} vehicles")
+    print()
+    print(f"Updates processed:  {total_updates} in {wall_time:.2f} s -> {total_updates / wall_time:.1f} upd/s")
+    print(
+        f"Handler latency:    p50 {percentile(latencies, 50) * 1000:.1f} ms | "
+        f"p95 {percentile(latencies, 95) * 1000:.1f} ms | p99 {percentile(latencies, 99) * 1000:.1f} ms | "
+        f"max {max(latencies, default=0) * 1000:.1f} ms"
+    )
+    if total_updates:
+        print(f"SQL queries/update: {total_queries / total_updates:.2f} ({manager_calls / total_updates:.2f} DatabaseManager calls)")
+        print(f"API calls/update:   {api_calls / total_updates:.2f}")
+    print()
+    print("Per journey:")
+    for journey, values in per_journey.items():
+        if values:
+            print(
+                f"  {journey:<16} n={len(values):<6} p50 {percentile(values, 50) * 1000:7.1f} ms | "
+                f"p95 {percentile(values, 95) * 1000:7.1f} ms | p99 {percentile(values, 99) * 1000:7.1f} ms"
+            )
+    print()
+    print("Bot API calls:", ", ".join(f"{name}={count}" for name, count in session.calls.most_common()))
+    if errors:
+        print("\nErrors:")
+        for message, count in errors.most_common(10):
+            print(f"  {count:>5} x {message}")
+
+
+def main() -> None:
+    args = parse_args()
+    configure_environment(args)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()